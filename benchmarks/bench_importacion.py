@@ -0,0 +1,94 @@
+# ============================================================================
+# BENCHMARK DEL TIEMPO DE IMPORTACIÓN
+# ============================================================================
+# Importa cada módulo en un intérprete nuevo, mide cuánto tarda y verifica que
+# no arrastre dependencias pesadas (tkinter, matplotlib). Termina con código 1
+# si se supera el límite o se carga un módulo prohibido.
+#
+#   python benchmarks/bench_importacion.py [--repeticiones N] [--limite-ms MS] [--json RUTA]
+# ============================================================================
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulo -> dependencias que no debe cargar al importarse
+MODULOS = {
+    "calculadora_imc": ("tkinter", "matplotlib"),
+    "persistencia": ("tkinter", "matplotlib"),
+    "importador": ("tkinter", "matplotlib"),
+    "trabajador": ("tkinter", "matplotlib"),
+    "instrumentacion": ("tkinter", "matplotlib"),
+    "paralelo": ("tkinter", "matplotlib"),
+    "cache_predicciones": ("tkinter", "matplotlib"),
+    "evaluacion_online": ("tkinter", "matplotlib"),
+    "segmentacion": ("tkinter", "matplotlib"),
+    "codeIA": ("matplotlib",),
+}
+
+LIMITE_MS = 500.0
+
+_SONDA = """
+import json, sys, time
+inicio = time.perf_counter()
+import {modulo}
+duracion = time.perf_counter() - inicio
+prohibidos = [m for m in {prohibidos!r} if m in sys.modules]
+print(json.dumps({{"segundos": duracion, "prohibidos": prohibidos}}))
+"""
+
+def medir(modulo, prohibidos, repeticiones):
+    """Importa `modulo` en `repeticiones` intérpretes nuevos y resume los tiempos."""
+    tiempos = []
+    cargados = set()
+    for _ in range(repeticiones):
+        proceso = subprocess.run(
+            [sys.executable, "-c", _SONDA.format(modulo=modulo, prohibidos=prohibidos)],
+            cwd=RAIZ, capture_output=True, text=True, check=True)
+        resultado = json.loads(proceso.stdout.strip().splitlines()[-1])
+        tiempos.append(resultado["segundos"] * 1000)
+        cargados.update(resultado["prohibidos"])
+    
+    return {
+        "modulo": modulo,
+        "mediana_ms": statistics.median(tiempos),
+        "minimo_ms": min(tiempos),
+        "maximo_ms": max(tiempos),
+        "modulos_prohibidos": sorted(cargados),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide el tiempo de importación de los módulos.")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--limite-ms", type=float, default=LIMITE_MS,
+                        help="mediana máxima permitida por módulo")
+    parser.add_argument("--json", help="ruta donde guardar los resultados")
+    args = parser.parse_args(argv)
+    
+    resultados = [medir(modulo, prohibidos, args.repeticiones) for modulo, prohibidos in MODULOS.items()]
+    
+    fallos = 0
+    for r in resultados:
+        problemas = []
+        if r["mediana_ms"] > args.limite_ms:
+            problemas.append(f"supera {args.limite_ms:.0f} ms")
+        if r["modulos_prohibidos"]:
+            problemas.append(f"carga {', '.join(r['modulos_prohibidos'])}")
+        fallos += bool(problemas)
+        estado = "FALLO: " + "; ".join(problemas) if problemas else "ok"
+        print(f"{r['modulo']:<16} mediana {r['mediana_ms']:8.1f} ms  "
+              f"(min {r['minimo_ms']:.1f}, max {r['maximo_ms']:.1f})  {estado}")
+    
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as archivo:
+            json.dump({"limite_ms": args.limite_ms, "resultados": resultados}, archivo, indent=2)
+    
+    return 1 if fallos else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+# ============================================================================
+# BENCHMARK DE LA CALCULADORA Y DE LA INTERFAZ
+# ============================================================================
+# Mide los caminos críticos con datos sintéticos de semilla fija (10³ a 10⁷
+# filas) y guarda tiempo, filas/s y memoria pico en JSON. Con --baseline
+# compara contra una ejecución anterior y termina con código 1 si algún caso
+# es más lento que la tolerancia.
+#
+#   python benchmarks/bench_suite.py [--tamanos 1000 100000] [--json RUTA]
+#                                    [--baseline RUTA] [--tolerancia 0.25]
+# ============================================================================
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from calculadora_imc import BMIMLCalculator
+
+TAMANOS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+SEMILLA = 20240601
+REPETICIONES = 3
+TOLERANCIA = 0.25
+
+# Los casos que recorren filas en Python se limitan a este número de llamadas
+LLAMADAS_MAXIMAS = 100_000
+# Ventana y tamaño de bloque del caso de entrenamiento continuo
+TAM_VENTANA = 100_000
+TAM_BLOQUE_FLUJO = 10_000
+# Segmentos del caso segmentado: 5 tramos de altura x 4 de peso
+TRAMOS_ALTURA = (1.5, 0.1, 5)
+TRAMOS_PESO = (50.0, 20.0, 4)
+
+def generar_datos(n, semilla=SEMILLA):
+    """Alturas y pesos plausibles, reproducibles para una semilla dada."""
+    generador = np.random.default_rng(semilla)
+    alturas = generador.uniform(1.45, 2.05, n)
+    imcs = generador.normal(24.0, 4.0, n).clip(14.0, 45.0)
+    return alturas, imcs * alturas ** 2
+
+def calculadora_con_datos(alturas, pesos, entrenada=True):
+    calc = BMIMLCalculator()
+    calc.agregar_bloque(alturas, pesos)
+    if entrenada:
+        calc.entrenar_modelo()
+    return calc
+
+def medir(funcion, repeticiones):
+    """Mediana de `repeticiones` ejecuciones y memoria pico de una ejecución más."""
+    tiempos = []
+    for _ in range(repeticiones):
+        gc.collect()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcion()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return statistics.median(tiempos), pico
+
+# ============================================================================
+# CASOS
+# ============================================================================
+# Cada caso recibe los datos y devuelve (función a medir, filas que procesa),
+# o None si no se puede ejecutar en este entorno.
+
+def caso_agregar_dato(alturas, pesos):
+    m = min(len(alturas), LLAMADAS_MAXIMAS)
+    filas = list(zip(alturas[:m].tolist(), pesos[:m].tolist()))
+    
+    def ejecutar():
+        calc = BMIMLCalculator()
+        for altura, peso in filas:
+            calc.agregar_dato(altura, peso)
+    return ejecutar, m
+
+def caso_agregar_bloque(alturas, pesos):
+    return (lambda: BMIMLCalculator().agregar_bloque(alturas, pesos)), len(alturas)
+
+def caso_agregar_bloque_ventana(alturas, pesos):
+    # Flujo en bloques sobre una ventana fija: el pico de memoria no crece con n
+    def ejecutar():
+        calc = BMIMLCalculator()
+        calc.configurar_ventana(TAM_VENTANA)
+        for inicio in range(0, len(alturas), TAM_BLOQUE_FLUJO):
+            calc.agregar_bloque(alturas[inicio:inicio + TAM_BLOQUE_FLUJO], pesos[inicio:inicio + TAM_BLOQUE_FLUJO])
+    return ejecutar, len(alturas)
+
+def caso_agregar_bloque_segmentado(alturas, pesos):
+    # Reducción agrupada de las estadísticas de cada segmento
+    def ejecutar():
+        calc = BMIMLCalculator()
+        calc.configurar_segmentos(TRAMOS_ALTURA, TRAMOS_PESO)
+        calc.agregar_bloque(alturas, pesos)
+    return ejecutar, len(alturas)
+
+def caso_entrenar_modelo(alturas, pesos):
+    calc = calculadora_con_datos(alturas, pesos, entrenada=False)
+    return calc.entrenar_modelo, len(alturas)
+
+def caso_calcular_metricas(alturas, pesos):
+    calc = calculadora_con_datos(alturas, pesos)
+    return (lambda: calc._calcular_metricas(calc.coeficientes)), len(alturas)
+
+def caso_predecir_imc(alturas, pesos):
+    calc = calculadora_con_datos(alturas, pesos)
+    m = min(len(alturas), LLAMADAS_MAXIMAS)
+    filas = list(zip(alturas[:m].tolist(), pesos[:m].tolist()))
+    
+    def ejecutar():
+        for altura, peso in filas:
+            calc.predecir_imc(altura, peso)
+    return ejecutar, m
+
+def caso_predecir_imc_lote(alturas, pesos):
+    calc = calculadora_con_datos(alturas, pesos)
+    return (lambda: calc.predecir_imc_lote(alturas, pesos)), len(alturas)
+
+def caso_clasificar_imc(alturas, pesos):
+    calc = BMIMLCalculator()
+    m = min(len(alturas), LLAMADAS_MAXIMAS)
+    imcs = (pesos[:m] / alturas[:m] ** 2).tolist()
+    
+    def ejecutar():
+        for imc in imcs:
+            calc.clasificar_imc(imc)
+    return ejecutar, m
+
+def caso_clasificar_imc_lote(alturas, pesos):
+    calc = BMIMLCalculator()
+    imcs = pesos / alturas ** 2
+    return (lambda: calc.clasificar_imc_lote(imcs)), len(alturas)
+
+_aplicacion = None
+
+def _aplicacion_tk():
+    """Crea una sola vez la interfaz sin mostrarla; None si no hay pantalla."""
+    global _aplicacion
+    if _aplicacion is None:
+        try:
+            import tkinter as tk
+            from codeIA import BMIMLApp
+            root = tk.Tk()
+        except Exception:
+            _aplicacion = False
+        else:
+            root.withdraw()
+            _aplicacion = BMIMLApp(root)
+    return _aplicacion or None
+
+def caso_tabla_datos(alturas, pesos):
+    app = _aplicacion_tk()
+    if app is None:
+        return None
+    app.calculator = calculadora_con_datos(alturas, pesos, entrenada=False)
+    
+    def ejecutar():
+        app.actualizar_tabla_datos(completa=True)
+        app.root.update_idletasks()
+    # En modo paginado solo se dibuja una página
+    paginada = len(alturas) > app.FILAS_MAXIMAS_TABLA
+    return ejecutar, app.FILAS_POR_PAGINA if paginada else len(alturas)
+
+CASOS = {
+    "agregar_dato": caso_agregar_dato,
+    "agregar_bloque": caso_agregar_bloque,
+    "agregar_bloque_ventana": caso_agregar_bloque_ventana,
+    "agregar_bloque_segmentado": caso_agregar_bloque_segmentado,
+    "entrenar_modelo": caso_entrenar_modelo,
+    "_calcular_metricas": caso_calcular_metricas,
+    "predecir_imc": caso_predecir_imc,
+    "predecir_imc_lote": caso_predecir_imc_lote,
+    "clasificar_imc": caso_clasificar_imc,
+    "clasificar_imc_lote": caso_clasificar_imc_lote,
+    "tabla_datos": caso_tabla_datos,
+}
+
+# ============================================================================
+# EJECUCIÓN Y COMPARACIÓN
+# ============================================================================
+
+def ejecutar(tamanos, casos, repeticiones, semilla):
+    resultados = []
+    for n in tamanos:
+        alturas, pesos = generar_datos(n, semilla)
+        for nombre in casos:
+            preparado = CASOS[nombre](alturas, pesos)
+            if preparado is None:
+                resultados.append({"caso": nombre, "n": n, "omitido": True})
+                print(f"{nombre:<20} n={n:<10} omitido")
+                continue
+            
+            funcion, filas = preparado
+            segundos, pico = medir(funcion, repeticiones)
+            resultados.append({
+                "caso": nombre,
+                "n": n,
+                "filas": filas,
+                "segundos": segundos,
+                "filas_por_segundo": filas / segundos if segundos > 0 else None,
+                "memoria_pico_mb": pico / 2**20,
+            })
+            print(f"{nombre:<20} n={n:<10} {segundos * 1000:10.2f} ms  "
+                  f"{filas / max(segundos, 1e-12):14,.0f} filas/s  {pico / 2**20:8.1f} MB")
+            del preparado, funcion
+    return resultados
+
+def comparar(resultados, base, tolerancia):
+    """Imprime la razón contra la línea base; devuelve cuántos casos empeoraron."""
+    anteriores = {(r["caso"], r["n"]): r for r in base["resultados"] if not r.get("omitido")}
+    regresiones = 0
+    print(f"\nComparación con la línea base (tolerancia {tolerancia:.0%}):")
+    for r in resultados:
+        anterior = anteriores.get((r["caso"], r["n"]))
+        if r.get("omitido") or anterior is None:
+            continue
+        razon = r["segundos"] / anterior["segundos"] if anterior["segundos"] > 0 else float("inf")
+        peor = razon > 1 + tolerancia
+        regresiones += peor
+        print(f"{r['caso']:<20} n={r['n']:<10} x{razon:6.2f} tiempo  "
+              f"{r['memoria_pico_mb'] - anterior['memoria_pico_mb']:+8.1f} MB  "
+              f"{'REGRESIÓN' if peor else 'ok'}")
+    return regresiones
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide los caminos críticos de la calculadora.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=list(TAMANOS))
+    parser.add_argument("--casos", nargs="+", choices=sorted(CASOS), default=list(CASOS))
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES)
+    parser.add_argument("--semilla", type=int, default=SEMILLA)
+    parser.add_argument("--json", help="ruta donde guardar los resultados")
+    parser.add_argument("--baseline", help="resultados JSON anteriores con los que comparar")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA,
+                        help="aumento relativo de tiempo permitido frente a la línea base")
+    args = parser.parse_args(argv)
+    
+    resultados = ejecutar(args.tamanos, args.casos, args.repeticiones, args.semilla)
+    
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as archivo:
+            json.dump({
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "plataforma": platform.platform(),
+                "semilla": args.semilla,
+                "repeticiones": args.repeticiones,
+                "resultados": resultados,
+            }, archivo, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        return 1 if comparar(resultados, base, args.tolerancia) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+# ============================================================================
+# CALCULADORA DE IMC CON MACHINE LEARNING - CACHÉ DE PREDICCIONES
+# ============================================================================
+# Caché LRU acotada de predicciones, indexada por (altura en cm, peso en
+# décimas de kg). Cada entrada guarda la altura y el peso exactos con que se
+# calculó y solo se sirve si coinciden, de modo que un acierto devuelve
+# siempre el mismo valor que el cálculo. Las entradas pertenecen a una versión
+# del modelo y se descartan al cambiarla.
+# ============================================================================
+
+import collections
+
+import numpy as np
+
+CAPACIDAD_CACHE = 65_536
+
+ESCALA_ALTURA = 100  # centímetros
+ESCALA_PESO = 10     # décimas de kilogramo
+BASE_CLAVE = 10_000  # mayor que cualquier peso válido cuantizado
+
+def cuantizar(altura, peso):
+    """Devuelve la clave entera de la celda (cm, 0.1 kg) de una altura y un peso."""
+    return round(altura * ESCALA_ALTURA) * BASE_CLAVE + round(peso * ESCALA_PESO)
+
+def cuantizar_lote(alturas, pesos):
+    """Claves enteras de columnas de alturas y pesos ya validadas."""
+    return (np.rint(alturas * ESCALA_ALTURA).astype(np.int64) * BASE_CLAVE
+            + np.rint(pesos * ESCALA_PESO).astype(np.int64))
+
+class CachePredicciones:
+    """Caché LRU de registros de predicción para una versión del modelo.
+    
+    Cada entrada es (altura, peso, registro), con el registro en el orden
+    de DTYPE_PREDICCION.
+    """
+    
+    def __init__(self, capacidad=CAPACIDAD_CACHE):
+        if capacidad < 1:
+            raise ValueError("La capacidad de la caché debe ser positiva.")
+        self.capacidad = capacidad
+        self.version = None
+        self._entradas = collections.OrderedDict()
+        
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.invalidaciones = 0
+    
+    def __len__(self):
+        return len(self._entradas)
+    
+    def sincronizar(self, version):
+        """Descarta todas las entradas si pertenecen a otra versión del modelo."""
+        if version != self.version:
+            if self._entradas:
+                self.invalidaciones += 1
+                self._entradas.clear()
+            self.version = version
+    
+    def obtener(self, clave, altura, peso):
+        """Devuelve el registro guardado para exactamente (altura, peso), o None."""
+        entrada = self._entradas.get(clave)
+        if entrada is None or entrada[0] != altura or entrada[1] != peso:
+            self.fallos += 1
+            return None
+        self._entradas.move_to_end(clave)
+        self.aciertos += 1
+        return entrada[2]
+    
+    def guardar(self, clave, altura, peso, registro):
+        self._entradas[clave] = (altura, peso, registro)
+        self._entradas.move_to_end(clave)
+        if len(self._entradas) > self.capacidad:
+            self._entradas.popitem(last=False)
+            self.desalojos += 1
+    
+    def limpiar(self):
+        self._entradas.clear()
+    
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            'tamano': len(self._entradas),
+            'capacidad': self.capacidad,
+            'version': self.version,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': self.aciertos / consultas if consultas else None,
+            'desalojos': self.desalojos,
+            'invalidaciones': self.invalidaciones,
+        }
@@ -0,0 +1,1629 @@
+# ============================================================================
+# CALCULADORA DE IMC CON MACHINE LEARNING - NÚCLEO
+# ============================================================================
+# Almacén de datos, estadísticas suficientes, motores de ajuste y calculadora.
+# No depende de tkinter ni de matplotlib: puede usarse sin interfaz gráfica.
+# ============================================================================
+
+import collections
+import concurrent.futures
+import math
+import os
+
+import numpy as np
+
+import cache_predicciones
+import evaluacion_online
+import instrumentacion
+import persistencia
+import segmentacion
+
+# Rangos válidos para los datos de entrada
+ALTURA_MAXIMA = 3.0
+PESO_MAXIMO = 500.0
+
+# Umbrales de clasificación del IMC y sus nombres, en orden de código
+UMBRALES_IMC = np.array([18.5, 25.0, 30.0])
+CLASIFICACIONES_IMC = ("Peso insuficiente", "Peso normal", "Sobrepeso", "Obesidad")
+CLASE_INVALIDA = -1
+_CODIGOS_CLASIFICACION = {nombre: codigo for codigo, nombre in enumerate(CLASIFICACIONES_IMC)}
+
+# Registro devuelto por la predicción en lote
+DTYPE_PREDICCION = np.dtype([
+    ('imc_ml', np.float64),
+    ('imc_real', np.float64),
+    ('diferencia', np.float64),
+    ('clase_ml', np.int8),
+    ('clase_real', np.int8),
+    ('valido', np.bool_),
+])
+
+def _mascara_rango_valido(alturas, pesos):
+    """Devuelve una máscara booleana con las filas dentro del rango válido."""
+    return (alturas > 0) & (alturas <= ALTURA_MAXIMA) & (pesos > 0) & (pesos <= PESO_MAXIMO)
+
+class AlmacenColumnar:
+    """Almacén columnar de datos de entrenamiento sobre arreglos NumPy contiguos."""
+    
+    CAPACIDAD_INICIAL = 64
+    
+    def __init__(self, dtype=np.float64, capacidad=CAPACIDAD_INICIAL):
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.dtype(np.float32), np.dtype(np.float64)):
+            raise ValueError("El almacén solo admite float32 o float64.")
+        
+        capacidad = max(int(capacidad), 1)
+        self._altura = np.empty(capacidad, dtype=self.dtype)
+        self._peso = np.empty(capacidad, dtype=self.dtype)
+        self._imc = np.empty(capacidad, dtype=self.dtype)
+        self._n = 0
+    
+    def __len__(self):
+        return self._n
+    
+    @property
+    def capacidad(self):
+        return len(self._altura)
+    
+    def _reservar(self, requerido):
+        """Garantiza espacio para `requerido` filas duplicando la capacidad."""
+        if requerido <= self.capacidad:
+            return
+        
+        nueva_capacidad = max(self.capacidad * 2, requerido)
+        for nombre in ('_altura', '_peso', '_imc'):
+            anterior = getattr(self, nombre)
+            nuevo = np.empty(nueva_capacidad, dtype=self.dtype)
+            nuevo[:self._n] = anterior[:self._n]
+            setattr(self, nombre, nuevo)
+    
+    @classmethod
+    def desde_columnas(cls, altura, peso, imc):
+        """Crea un almacén sobre columnas existentes (p. ej. mapeadas en memoria) sin copiarlas."""
+        almacen = cls(altura.dtype, capacidad=1)
+        almacen._altura, almacen._peso, almacen._imc = altura, peso, imc
+        almacen._n = len(altura)
+        return almacen
+    
+    def liberar_archivo(self, ruta):
+        """Copia a memoria las columnas mapeadas desde `ruta` para que pueda reemplazarse.
+        
+        En Windows no se puede sobrescribir un archivo que sigue mapeado.
+        """
+        for nombre in ('_altura', '_peso', '_imc'):
+            columna = getattr(self, nombre)
+            origen = getattr(columna, 'filename', None)
+            if origen and os.path.exists(ruta) and os.path.samefile(origen, ruta):
+                setattr(self, nombre, np.array(columna[:self._n]))
+    
+    def agregar(self, altura, peso, imc):
+        """Agrega una fila al final del almacén."""
+        self._reservar(self._n + 1)
+        self._altura[self._n] = altura
+        self._peso[self._n] = peso
+        self._imc[self._n] = imc
+        self._n += 1
+    
+    def agregar_lote(self, alturas, pesos, imcs):
+        """Agrega varias filas copiando cada columna en bloque."""
+        cantidad = len(alturas)
+        self._reservar(self._n + cantidad)
+        fin = self._n + cantidad
+        self._altura[self._n:fin] = alturas
+        self._peso[self._n:fin] = pesos
+        self._imc[self._n:fin] = imcs
+        self._n = fin
+    
+    def eliminar(self, indice):
+        """Elimina la fila `indice` desplazando las siguientes y la devuelve."""
+        if not -self._n <= indice < self._n:
+            raise IndexError("Índice de dato fuera de rango.")
+        indice %= self._n
+        
+        fila = (float(self._altura[indice]), float(self._peso[indice]), float(self._imc[indice]))
+        for columna in (self._altura, self._peso, self._imc):
+            columna[indice:self._n - 1] = columna[indice + 1:self._n]
+        self._n -= 1
+        return fila
+    
+    def _vista(self, columna):
+        vista = columna[:self._n]
+        vista.flags.writeable = False
+        return vista
+    
+    @property
+    def altura(self):
+        return self._vista(self._altura)
+    
+    @property
+    def peso(self):
+        return self._vista(self._peso)
+    
+    @property
+    def imc(self):
+        return self._vista(self._imc)
+
+class AlmacenVentana(AlmacenColumnar):
+    """Ventana deslizante: conserva solo las últimas `tamano` filas, en orden de llegada.
+    
+    Los arreglos reservan el doble de la ventana. Las filas nuevas se escriben
+    al final y, al llegar al borde, la ventana se copia al principio: las
+    vistas siguen siendo contiguas y cada fila se copia a lo sumo una vez más.
+    """
+    
+    def __init__(self, tamano, dtype=np.float64):
+        tamano = int(tamano)
+        if tamano < 1:
+            raise ValueError("El tamaño de la ventana debe ser positivo.")
+        super().__init__(dtype, capacidad=2 * tamano)
+        self.tamano = tamano
+        self._inicio = 0
+        # Filas que han salido de la ventana desde su creación
+        self.descartadas = 0
+    
+    def __len__(self):
+        return self._n - self._inicio
+    
+    def _compactar(self, cantidad):
+        """Deja sitio para `cantidad` filas moviendo la ventana al principio de los arreglos."""
+        if self._n + cantidad <= self.capacidad:
+            return
+        n = len(self)
+        for columna in (self._altura, self._peso, self._imc):
+            columna[:n] = columna[self._inicio:self._n]
+        self._inicio, self._n = 0, n
+    
+    def _descartar(self, cantidad):
+        """Saca las `cantidad` filas más antiguas y devuelve una copia de sus columnas."""
+        fin = self._inicio + cantidad
+        salientes = tuple(columna[self._inicio:fin].copy() for columna in (self._altura, self._peso, self._imc))
+        self._inicio = fin
+        self.descartadas += cantidad
+        return salientes
+    
+    def agregar(self, altura, peso, imc):
+        """Agrega una fila; devuelve la fila (altura, peso, imc) que sale de la ventana o None."""
+        saliente = None
+        if len(self) == self.tamano:
+            i = self._inicio
+            saliente = (float(self._altura[i]), float(self._peso[i]), float(self._imc[i]))
+            self._inicio += 1
+            self.descartadas += 1
+        
+        self._compactar(1)
+        self._altura[self._n] = altura
+        self._peso[self._n] = peso
+        self._imc[self._n] = imc
+        self._n += 1
+        return saliente
+    
+    def agregar_lote(self, alturas, pesos, imcs):
+        """Agrega un bloque; devuelve las columnas (alturas, pesos, imcs) de las filas que salen.
+        
+        Si el bloque es mayor que la ventana, sus primeras filas se descartan
+        sin guardarse y no se devuelven.
+        """
+        exceso = len(alturas) - self.tamano
+        if exceso > 0:
+            alturas, pesos, imcs = alturas[exceso:], pesos[exceso:], imcs[exceso:]
+            self.descartadas += exceso
+        
+        cantidad = len(alturas)
+        salientes = self._descartar(max(len(self) + cantidad - self.tamano, 0))
+        self._compactar(cantidad)
+        fin = self._n + cantidad
+        self._altura[self._n:fin] = alturas
+        self._peso[self._n:fin] = pesos
+        self._imc[self._n:fin] = imcs
+        self._n = fin
+        return salientes
+    
+    def eliminar(self, indice):
+        """Elimina la fila `indice` de la ventana y la devuelve."""
+        n = len(self)
+        if not -n <= indice < n:
+            raise IndexError("Índice de dato fuera de rango.")
+        indice = self._inicio + indice % n
+        
+        fila = (float(self._altura[indice]), float(self._peso[indice]), float(self._imc[indice]))
+        for columna in (self._altura, self._peso, self._imc):
+            columna[indice:self._n - 1] = columna[indice + 1:self._n]
+        self._n -= 1
+        return fila
+    
+    def _vista(self, columna):
+        vista = columna[self._inicio:self._n]
+        vista.flags.writeable = False
+        return vista
+
+class EstadisticasSuficientes:
+    """Medias y co-momentos centrados acumulados de forma incremental y estable."""
+    
+    def __init__(self, columnas=3):
+        self.n = 0
+        self.media = np.zeros(columnas)
+        self.comomentos = np.zeros((columnas, columnas))
+    
+    @classmethod
+    def desde_columnas(cls, *columnas, pesos=None):
+        """Calcula las estadísticas de un bloque de columnas en una pasada.
+        
+        Con `pesos` cada fila cuenta según su peso y `n` es la suma de pesos.
+        """
+        datos = np.column_stack([np.asarray(c, dtype=np.float64) for c in columnas])
+        estadisticas = cls(datos.shape[1])
+        if pesos is None:
+            estadisticas.n = len(datos)
+            if estadisticas.n:
+                estadisticas.media = datos.mean(axis=0)
+                centrados = datos - estadisticas.media
+                estadisticas.comomentos = centrados.T @ centrados
+        elif len(datos):
+            pesos = np.asarray(pesos, dtype=np.float64)
+            estadisticas.n = float(pesos.sum())
+            if estadisticas.n > 0:
+                estadisticas.media = pesos @ datos / estadisticas.n
+                centrados = datos - estadisticas.media
+                estadisticas.comomentos = (centrados * pesos[:, None]).T @ centrados
+        return estadisticas
+    
+    @classmethod
+    def desde_dict(cls, datos):
+        estadisticas = cls(len(datos['media']))
+        estadisticas.n = datos['n']
+        estadisticas.media = np.array(datos['media'], dtype=np.float64)
+        estadisticas.comomentos = np.array(datos['comomentos'], dtype=np.float64)
+        return estadisticas
+    
+    def a_dict(self):
+        return {'n': self.n, 'media': self.media.tolist(), 'comomentos': self.comomentos.tolist()}
+    
+    def copia(self):
+        otra = EstadisticasSuficientes(len(self.media))
+        otra.n = self.n
+        otra.media = self.media.copy()
+        otra.comomentos = self.comomentos.copy()
+        return otra
+    
+    def actualizar(self, fila):
+        """Incorpora una fila con el algoritmo de Welford."""
+        x = np.asarray(fila, dtype=np.float64)
+        self.n += 1
+        delta = x - self.media
+        self.media += delta / self.n
+        self.comomentos += np.outer(delta, delta) * ((self.n - 1) / self.n)
+    
+    def actualizar_lote(self, *columnas):
+        """Incorpora un bloque de filas combinando sus estadísticas."""
+        self.combinar(EstadisticasSuficientes.desde_columnas(*columnas))
+    
+    def combinar(self, otra):
+        """Suma las estadísticas de otro conjunto disjunto (fórmula de Chan)."""
+        if otra.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.media, self.comomentos = otra.n, otra.media.copy(), otra.comomentos.copy()
+            return self
+        
+        n = self.n + otra.n
+        delta = otra.media - self.media
+        self.comomentos = self.comomentos + otra.comomentos + np.outer(delta, delta) * (self.n * otra.n / n)
+        self.media = self.media + delta * (otra.n / n)
+        self.n = n
+        return self
+    
+    def restar(self, otra):
+        """Quita las estadísticas de un subconjunto previamente incorporado."""
+        if otra.n == 0:
+            return self
+        if otra.n > self.n:
+            raise ValueError("No se puede restar un conjunto mayor que el acumulado.")
+        
+        n_resto = self.n - otra.n
+        if n_resto == 0:
+            self.__init__(len(self.media))
+            return self
+        
+        media_resto = (self.n * self.media - otra.n * otra.media) / n_resto
+        delta = otra.media - media_resto
+        self.comomentos = self.comomentos - otra.comomentos - np.outer(delta, delta) * (n_resto * otra.n / self.n)
+        self.media = media_resto
+        self.n = n_resto
+        return self
+    
+    def eliminar(self, fila, peso=1):
+        """Quita una fila previamente incorporada (con su peso actual si hay decaimiento)."""
+        if peso > self.n:
+            raise ValueError("No se puede restar un conjunto mayor que el acumulado.")
+        n_resto = self.n - peso
+        if n_resto == 0:
+            self.__init__(len(self.media))
+            return self
+        
+        # Welford inverso: M_resto = M - peso * (x - media_resto)(x - media)ᵀ
+        x = np.asarray(fila, dtype=np.float64)
+        media_resto = (self.n * self.media - peso * x) / n_resto
+        self.comomentos = self.comomentos - np.outer(x - media_resto, x - self.media) * peso
+        self.media = media_resto
+        self.n = n_resto
+        return self
+    
+    def atenuar(self, factor):
+        """Multiplica el peso de todo lo acumulado por `factor` (decaimiento exponencial)."""
+        self.n *= factor
+        self.comomentos = self.comomentos * factor
+        return self
+    
+    def __add__(self, otra):
+        return self.copia().combinar(otra)
+    
+    def __sub__(self, otra):
+        return self.copia().restar(otra)
+
+class EstadisticasGrupos:
+    """Estadísticas suficientes de k grupos en arreglos: n (k,), medias (k, c) y co-momentos (k, c, c)."""
+    
+    def __init__(self, k, columnas=3):
+        self.n = np.zeros(k)
+        self.media = np.zeros((k, columnas))
+        self.comomentos = np.zeros((k, columnas, columnas))
+    
+    @property
+    def k(self):
+        return len(self.n)
+    
+    @classmethod
+    def desde_columnas(cls, grupos, k, *columnas, pesos=None):
+        """Reducción agrupada en una pasada: sumas por grupo con bincount, sin recorrer cada grupo."""
+        datos = np.column_stack([np.asarray(c, dtype=np.float64) for c in columnas])
+        estadisticas = cls(k, datos.shape[1])
+        if len(datos) == 0:
+            return estadisticas
+        
+        estadisticas.n = np.bincount(grupos, pesos, minlength=k).astype(np.float64)
+        ocupados = estadisticas.n > 0
+        ponderados = datos if pesos is None else datos * pesos[:, None]
+        for j in range(datos.shape[1]):
+            estadisticas.media[:, j] = np.bincount(grupos, ponderados[:, j], minlength=k)
+        estadisticas.media[ocupados] /= estadisticas.n[ocupados, None]
+        
+        # Co-momentos centrados en la media de cada grupo; la matriz es simétrica
+        centrados = datos - estadisticas.media[grupos]
+        if pesos is not None:
+            ponderados = centrados * pesos[:, None]
+        else:
+            ponderados = centrados
+        for i in range(datos.shape[1]):
+            for j in range(i, datos.shape[1]):
+                suma = np.bincount(grupos, ponderados[:, i] * centrados[:, j], minlength=k)
+                estadisticas.comomentos[:, i, j] = estadisticas.comomentos[:, j, i] = suma
+        return estadisticas
+    
+    @classmethod
+    def desde_dict(cls, datos):
+        media = np.array(datos['media'], dtype=np.float64)
+        estadisticas = cls(*media.shape)
+        estadisticas.n = np.array(datos['n'], dtype=np.float64)
+        estadisticas.media = media
+        estadisticas.comomentos = np.array(datos['comomentos'], dtype=np.float64)
+        return estadisticas
+    
+    def a_dict(self):
+        return {'n': self.n.tolist(), 'media': self.media.tolist(), 'comomentos': self.comomentos.tolist()}
+    
+    def combinar(self, otra):
+        """Fórmula de Chan aplicada a todos los grupos a la vez."""
+        n = self.n + otra.n
+        delta = otra.media - self.media
+        factor = np.divide(self.n * otra.n, n, out=np.zeros_like(n), where=n > 0)
+        self.comomentos = self.comomentos + otra.comomentos + delta[:, :, None] * delta[:, None, :] * factor[:, None, None]
+        self.media = self.media + delta * np.divide(otra.n, n, out=np.zeros_like(n), where=n > 0)[:, None]
+        self.n = n
+        return self
+    
+    def restar(self, otra):
+        """Quita de cada grupo un subconjunto previamente incorporado."""
+        n_resto = self.n - otra.n
+        if np.any(n_resto < 0):
+            raise ValueError("No se puede restar un conjunto mayor que el acumulado.")
+        
+        quedan = n_resto > 0
+        media_resto = np.zeros_like(self.media)
+        media_resto[quedan] = ((self.n[quedan, None] * self.media[quedan] - otra.n[quedan, None] * otra.media[quedan])
+                               / n_resto[quedan, None])
+        delta = otra.media - media_resto
+        factor = np.divide(n_resto * otra.n, self.n, out=np.zeros_like(n_resto), where=quedan)
+        self.comomentos = np.where(
+            quedan[:, None, None],
+            self.comomentos - otra.comomentos - delta[:, :, None] * delta[:, None, :] * factor[:, None, None], 0.0)
+        self.media = media_resto
+        self.n = np.where(quedan, n_resto, 0.0)
+        return self
+    
+    def atenuar(self, factor):
+        self.n = self.n * factor
+        self.comomentos = self.comomentos * factor
+        return self
+    
+    def grupo(self, i):
+        """Estadísticas de un grupo como EstadisticasSuficientes."""
+        estadisticas = EstadisticasSuficientes(self.media.shape[1])
+        estadisticas.n = float(self.n[i])
+        estadisticas.media = self.media[i].copy()
+        estadisticas.comomentos = self.comomentos[i].copy()
+        return estadisticas
+    
+    def total(self):
+        """Estadísticas de la unión de todos los grupos."""
+        total = EstadisticasSuficientes(self.media.shape[1])
+        total.n = float(self.n.sum())
+        if total.n > 0:
+            total.media = self.n @ self.media / total.n
+            delta = self.media - total.media
+            total.comomentos = self.comomentos.sum(axis=0) + (delta * self.n[:, None]).T @ delta
+        return total
+
+class AcumuladorMetricas:
+    """Acumula MAE, MSE y R² por bloques sin guardar los errores."""
+    
+    def __init__(self):
+        self.n = 0
+        self.suma_abs = 0.0
+        self.suma_cuadrados = 0.0
+        self.reales = EstadisticasSuficientes(1)
+    
+    def actualizar(self, reales, predicciones):
+        errores = np.asarray(reales, dtype=np.float64) - predicciones
+        self.n += len(errores)
+        self.suma_abs += float(np.abs(errores).sum())
+        self.suma_cuadrados += float(errores @ errores)
+        self.reales.actualizar_lote(reales)
+    
+    def combinar(self, otro):
+        self.n += otro.n
+        self.suma_abs += otro.suma_abs
+        self.suma_cuadrados += otro.suma_cuadrados
+        self.reales.combinar(otro.reales)
+        return self
+    
+    def resultado(self):
+        """Devuelve (mae, mse, r2); NaN si no se acumuló ninguna fila."""
+        if self.n == 0:
+            return math.nan, math.nan, math.nan
+        
+        ss_tot = float(self.reales.comomentos[0, 0])
+        r2 = 1 - (self.suma_cuadrados / ss_tot) if ss_tot > 0 else 1.0
+        return self.suma_abs / self.n, self.suma_cuadrados / self.n, r2
+
+class ResultadoValidacion:
+    """Métricas por pliegue de una validación cruzada o por retención."""
+    
+    METRICAS = ('mae', 'mse', 'r2')
+    
+    def __init__(self, descripcion, filas, mae, mse, r2):
+        self.descripcion = descripcion
+        self.filas = filas
+        self.mae = mae
+        self.mse = mse
+        self.r2 = r2
+    
+    @property
+    def pliegues(self):
+        return len(self.filas)
+    
+    def resumen(self):
+        """Devuelve {métrica: (media, desviación típica)} sobre los pliegues."""
+        return {metrica: (float(np.mean(getattr(self, metrica))), float(np.std(getattr(self, metrica))))
+                for metrica in self.METRICAS}
+
+# Columnas acumuladas en las estadísticas de la calculadora
+COLUMNAS_ESTADISTICAS = ("altura", "peso", "imc", "log_altura", "log_peso", "log_imc")
+
+def _columnas_estadisticas(alturas, pesos, imcs):
+    """Devuelve las columnas (lineales y logarítmicas) que se acumulan en las estadísticas."""
+    return alturas, pesos, imcs, np.log(alturas), np.log(pesos), np.log(imcs)
+
+def _resolver_minimos_cuadrados(estadisticas, columnas_x, columna_y):
+    """Resuelve la regresión lineal por mínimos cuadrados desde los co-momentos centrados."""
+    c = estadisticas.comomentos
+    x = list(columnas_x)
+    coeficientes = np.linalg.lstsq(c[np.ix_(x, x)], c[x, columna_y], rcond=None)[0]
+    intercepto = estadisticas.media[columna_y] - coeficientes @ estadisticas.media[x]
+    return float(coeficientes[0]), float(coeficientes[1]), float(intercepto)
+
+def _resolver_minimos_cuadrados_lote(grupos, columnas_x, columna_y):
+    """Resuelve a la vez la regresión de k grupos; los sistemas singulares dan NaN."""
+    x0, x1 = columnas_x
+    c, media = grupos.comomentos, grupos.media
+    a, b, d = c[:, x0, x0], c[:, x0, x1], c[:, x1, x1]
+    e, f = c[:, x0, columna_y], c[:, x1, columna_y]
+    
+    # Sistemas 2x2 resueltos en forma cerrada para todos los grupos
+    determinante = a * d - b * b
+    determinante = np.where(determinante > 1e-12 * a * d, determinante, np.nan)
+    coef_x0 = (d * e - b * f) / determinante
+    coef_x1 = (a * f - b * e) / determinante
+    intercepto = media[:, columna_y] - coef_x0 * media[:, x0] - coef_x1 * media[:, x1]
+    return np.column_stack([coef_x0, coef_x1, intercepto])
+
+class MotorModelo:
+    """Interfaz de los motores de ajuste de BMIMLCalculator."""
+    
+    nombre = ""
+    descripcion = ""
+    
+    def ajustar(self, estadisticas):
+        """Devuelve (coef_altura, coef_peso, intercepto) a partir de las estadísticas."""
+        raise NotImplementedError
+    
+    def ajustar_lote(self, grupos):
+        """Ajusta cada grupo de unas EstadisticasGrupos; devuelve un arreglo (k, 3) con NaN si no se puede."""
+        coeficientes = np.full((grupos.k, 3), np.nan)
+        for i in range(grupos.k):
+            try:
+                coeficientes[i] = self.ajustar(grupos.grupo(i))
+            except (ValueError, ZeroDivisionError, np.linalg.LinAlgError):
+                pass
+        return coeficientes
+    
+    def predecir(self, coeficientes, alturas, pesos):
+        """Evalúa el modelo para escalares o arreglos."""
+        raise NotImplementedError
+    
+    def ecuacion(self, coeficientes):
+        raise NotImplementedError
+    
+    def error_cuadratico(self, estadisticas, coeficientes):
+        """Suma exacta de errores cuadráticos desde las estadísticas, o None si no se puede derivar."""
+        return None
+
+class MotorCorrelacion(MotorModelo):
+    """Motor original: correlaciones escaladas por constantes fijas."""
+    
+    nombre = "correlacion"
+    descripcion = "Correlación escalada (original)"
+    
+    def ajustar(self, estadisticas):
+        media_altura, media_peso, media_imc = estadisticas.media[:3]
+        c = estadisticas.comomentos
+        
+        # Correlación altura-IMC
+        corr_altura_imc = float(c[0, 2]) / math.sqrt(c[0, 0] * c[2, 2])
+        
+        # Correlación peso-IMC
+        corr_peso_imc = float(c[1, 2]) / math.sqrt(c[1, 1] * c[2, 2])
+        
+        coef_altura = corr_altura_imc * 10
+        coef_peso = corr_peso_imc * 0.5
+        intercepto = float(media_imc - coef_altura * media_altura - coef_peso * media_peso)
+        return coef_altura, coef_peso, intercepto
+    
+    def ajustar_lote(self, grupos):
+        c, media = grupos.comomentos, grupos.media
+        coef_altura = c[:, 0, 2] / np.sqrt(c[:, 0, 0] * c[:, 2, 2]) * 10
+        coef_peso = c[:, 1, 2] / np.sqrt(c[:, 1, 1] * c[:, 2, 2]) * 0.5
+        intercepto = media[:, 2] - coef_altura * media[:, 0] - coef_peso * media[:, 1]
+        return np.column_stack([coef_altura, coef_peso, intercepto])
+    
+    def predecir(self, coeficientes, alturas, pesos):
+        coef_altura, coef_peso, intercepto = coeficientes
+        return coef_altura * alturas + coef_peso * pesos + intercepto
+    
+    def ecuacion(self, coeficientes):
+        coef_altura, coef_peso, intercepto = coeficientes
+        return f"IMC = {coef_altura:.4f} * altura + {coef_peso:.4f} * peso + {intercepto:.4f}"
+    
+    def error_cuadratico(self, estadisticas, coeficientes):
+        # Modelo lineal: la suma de residuos al cuadrado depende solo de medias y co-momentos
+        a, b, c = coeficientes
+        media, m = estadisticas.media, estadisticas.comomentos
+        sesgo = media[2] - a * media[0] - b * media[1] - c
+        sse = (estadisticas.n * sesgo * sesgo + m[2, 2] + a * a * m[0, 0] + b * b * m[1, 1]
+               - 2 * a * m[0, 2] - 2 * b * m[1, 2] + 2 * a * b * m[0, 1])
+        return max(float(sse), 0.0)
+
+class MotorMinimosCuadrados(MotorCorrelacion):
+    """Regresión lineal IMC ~ altura + peso por mínimos cuadrados."""
+    
+    nombre = "minimos_cuadrados"
+    descripcion = "Mínimos cuadrados lineal"
+    
+    def ajustar(self, estadisticas):
+        return _resolver_minimos_cuadrados(estadisticas, (0, 1), 2)
+    
+    def ajustar_lote(self, grupos):
+        return _resolver_minimos_cuadrados_lote(grupos, (0, 1), 2)
+
+class MotorLogaritmico(MotorModelo):
+    """Regresión log(IMC) ~ log(altura) + log(peso) por mínimos cuadrados."""
+    
+    nombre = "logaritmico"
+    descripcion = "Mínimos cuadrados logarítmico"
+    
+    def ajustar(self, estadisticas):
+        return _resolver_minimos_cuadrados(estadisticas, (3, 4), 5)
+    
+    def ajustar_lote(self, grupos):
+        return _resolver_minimos_cuadrados_lote(grupos, (3, 4), 5)
+    
+    def predecir(self, coeficientes, alturas, pesos):
+        coef_altura, coef_peso, intercepto = coeficientes
+        return np.exp(coef_altura * np.log(alturas) + coef_peso * np.log(pesos) + intercepto)
+    
+    def ecuacion(self, coeficientes):
+        coef_altura, coef_peso, intercepto = coeficientes
+        return (f"log(IMC) = {coef_altura:.4f} * log(altura) + "
+                f"{coef_peso:.4f} * log(peso) + {intercepto:.4f}")
+
+class MotorSegmentado(MotorModelo):
+    """Un modelo del motor base por segmento de altura y peso, ajustados todos a la vez.
+    
+    Los coeficientes son la tabla (segmentos, 3) aplanada; cada predicción
+    localiza su segmento en tiempo constante. Los segmentos con menos de
+    FILAS_MINIMAS filas, o cuyo sistema es singular, usan el modelo global.
+    """
+    
+    FILAS_MINIMAS = 10
+    
+    def __init__(self, base, segmentacion):
+        self.base = crear_motor(base)
+        self.segmentacion = segmentacion
+        # Se presenta con el nombre del motor base: es ese motor, ajustado por segmento
+        self.nombre = self.base.nombre
+        self.descripcion = f"{self.base.descripcion}, {segmentacion.cantidad} segmentos"
+    
+    def ajustar(self, estadisticas):
+        """Ajusta todos los segmentos desde unas EstadisticasGrupos de la segmentación."""
+        globales = self.base.ajustar(estadisticas.total())
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tabla = self.base.ajustar_lote(estadisticas)
+        
+        validos = (estadisticas.n >= self.FILAS_MINIMAS) & np.isfinite(tabla).all(axis=1)
+        tabla[~validos] = globales
+        return tuple(tabla.ravel())
+    
+    def predecir(self, coeficientes, alturas, pesos):
+        if isinstance(alturas, (int, float)):
+            i = 3 * self.segmentacion.indice(alturas, pesos)
+            return self.base.predecir(coeficientes[i:i + 3], alturas, pesos)
+        
+        with np.errstate(invalid='ignore'):
+            segmentos = self.segmentacion.indice(alturas, pesos)
+        tabla = np.asarray(coeficientes).reshape(-1, 3)[segmentos]
+        return self.base.predecir(tuple(tabla.T), alturas, pesos)
+    
+    def ecuacion(self, coeficientes):
+        tabla = np.asarray(coeficientes).reshape(-1, 3)
+        return "\n".join(f"[{self.segmentacion.describir(i)}] {self.base.ecuacion(fila)}"
+                         for i, fila in enumerate(tabla))
+
+MOTORES = {motor.nombre: motor for motor in (MotorCorrelacion, MotorMinimosCuadrados, MotorLogaritmico)}
+MOTOR_PREDETERMINADO = MotorMinimosCuadrados.nombre
+
+def crear_motor(motor):
+    """Devuelve una instancia de motor a partir de su nombre o de una instancia."""
+    if isinstance(motor, MotorModelo):
+        return motor
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconocido: {motor}. Disponibles: {', '.join(MOTORES)}")
+    return MOTORES[motor]()
+
+class InstantaneaModelo:
+    """Modelo publicado (motor, coeficientes, métricas, versión y filas); inmutable.
+    
+    La calculadora lo sustituye entero al reentrenar, así que quien conserva
+    una referencia siempre ve un modelo coherente.
+    """
+    
+    __slots__ = ('motor', 'coeficientes', 'mae', 'mse', 'r2', 'version', 'filas', 'entrenado')
+    
+    def __init__(self, motor, coeficientes=(0.0, 0.0, 0.0), metricas=(0.0, 0.0, 0.0),
+                 version=0, filas=0, entrenado=False):
+        asignar = object.__setattr__
+        asignar(self, 'motor', motor)
+        asignar(self, 'coeficientes', tuple(float(c) for c in coeficientes))
+        for nombre, valor in zip(('mae', 'mse', 'r2'), metricas):
+            asignar(self, nombre, float(valor))
+        asignar(self, 'version', version)
+        asignar(self, 'filas', filas)
+        asignar(self, 'entrenado', entrenado)
+    
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("InstantaneaModelo es inmutable")
+    
+    def __delattr__(self, nombre):
+        raise AttributeError("InstantaneaModelo es inmutable")
+    
+    def __reduce__(self):
+        return (type(self), (self.motor, self.coeficientes, (self.mae, self.mse, self.r2),
+                             self.version, self.filas, self.entrenado))
+    
+    def __repr__(self):
+        return (f"InstantaneaModelo(version={self.version}, motor={self.motor.nombre!r}, "
+                f"entrenado={self.entrenado}, filas={self.filas})")
+    
+    def predecir(self, alturas, pesos):
+        return self.motor.predecir(self.coeficientes, alturas, pesos)
+    
+    def ecuacion(self):
+        return self.motor.ecuacion(self.coeficientes)
+
+def _filas_entrenamiento(calculadora, *args, **kwargs):
+    return calculadora.num_datos_entrenamiento
+
+class BMIMLCalculator:
+    """Calculadora de IMC que utiliza Machine Learning."""
+    
+    # Filas evaluadas por bloque al calcular métricas
+    TAM_BLOQUE_METRICAS = 1_000_000
+    # Modelos anteriores conservados para revertir_modelo
+    HISTORIAL_MODELOS = 5
+    
+    def __init__(self, dtype=np.float64, motor=MOTOR_PREDETERMINADO, retener_datos=True):
+        # Sin retener datos solo se acumulan estadísticas: memoria constante
+        self.retener_datos = retener_datos
+        self._almacen = AlmacenColumnar(dtype)
+        # Estadísticas de COLUMNAS_ESTADISTICAS actualizadas con cada dato
+        self._estadisticas = EstadisticasSuficientes(len(COLUMNAS_ESTADISTICAS))
+        self.motor = crear_motor(motor)
+        
+        # Modelo publicado: se reemplaza con una sola asignación y las
+        # predicciones leen la referencia una vez, sin bloqueos
+        self.modelo = InstantaneaModelo(self.motor)
+        self._anteriores = collections.deque(maxlen=self.HISTORIAL_MODELOS)
+        self._ultima_version = 0
+        
+        # Caché opcional de predicciones (ver activar_cache)
+        self.cache = None
+        # Evaluación en línea opcional (ver activar_evaluacion_online)
+        self.evaluador = None
+        self._muestra_vencida = False
+        
+        # Modelo segmentado opcional (ver configurar_segmentos)
+        self.segmentacion = None
+        self._segmentos = None
+        
+        # Entrenamiento continuo opcional (ver configurar_ventana)
+        self.vida_media = None
+        self._factor_decaimiento = 1.0
+        self._restadas = 0
+    
+    @property
+    def altura_data(self):
+        """Vista de solo lectura de las alturas de entrenamiento."""
+        return self._almacen.altura
+    
+    @property
+    def peso_data(self):
+        """Vista de solo lectura de los pesos de entrenamiento."""
+        return self._almacen.peso
+    
+    @property
+    def imc_data(self):
+        """Vista de solo lectura de los IMC de entrenamiento."""
+        return self._almacen.imc
+    
+    @property
+    def num_datos_entrenamiento(self):
+        # Con decaimiento las estadísticas tienen un peso fraccionario: se cuentan las filas de la ventana
+        if self.vida_media:
+            return len(self._almacen)
+        return self._estadisticas.n
+    
+    @property
+    def peso_efectivo(self):
+        """Peso total de las estadísticas; con decaimiento, cuántas filas cuentan de verdad."""
+        return self._estadisticas.n
+    
+    @property
+    def tamano_ventana(self):
+        """Filas que conserva la ventana deslizante, o None en modo acumulativo."""
+        if isinstance(self._almacen, AlmacenVentana):
+            return self._almacen.tamano
+        return None
+    
+    @property
+    def filas_descartadas(self):
+        """Filas que han salido de la ventana; la fila i de los datos es la número filas_descartadas + i."""
+        if isinstance(self._almacen, AlmacenVentana):
+            return self._almacen.descartadas
+        return 0
+    
+    # Atributos del modelo publicado, de solo lectura
+    
+    @property
+    def coef_altura(self):
+        return self.modelo.coeficientes[0]
+    
+    @property
+    def coef_peso(self):
+        return self.modelo.coeficientes[1]
+    
+    @property
+    def intercepto(self):
+        return self.modelo.coeficientes[2]
+    
+    @property
+    def is_trained(self):
+        return self.modelo.entrenado
+    
+    @property
+    def mae(self):
+        return self.modelo.mae
+    
+    @property
+    def mse(self):
+        return self.modelo.mse
+    
+    @property
+    def r2(self):
+        return self.modelo.r2
+    
+    @property
+    def version_modelo(self):
+        """Versión del modelo publicado; cambia con cada publicación o reversión."""
+        return self.modelo.version
+    
+    def _instantanea(self, motor, coeficientes=(0.0, 0.0, 0.0), metricas=(0.0, 0.0, 0.0), entrenado=False):
+        """Crea una instantánea con el siguiente número de versión."""
+        self._ultima_version += 1
+        return InstantaneaModelo(motor, coeficientes, metricas, self._ultima_version,
+                                 self.num_datos_entrenamiento, entrenado)
+    
+    def publicar_modelo(self, instantanea):
+        """Publica `instantanea` como modelo activo y guarda el anterior para revertir.
+        
+        Solo se guardan modelos entrenados: cambiar de motor o de segmentos
+        publica uno sin entrenar al que no tiene sentido volver.
+        """
+        if self.modelo.entrenado:
+            self._anteriores.append(self.modelo)
+        self._ultima_version = max(self._ultima_version, instantanea.version)
+        self.modelo = instantanea
+    
+    def revertir_modelo(self):
+        """Vuelve a publicar el último modelo entrenado anterior al actual."""
+        if not self._anteriores:
+            return False, "No hay un modelo anterior al que volver."
+        
+        self.modelo = self._anteriores.pop()
+        self.motor = self.modelo.motor
+        # Las estadísticas por segmento se recalculan al entrenar si la segmentación cambió
+        if not isinstance(self.motor, MotorSegmentado):
+            self.segmentacion = self._segmentos = None
+        elif self.motor.segmentacion != self.segmentacion:
+            self.segmentacion, self._segmentos = self.motor.segmentacion, None
+        return True, f"Modelo restaurado: versión {self.modelo.version}"
+    
+    def calcular_imc_real(self, altura, peso):
+        if altura <= 0:
+            return 0.0
+        return peso / (altura * altura)
+    
+    def clasificar_imc(self, imc):
+        if imc < 18.5:
+            return "Peso insuficiente"
+        elif imc < 25.0:
+            return "Peso normal"
+        elif imc < 30.0:
+            return "Sobrepeso"
+        else:
+            return "Obesidad"
+    
+    def clasificar_imc_lote(self, imcs):
+        """Devuelve el código de clasificación (índice en CLASIFICACIONES_IMC) de cada IMC."""
+        return np.searchsorted(UMBRALES_IMC, imcs, side='right').astype(np.int8)
+    
+    @instrumentacion.medir('agregar_dato')
+    def agregar_dato(self, altura, peso):
+        """Agrega un dato de entrenamiento."""
+        if not (0 < altura <= ALTURA_MAXIMA and 0 < peso <= PESO_MAXIMO):
+            return False, "Valores fuera de rango válido."
+        
+        imc_real = self.calcular_imc_real(altura, peso)
+        if self._segmentos is not None:
+            # Las estadísticas por segmento se actualizan como un bloque de una fila
+            self._agregar_filas(np.array([altura]), np.array([peso]), np.array([imc_real]))
+            self._observar(altura, peso, imc_real)
+            return True, f"Dato agregado. IMC: {imc_real:.2f}"
+        
+        saliente = self._almacen.agregar(altura, peso, imc_real) if self.retener_datos else None
+        if self.vida_media:
+            self._estadisticas.atenuar(self._factor_decaimiento)
+        self._estadisticas.actualizar(_columnas_estadisticas(altura, peso, imc_real))
+        if saliente is not None:
+            # Con decaimiento la fila que sale llegó justo antes de toda la ventana
+            peso_saliente = self._factor_decaimiento ** len(self._almacen) if self.vida_media else 1
+            self._descontar_salientes(
+                1, lambda: self._estadisticas.eliminar(_columnas_estadisticas(*saliente), peso_saliente))
+        self._observar(altura, peso, imc_real)
+        
+        return True, f"Dato agregado. IMC: {imc_real:.2f}"
+    
+    def agregar_datos_lote(self, alturas, pesos):
+        """Agrega un lote de datos calculando el IMC de forma vectorizada."""
+        alturas = np.asarray(alturas, dtype=np.float64).ravel()
+        pesos = np.asarray(pesos, dtype=np.float64).ravel()
+        
+        if alturas.shape != pesos.shape:
+            return False, "Las columnas de altura y peso deben tener la misma longitud."
+        
+        aceptados, rechazados = self.agregar_bloque(alturas, pesos)
+        
+        if aceptados == 0:
+            return False, "Valores fuera de rango válido."
+        
+        return True, f"{aceptados} datos agregados, {rechazados} rechazados por estar fuera de rango."
+    
+    def agregar_bloque(self, alturas, pesos):
+        """Valida y agrega un bloque de columnas; devuelve (aceptados, rechazados)."""
+        validos = _mascara_rango_valido(alturas, pesos)
+        aceptados = int(np.count_nonzero(validos))
+        rechazados = len(alturas) - aceptados
+        
+        if aceptados == 0:
+            return 0, rechazados
+        
+        alturas = np.asarray(alturas[validos] if rechazados else alturas, dtype=np.float64)
+        pesos = np.asarray(pesos[validos] if rechazados else pesos, dtype=np.float64)
+        
+        imcs = pesos / (alturas * alturas)
+        self._agregar_filas(alturas, pesos, imcs)
+        self._observar(alturas, pesos, imcs)
+        return aceptados, rechazados
+    
+    def _agregar_filas(self, alturas, pesos, imcs):
+        """Incorpora filas ya validadas al almacén y a las estadísticas."""
+        salientes = self._almacen.agregar_lote(alturas, pesos, imcs) if self.retener_datos else None
+        
+        k = len(alturas)
+        ventana = self.tamano_ventana
+        # Las primeras filas de un bloque mayor que la ventana nunca llegan a contar
+        exceso = max(k - ventana, 0) if ventana is not None else 0
+        if exceso:
+            alturas, pesos, imcs = alturas[exceso:], pesos[exceso:], imcs[exceso:]
+        if self.vida_media:
+            # Filas más recientes con más peso: la fila i del bloque pesa factor^(k-1-i)
+            self._atenuar(self._factor_decaimiento ** k)
+            self._sumar(*self._estadisticas_bloque(alturas, pesos, imcs, self._pesos_decaimiento(k - exceso)))
+        else:
+            self._sumar(*self._estadisticas_bloque(alturas, pesos, imcs))
+        
+        if salientes is not None and len(salientes[0]):
+            salidas = len(salientes[0])
+            pesos_salientes = None
+            if self.vida_media:
+                # Después de las salientes llegaron las filas de la ventana y el exceso del bloque
+                pesos_salientes = (self._pesos_decaimiento(salidas)
+                                   * self._factor_decaimiento ** (len(self._almacen) + exceso))
+            self._descontar_salientes(salidas, lambda: self._restar(*self._estadisticas_bloque(*salientes, pesos_salientes)))
+    
+    def _estadisticas_bloque(self, alturas, pesos, imcs, pesos_filas=None):
+        """Estadísticas globales y, con segmentos, por segmento de un bloque de filas."""
+        columnas = _columnas_estadisticas(alturas, pesos, imcs)
+        globales = EstadisticasSuficientes.desde_columnas(*columnas, pesos=pesos_filas)
+        if self._segmentos is None:
+            return globales, None
+        grupos = self.segmentacion.indice(alturas, pesos)
+        return globales, EstadisticasGrupos.desde_columnas(grupos, self.segmentacion.cantidad, *columnas,
+                                                           pesos=pesos_filas)
+    
+    def _sumar(self, globales, segmentos):
+        self._estadisticas.combinar(globales)
+        if segmentos is not None:
+            self._segmentos.combinar(segmentos)
+    
+    def _restar(self, globales, segmentos):
+        self._estadisticas.restar(globales)
+        if segmentos is not None:
+            self._segmentos.restar(segmentos)
+    
+    def _atenuar(self, factor):
+        self._estadisticas.atenuar(factor)
+        if self._segmentos is not None:
+            self._segmentos.atenuar(factor)
+    
+    def _descontar_salientes(self, cantidad, restar):
+        """Resta de las estadísticas las filas que salieron de la ventana.
+        
+        Restar acumula error de redondeo, así que tras descartar tantas filas
+        como caben en la ventana se recalcula desde ella (coste amortizado
+        constante por fila).
+        """
+        self._muestra_vencida = True
+        self._restadas += cantidad
+        if self._restadas >= self.tamano_ventana:
+            self._recalcular_estadisticas()
+        else:
+            restar()
+    
+    def _pesos_decaimiento(self, k):
+        """Peso actual de las últimas k filas, de la más antigua a la más reciente."""
+        return self._factor_decaimiento ** np.arange(k - 1, -1, -1, dtype=np.float64)
+    
+    def _recalcular_estadisticas(self):
+        """Recalcula las estadísticas (y las de cada segmento) desde las filas retenidas."""
+        pesos = self._pesos_decaimiento(len(self._almacen)) if self.vida_media else None
+        self._estadisticas, segmentos = self._estadisticas_bloque(
+            self.altura_data, self.peso_data, self.imc_data, pesos)
+        if segmentos is not None:
+            self._segmentos = segmentos
+        self._restadas = 0
+    
+    def configurar_segmentos(self, tramos_altura, tramos_peso=None):
+        """Ajusta un modelo del motor activo por segmento de altura y peso.
+        
+        `tramos_altura` y `tramos_peso` son segmentacion.Tramos o tuplas
+        (inicio, ancho, cantidad). Las estadísticas de cada segmento se
+        calculan en una pasada agrupada sobre las filas retenidas y después
+        se mantienen con cada dato, así que el entrenamiento sigue sin
+        recorrer los datos. El modelo debe volver a entrenarse.
+        """
+        try:
+            nueva = segmentacion.Segmentacion(tramos_altura, tramos_peso)
+        except (TypeError, ValueError) as e:
+            return False, f"Segmentación no válida: {e}"
+        if len(self._almacen) != self.num_datos_entrenamiento:
+            return False, "La segmentación necesita las filas de entrenamiento retenidas."
+        
+        self.segmentacion = nueva
+        self._segmentos = EstadisticasGrupos(nueva.cantidad, len(COLUMNAS_ESTADISTICAS))
+        self._recalcular_estadisticas()
+        return self.seleccionar_motor(self._motor_base())
+    
+    def desactivar_segmentos(self):
+        """Vuelve a un único modelo global."""
+        if self.segmentacion is None:
+            return False, "No hay segmentos configurados."
+        self.segmentacion = None
+        self._segmentos = None
+        return self.seleccionar_motor(self._motor_base())
+    
+    def _motor_base(self):
+        return self.motor.base if isinstance(self.motor, MotorSegmentado) else self.motor
+    
+    def _estadisticas_ajuste(self, motor):
+        """Estadísticas con las que se ajusta `motor`: las globales o las de sus segmentos."""
+        if not isinstance(motor, MotorSegmentado):
+            return self._estadisticas
+        if self._segmentos is None or motor.segmentacion != self.segmentacion:
+            # Modelo segmentado restaurado con otra segmentación: se recalcula desde las filas
+            if len(self._almacen) != self.num_datos_entrenamiento:
+                raise ValueError("La segmentación necesita las filas de entrenamiento retenidas.")
+            self.segmentacion = motor.segmentacion
+            self._segmentos = EstadisticasGrupos(motor.segmentacion.cantidad, len(COLUMNAS_ESTADISTICAS))
+            self._recalcular_estadisticas()
+        return self._segmentos
+    
+    def configurar_ventana(self, tamano, vida_media=None):
+        """Entrena solo con datos recientes y memoria constante.
+        
+        Se conservan las últimas `tamano` filas y las estadísticas son
+        exactamente las de la ventana: cada fila que sale se resta. Con
+        `vida_media` (en filas) además decaen exponencialmente y cada fila
+        pesa la mitad tras `vida_media` filas nuevas. En ambos casos
+        reentrenar no recorre los datos.
+        """
+        try:
+            if vida_media is not None and vida_media <= 0:
+                raise ValueError("La vida media debe ser positiva.")
+            ventana = AlmacenVentana(tamano, self._almacen.dtype)
+        except ValueError as e:
+            return False, str(e)
+        if len(self._almacen) != self.num_datos_entrenamiento:
+            return False, "La ventana necesita las filas de entrenamiento retenidas."
+        
+        ventana.agregar_lote(self.altura_data, self.peso_data, self.imc_data)
+        ventana.descartadas += self.filas_descartadas
+        self._almacen = ventana
+        self.retener_datos = True
+        self.vida_media = vida_media
+        self._factor_decaimiento = 0.5 ** (1.0 / vida_media) if vida_media else 1.0
+        self._recalcular_estadisticas()
+        self._resembrar_evaluador()
+        
+        modo = f"vida media de {vida_media} filas" if vida_media else "estadísticas de la ventana"
+        return True, f"Ventana de {ventana.tamano} filas activada ({modo})"
+    
+    def desactivar_ventana(self):
+        """Vuelve al modo acumulativo conservando las filas de la ventana."""
+        if self.tamano_ventana is None:
+            return False, "No hay una ventana activa."
+        
+        almacen = AlmacenColumnar(self._almacen.dtype, capacidad=len(self._almacen))
+        almacen.agregar_lote(self.altura_data, self.peso_data, self.imc_data)
+        self._almacen = almacen
+        if self.vida_media:
+            self.vida_media = None
+            self._factor_decaimiento = 1.0
+            self._recalcular_estadisticas()
+        return True, f"Ventana desactivada: {self.num_datos_entrenamiento} datos"
+    
+    def eliminar_dato(self, indice):
+        """Elimina un dato de entrenamiento y lo descuenta de las estadísticas."""
+        try:
+            fila = self._almacen.eliminar(indice)
+        except IndexError as e:
+            return False, str(e)
+        
+        if self.vida_media:
+            # El peso de cada fila depende de su posición: las anteriores a la
+            # eliminada cambian de peso, así que se recalcula (eliminar ya es O(n))
+            self._recalcular_estadisticas()
+        else:
+            self._estadisticas.eliminar(_columnas_estadisticas(*fila))
+            if self._segmentos is not None:
+                _, segmentos = self._estadisticas_bloque(*(np.array([valor]) for valor in fila))
+                self._segmentos.restar(segmentos)
+        self._resembrar_evaluador()
+        return True, f"Dato eliminado. Datos restantes: {self.num_datos_entrenamiento}"
+    
+    def combinar(self, otra):
+        """Incorpora los datos de otra calculadora sumando sus estadísticas."""
+        if self.tamano_ventana is not None:
+            # La ventana necesita las filas: se agregan en orden como un bloque más
+            self._agregar_filas(otra.altura_data, otra.peso_data, otra.imc_data)
+            self._observar(otra.altura_data, otra.peso_data, otra.imc_data)
+            return True, f"{len(otra.altura_data)} datos combinados. Total: {self.num_datos_entrenamiento}"
+        
+        if self._segmentos is not None:
+            if otra.segmentacion == self.segmentacion and otra._segmentos is not None:
+                segmentos = otra._segmentos
+            elif len(otra.altura_data) == otra.num_datos_entrenamiento:
+                _, segmentos = self._estadisticas_bloque(otra.altura_data, otra.peso_data, otra.imc_data)
+            else:
+                return False, "Los datos a combinar no tienen filas ni segmentos compatibles."
+            self._segmentos.combinar(segmentos)
+        
+        if self.retener_datos:
+            self._almacen.agregar_lote(otra.altura_data, otra.peso_data, otra.imc_data)
+        self._estadisticas.combinar(otra._estadisticas)
+        if len(otra.altura_data):
+            self._observar(otra.altura_data, otra.peso_data, otra.imc_data)
+        return True, f"{otra.num_datos_entrenamiento} datos combinados. Total: {self.num_datos_entrenamiento}"
+    
+    def guardar_modelo(self, ruta):
+        """Guarda coeficientes, métricas y datos de entrenamiento en formato binario."""
+        modelo = self.modelo
+        cabecera = {
+            'motor': modelo.motor.nombre,
+            'entrenado': modelo.entrenado,
+            'coeficientes': list(modelo.coeficientes),
+            'metricas': {'mae': modelo.mae, 'mse': modelo.mse, 'r2': modelo.r2},
+            'estadisticas': self._estadisticas.a_dict(),
+            'retener_datos': self.retener_datos,
+        }
+        if isinstance(modelo.motor, MotorSegmentado):
+            cabecera['segmentacion'] = modelo.motor.segmentacion.a_dict()
+            if self._segmentos is not None and self.segmentacion == modelo.motor.segmentacion:
+                cabecera['estadisticas_segmentos'] = self._segmentos.a_dict()
+        if self.tamano_ventana is not None:
+            cabecera['ventana'] = {'tamano': self.tamano_ventana, 'vida_media': self.vida_media,
+                                   'descartadas': self.filas_descartadas}
+        # La ventana y los segmentos requieren la versión 2; el resto sigue siendo legible por la 1
+        version = 2 if 'segmentacion' in cabecera or 'ventana' in cabecera else 1
+        
+        try:
+            self._almacen.liberar_archivo(ruta)
+            persistencia.guardar(ruta, (self.altura_data, self.peso_data, self.imc_data), cabecera, version)
+        except OSError as e:
+            return False, f"No se pudo guardar el modelo: {e}"
+        
+        return True, f"Modelo guardado en {ruta}"
+    
+    def cargar_modelo(self, ruta):
+        """Carga un modelo guardado; los datos quedan mapeados en memoria."""
+        try:
+            cabecera, columnas = persistencia.cargar(ruta)
+            motor = crear_motor(cabecera['motor'])
+            if cabecera.get('segmentacion'):
+                motor = MotorSegmentado(motor, segmentacion.Segmentacion.desde_dict(cabecera['segmentacion']))
+        except (OSError, ValueError, KeyError) as e:
+            return False, f"No se pudo cargar el modelo: {e}"
+        
+        self._almacen = AlmacenColumnar.desde_columnas(*columnas)
+        self._estadisticas = EstadisticasSuficientes.desde_dict(cabecera['estadisticas'])
+        self.retener_datos = cabecera.get('retener_datos', True)
+        self.vida_media = None
+        self._factor_decaimiento = 1.0
+        self._restadas = 0
+        self.segmentacion = None
+        self._segmentos = None
+        if isinstance(motor, MotorSegmentado):
+            self.segmentacion = motor.segmentacion
+            if 'estadisticas_segmentos' in cabecera:
+                self._segmentos = EstadisticasGrupos.desde_dict(cabecera['estadisticas_segmentos'])
+        ventana = cabecera.get('ventana')
+        if ventana:
+            # Las estadísticas guardadas ya son las de la ventana (o las decaídas): no se recalculan
+            self._almacen = AlmacenVentana(ventana['tamano'], self._almacen.dtype)
+            self._almacen.agregar_lote(*columnas)
+            self._almacen.descartadas = ventana['descartadas']
+            self.vida_media = ventana['vida_media']
+            if self.vida_media:
+                self._factor_decaimiento = 0.5 ** (1.0 / self.vida_media)
+        self._resembrar_evaluador()
+        self.motor = motor
+        # La cabecera guarda como null las métricas no finitas (p. ej. sin filas para evaluar)
+        metricas = [math.nan if cabecera['metricas'][m] is None else cabecera['metricas'][m]
+                    for m in ('mae', 'mse', 'r2')]
+        coeficientes = [math.nan if c is None else c for c in cabecera['coeficientes']]
+        self.publicar_modelo(self._instantanea(motor, coeficientes, metricas, cabecera['entrenado']))
+        
+        return True, f"Modelo cargado: {self.num_datos_entrenamiento} datos"
+    
+    @classmethod
+    def desde_archivo(cls, ruta):
+        """Crea una calculadora a partir de un modelo guardado."""
+        calculadora = cls()
+        exito, mensaje = calculadora.cargar_modelo(ruta)
+        if not exito:
+            raise ValueError(mensaje)
+        return calculadora
+    
+    def seleccionar_motor(self, motor):
+        """Cambia el motor de ajuste; el modelo debe volver a entrenarse."""
+        try:
+            motor = crear_motor(motor)
+        except ValueError as e:
+            return False, str(e)
+        
+        if self.segmentacion is not None:
+            motor = MotorSegmentado(motor.base if isinstance(motor, MotorSegmentado) else motor, self.segmentacion)
+        self.motor = motor
+        self.publicar_modelo(self._instantanea(self.motor))
+        return True, f"Motor seleccionado: {self.motor.descripcion}"
+    
+    @property
+    def coeficientes(self):
+        return self.modelo.coeficientes
+    
+    def ecuacion(self):
+        """Ecuación del modelo publicado."""
+        return self.modelo.ecuacion()
+    
+    def evaluar_modelo(self, alturas, pesos):
+        """Evalúa el modelo publicado sin validar rangos (escalares o arreglos)."""
+        return self.modelo.predecir(alturas, pesos)
+    
+    def activar_evaluacion_online(self, tam_muestra=evaluacion_online.TAM_MUESTRA):
+        """Mantiene métricas, histograma y cuantiles de error sin recorrer todos los datos."""
+        try:
+            self.evaluador = evaluacion_online.EvaluadorOnline(tam_muestra)
+        except ValueError as e:
+            return False, str(e)
+        self._resembrar_evaluador()
+        return True, f"Evaluación en línea activada (muestra de {tam_muestra} filas)"
+    
+    def desactivar_evaluacion_online(self):
+        self.evaluador = None
+        return True, "Evaluación en línea desactivada"
+    
+    def _resembrar_evaluador(self):
+        """Vuelve a tomar la muestra del evaluador cuando los datos cambian de otro modo que añadiendo filas."""
+        self._muestra_vencida = False
+        if self.evaluador is not None:
+            self.evaluador.sembrar(self.altura_data, self.peso_data, self.imc_data)
+    
+    def _observar(self, alturas, pesos, imcs):
+        # Si salieron filas de la ventana la muestra se vuelve a tomar al consultarla
+        if self.evaluador is not None and not self._muestra_vencida:
+            self.evaluador.observar(alturas, pesos, imcs, self.modelo)
+    
+    def _evaluador_al_dia(self):
+        if self._muestra_vencida:
+            self._resembrar_evaluador()
+        return self.evaluador
+    
+    def evaluacion_actual(self):
+        """Métricas, cuantiles e histograma de errores del modelo publicado, o None.
+        
+        Requiere activar_evaluacion_online; no recorre los datos.
+        """
+        if self.evaluador is None:
+            return None
+        return self._evaluador_al_dia().resultado(self.modelo, self._estadisticas)
+    
+    @instrumentacion.medir('entrenar_modelo', filas=_filas_entrenamiento)
+    def entrenar_modelo(self, progreso=None, bloques_evaluacion=None, evaluar=None):
+        """Entrena el modelo de regresión múltiple.
+        
+        `progreso(fraccion)` se invoca durante el cálculo de métricas y puede
+        lanzar una excepción para cancelar; en ese caso el modelo no cambia.
+        Si los datos no se retienen, las métricas se calculan sobre
+        `bloques_evaluacion` (iterable de (alturas, pesos)) o quedan en NaN.
+        `evaluar(coeficientes)` sustituye a ese cálculo y devuelve
+        (mae, mse, r2), p. ej. evaluando en paralelo. Con la evaluación en
+        línea activa, las métricas salen del evaluador sin recorrer los datos.
+        """
+        if self.num_datos_entrenamiento < 3:
+            return False, "Se necesitan al menos 3 datos para entrenar el modelo."
+        
+        motor = self.motor
+        try:
+            # Las estadísticas ya están acumuladas: el ajuste no recorre los datos
+            coeficientes = motor.ajustar(self._estadisticas_ajuste(motor))
+        except Exception as e:
+            return False, f"Error durante el entrenamiento: {e}"
+        
+        # Calcular métricas antes de publicar el modelo nuevo
+        if evaluar is not None:
+            metricas = evaluar(coeficientes)
+        elif self.evaluador is not None and bloques_evaluacion is None:
+            metricas = self._evaluador_al_dia().metricas(motor, coeficientes, self._estadisticas)
+        else:
+            metricas = self._calcular_metricas(coeficientes, progreso, bloques_evaluacion)
+        
+        # El modelo nuevo se publica de una vez; las predicciones en curso
+        # terminan con la instantánea que ya tenían
+        self.publicar_modelo(self._instantanea(motor, coeficientes, metricas, entrenado=True))
+        
+        return True, f"Modelo entrenado exitosamente!\n{self.ecuacion()}"
+    
+    @instrumentacion.medir('_calcular_metricas', filas=_filas_entrenamiento)
+    def _calcular_metricas(self, coeficientes, progreso=None, bloques=None):
+        """Calcula (mae, mse, r2) de los coeficientes sobre los datos de entrenamiento o `bloques`."""
+        if bloques is None:
+            bloques = self._bloques_entrenamiento()
+        else:
+            bloques = self._bloques_validados(bloques)
+        return self._acumular_metricas(self.motor, coeficientes, bloques, progreso).resultado()
+    
+    def evaluar_bloques(self, bloques):
+        """Acumula las métricas del modelo publicado sobre bloques (alturas, pesos) externos."""
+        modelo = self.modelo
+        return self._acumular_metricas(modelo.motor, modelo.coeficientes, self._bloques_validados(bloques))
+    
+    def _acumular_metricas(self, motor, coeficientes, bloques, progreso=None):
+        # El MAE no se deriva de las estadísticas: una pasada vectorizada por bloques
+        acumulador = AcumuladorMetricas()
+        for alturas, pesos, imcs, avance in bloques:
+            acumulador.actualizar(imcs, motor.predecir(coeficientes, alturas, pesos))
+            if progreso and avance is not None:
+                progreso(avance)
+        return acumulador
+    
+    def _bloques_entrenamiento(self):
+        """Genera (alturas, pesos, imcs, fracción) de los datos retenidos."""
+        n = len(self._almacen)
+        for inicio in range(0, n, self.TAM_BLOQUE_METRICAS):
+            fin = min(inicio + self.TAM_BLOQUE_METRICAS, n)
+            yield self.altura_data[inicio:fin], self.peso_data[inicio:fin], self.imc_data[inicio:fin], fin / n
+    
+    def _bloques_validados(self, bloques):
+        """Filtra las filas fuera de rango de bloques (alturas, pesos) y calcula su IMC real."""
+        for alturas, pesos in bloques:
+            alturas = np.asarray(alturas, dtype=np.float64)
+            pesos = np.asarray(pesos, dtype=np.float64)
+            validos = _mascara_rango_valido(alturas, pesos)
+            alturas, pesos = alturas[validos], pesos[validos]
+            yield alturas, pesos, pesos / (alturas * alturas), None
+    
+    def validar_modelo(self, pliegues=5, fraccion_prueba=None, semilla=0, hilos=None, progreso=None):
+        """Valida el motor activo por k pliegues o, con `fraccion_prueba`, por retención.
+        
+        Los pliegues se asignan una sola vez. Cada modelo se ajusta con las
+        estadísticas del total menos las de su pliegue, y todos se puntúan en
+        una única pasada por bloques (en `hilos` hilos si se indica).
+        Devuelve (ResultadoValidacion, mensaje) o (None, mensaje).
+        """
+        if isinstance(self.motor, MotorSegmentado):
+            return None, "La validación cruzada no admite el modelo segmentado."
+        
+        n = len(self._almacen)
+        generador = np.random.default_rng(semilla)
+        
+        if fraccion_prueba is None:
+            if pliegues < 2:
+                return None, "Se necesitan al menos 2 pliegues."
+            grupos = np.empty(n, dtype=np.intp)
+            grupos[generador.permutation(n)] = np.arange(n) % pliegues
+            probados = list(range(pliegues))
+            k = pliegues
+            descripcion = f"{pliegues} pliegues"
+        else:
+            if not 0 < fraccion_prueba < 1:
+                return None, "La fracción de prueba debe estar entre 0 y 1."
+            # Grupo 1: filas de prueba; el grupo 0 solo se usa para entrenar
+            grupos = np.zeros(n, dtype=np.intp)
+            grupos[generador.permutation(n)[:round(n * fraccion_prueba)]] = 1
+            probados = [1]
+            k = 2
+            descripcion = f"retención {fraccion_prueba:.0%}"
+        
+        # Con menos filas que grupos alguno queda vacío y lo rechaza la comprobación
+        filas = np.bincount(grupos, minlength=k)
+        if filas[probados].min() < 1 or n - filas[probados].max() < 3:
+            return None, "No hay datos suficientes para validar el modelo."
+        
+        bloques = [(inicio, min(inicio + self.TAM_BLOQUE_METRICAS, n))
+                   for inicio in range(0, n, self.TAM_BLOQUE_METRICAS)]
+        
+        with concurrent.futures.ThreadPoolExecutor(hilos or 1) as ejecutor:
+            # Estadísticas por grupo en una pasada; las de entrenamiento se obtienen restando
+            por_grupo = [EstadisticasSuficientes(len(COLUMNAS_ESTADISTICAS)) for _ in range(k)]
+            for i, parciales in enumerate(ejecutor.map(
+                    lambda b: self._estadisticas_grupos(grupos, k, *b), bloques)):
+                for total, parcial in zip(por_grupo, parciales):
+                    total.combinar(parcial)
+                if progreso:
+                    progreso(0.5 * (i + 1) / len(bloques))
+            
+            total = EstadisticasSuficientes(len(COLUMNAS_ESTADISTICAS))
+            for estadisticas in por_grupo:
+                total.combinar(estadisticas)
+            
+            coeficientes = np.zeros((k, 3))
+            try:
+                for g in probados:
+                    coeficientes[g] = self.motor.ajustar(total - por_grupo[g])
+            except Exception as e:
+                return None, f"Error durante la validación: {e}"
+            
+            # Cada fila se puntúa con los coeficientes de su propio pliegue
+            suma_abs = np.zeros(k)
+            suma_cuadrados = np.zeros(k)
+            for i, (abs_bloque, cuadrados_bloque) in enumerate(ejecutor.map(
+                    lambda b: self._errores_grupos(grupos, k, coeficientes, *b), bloques)):
+                suma_abs += abs_bloque
+                suma_cuadrados += cuadrados_bloque
+                if progreso:
+                    progreso(0.5 + 0.5 * (i + 1) / len(bloques))
+        
+        filas = filas[probados]
+        ss_tot = np.array([por_grupo[g].comomentos[2, 2] for g in probados])
+        sse = suma_cuadrados[probados]
+        r2 = np.where(ss_tot > 0, 1 - sse / np.where(ss_tot > 0, ss_tot, 1), 1.0)
+        resultado = ResultadoValidacion(descripcion, filas, suma_abs[probados] / filas, sse / filas, r2)
+        
+        mae, desviacion = resultado.resumen()['mae']
+        return resultado, f"Validación ({descripcion}): MAE {mae:.4f} ± {desviacion:.4f}"
+    
+    def _estadisticas_grupos(self, grupos, k, inicio, fin):
+        """Estadísticas suficientes de cada grupo dentro de las filas [inicio, fin)."""
+        orden = np.argsort(grupos[inicio:fin], kind='stable') + inicio
+        limites = np.cumsum(np.bincount(grupos[inicio:fin], minlength=k))[:-1]
+        columnas = _columnas_estadisticas(self.altura_data[orden], self.peso_data[orden], self.imc_data[orden])
+        return [EstadisticasSuficientes.desde_columnas(*segmento)
+                for segmento in zip(*(np.split(columna, limites) for columna in columnas))]
+    
+    def _errores_grupos(self, grupos, k, coeficientes, inicio, fin):
+        """Suma de errores absolutos y cuadráticos por grupo en las filas [inicio, fin)."""
+        g = grupos[inicio:fin]
+        filas_coeficientes = coeficientes[g]
+        predicciones = self.motor.predecir(tuple(filas_coeficientes.T), self.altura_data[inicio:fin],
+                                           self.peso_data[inicio:fin])
+        errores = self.imc_data[inicio:fin] - predicciones
+        return (np.bincount(g, np.abs(errores), minlength=k),
+                np.bincount(g, errores * errores, minlength=k))
+    
+    @instrumentacion.medir('predecir_imc')
+    def predecir_imc(self, altura, peso):
+        """Predice el IMC usando el modelo entrenado."""
+        # Toda la predicción usa la misma instantánea aunque se publique otra
+        modelo = self.modelo
+        if not modelo.entrenado:
+            return None, "El modelo debe ser entrenado primero."
+        
+        if not (0 < altura <= ALTURA_MAXIMA and 0 < peso <= PESO_MAXIMO):
+            return None, "Valores fuera de rango válido."
+        
+        cache = self.cache
+        if cache is not None:
+            cache.sincronizar(modelo.version)
+            clave = cache_predicciones.cuantizar(altura, peso)
+            registro = cache.obtener(clave, altura, peso)
+            if registro is not None:
+                imc_ml, imc_real, diferencia, clase_ml, clase_real, _ = registro
+                return {
+                    'imc_ml': imc_ml,
+                    'imc_real': imc_real,
+                    'diferencia': diferencia,
+                    'clasificacion_ml': CLASIFICACIONES_IMC[clase_ml],
+                    'clasificacion_real': CLASIFICACIONES_IMC[clase_real]
+                }, "Predicción exitosa"
+        
+        imc_ml = float(modelo.predecir(altura, peso))
+        imc_real = self.calcular_imc_real(altura, peso)
+        
+        resultado = {
+            'imc_ml': imc_ml,
+            'imc_real': imc_real,
+            'diferencia': abs(imc_ml - imc_real),
+            'clasificacion_ml': self.clasificar_imc(imc_ml),
+            'clasificacion_real': self.clasificar_imc(imc_real)
+        }
+        
+        if cache is not None:
+            cache.guardar(clave, altura, peso, (
+                imc_ml, imc_real, resultado['diferencia'],
+                _CODIGOS_CLASIFICACION[resultado['clasificacion_ml']],
+                _CODIGOS_CLASIFICACION[resultado['clasificacion_real']], True))
+        return resultado, "Predicción exitosa"
+    
+    def activar_cache(self, capacidad=cache_predicciones.CAPACIDAD_CACHE):
+        """Antepone a la predicción una caché LRU indexada por (cm, 0.1 kg)."""
+        try:
+            self.cache = cache_predicciones.CachePredicciones(capacidad)
+        except ValueError as e:
+            return False, str(e)
+        return True, f"Caché de predicciones activada ({capacidad} entradas)"
+    
+    def desactivar_cache(self):
+        self.cache = None
+        return True, "Caché de predicciones desactivada"
+    
+    def predecir_imc_lote(self, alturas, pesos):
+        """Predice el IMC de un lote de datos en una sola evaluación vectorizada."""
+        modelo = self.modelo
+        if not modelo.entrenado:
+            return None, "El modelo debe ser entrenado primero."
+        
+        alturas = np.asarray(alturas, dtype=np.float64).ravel()
+        pesos = np.asarray(pesos, dtype=np.float64).ravel()
+        
+        if alturas.shape != pesos.shape:
+            return None, "Las columnas de altura y peso deben tener la misma longitud."
+        
+        # Las filas fuera de rango quedan marcadas en lugar de cortar la ejecución
+        validos = _mascara_rango_valido(alturas, pesos)
+        if self.cache is None:
+            resultado = self._evaluar_lote(modelo, alturas, pesos, validos)
+        else:
+            resultado = self._evaluar_lote_con_cache(modelo, alturas, pesos, validos)
+        
+        invalidos = len(validos) - int(np.count_nonzero(validos))
+        return resultado, f"Predicción exitosa. {invalidos} filas fuera de rango válido."
+    
+    def _evaluar_lote_con_cache(self, modelo, alturas, pesos, validos):
+        """Evalúa un lote calculando una sola vez cada (altura, peso) repetido y usando la caché."""
+        cache = self.cache
+        cache.sincronizar(modelo.version)
+        
+        # Un representante por celda (cm, 0.1 kg); se busca en la caché o se calcula
+        filas = np.flatnonzero(validos)
+        claves = cache_predicciones.cuantizar_lote(alturas[filas], pesos[filas])
+        unicas, representantes, inversa = np.unique(claves, return_index=True, return_inverse=True)
+        alturas_rep = alturas[filas[representantes]]
+        pesos_rep = pesos[filas[representantes]]
+        
+        registros = np.empty(len(unicas), dtype=DTYPE_PREDICCION)
+        faltan = []
+        for i, (clave, altura, peso) in enumerate(zip(unicas.tolist(), alturas_rep.tolist(), pesos_rep.tolist())):
+            registro = cache.obtener(clave, altura, peso)
+            if registro is None:
+                faltan.append(i)
+            else:
+                registros[i] = registro
+        
+        if faltan:
+            nuevos = self._evaluar_lote(modelo, alturas_rep[faltan], pesos_rep[faltan], np.ones(len(faltan), dtype=bool))
+            registros[faltan] = nuevos
+            for i, registro in zip(faltan, nuevos.tolist()):
+                cache.guardar(int(unicas[i]), float(alturas_rep[i]), float(pesos_rep[i]), registro)
+        
+        # Solo reciben el registro de su celda las filas idénticas al representante
+        iguales = (alturas[filas] == alturas_rep[inversa]) & (pesos[filas] == pesos_rep[inversa])
+        resultado = np.empty(len(alturas), dtype=DTYPE_PREDICCION)
+        resultado[filas[iguales]] = registros[inversa[iguales]]
+        
+        directas = ~validos
+        directas[filas[~iguales]] = True
+        if directas.any():
+            resultado[directas] = self._evaluar_lote(modelo, alturas[directas], pesos[directas], validos[directas])
+        return resultado
+    
+    def _evaluar_lote(self, modelo, alturas, pesos, validos):
+        """Registros de predicción de un lote con `modelo`; las filas no válidas quedan en NaN."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            imc_ml = np.where(validos, modelo.predecir(alturas, pesos), np.nan)
+            imc_real = np.where(validos, pesos / (alturas * alturas), np.nan)
+        
+        resultado = np.empty(len(alturas), dtype=DTYPE_PREDICCION)
+        resultado['imc_ml'] = imc_ml
+        resultado['imc_real'] = imc_real
+        resultado['diferencia'] = np.abs(imc_ml - imc_real)
+        resultado['clase_ml'] = np.where(validos, self.clasificar_imc_lote(imc_ml), CLASE_INVALIDA)
+        resultado['clase_real'] = np.where(validos, self.clasificar_imc_lote(imc_real), CLASE_INVALIDA)
+        resultado['valido'] = validos
+        return resultado
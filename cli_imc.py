@@ -0,0 +1,234 @@
+# ============================================================================
+# CALCULADORA DE IMC CON MACHINE LEARNING - LÍNEA DE COMANDOS
+# ============================================================================
+# Entrenamiento, predicción y evaluación por lotes sin interfaz gráfica. Los
+# registros (altura, peso) se leen en bloques desde archivos (.csv, .txt,
+# .npy) o desde stdin ('-'), por lo que la memoria no depende de la entrada.
+#
+#   python cli_imc.py train datos.csv -o modelo.imcml [--motor logaritmico]
+#   python cli_imc.py train alturas.npy pesos.npy -o modelo.imcml --procesos 8
+#   python cli_imc.py train - -o modelo.imcml --ventana 100000 [--vida-media 20000]
+#   python cli_imc.py train datos.csv -o modelo.imcml --tramos-altura 1.5,0.1,5 [--tramos-peso 50,20,4]
+#   python cli_imc.py predict -m modelo.imcml [datos.csv | -] [--formato jsonl]
+#   python cli_imc.py eval -m modelo.imcml datos.csv
+# ============================================================================
+
+import argparse
+import json
+import math
+import os
+import sys
+
+import exportador
+import importador
+import paralelo
+import segmentacion
+from calculadora_imc import BMIMLCalculator, MOTORES, MOTOR_PREDETERMINADO
+
+ENTRADA_ESTANDAR = '-'
+
+def _bloques(entradas, tam_bloque, conservar_ilegibles=False):
+    """Encadena los bloques (alturas, pesos, ilegibles, fracción) de todas las entradas.
+    
+    Con `conservar_ilegibles` las líneas ilegibles llegan como filas NaN.
+    """
+    for entrada in entradas:
+        if entrada == ENTRADA_ESTANDAR:
+            yield from importador.leer_bloques_texto(sys.stdin, tam_bloque,
+                                                     conservar_ilegibles=conservar_ilegibles)
+        else:
+            yield from importador.leer_bloques(entrada, tam_bloque=tam_bloque,
+                                               conservar_ilegibles=conservar_ilegibles)
+
+def _tramos(texto):
+    try:
+        return segmentacion.Tramos.desde_texto(texto)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+def _json(datos):
+    """Serializa un resumen plano; las métricas no finitas (p. ej. sin filas) se escriben como null."""
+    return json.dumps({clave: None if isinstance(valor, float) and not math.isfinite(valor) else valor
+                       for clave, valor in datos.items()}, allow_nan=False)
+
+def _cargar_modelo(ruta):
+    calculadora = BMIMLCalculator.desde_archivo(ruta)
+    if not calculadora.is_trained:
+        raise ValueError(f"El modelo {ruta} no está entrenado.")
+    return calculadora
+
+def _entrenar_serial(calculadora, args):
+    resumen = importador.importar_bloques(calculadora, _bloques(args.entradas, args.tam_bloque))
+    print(resumen, file=sys.stderr)
+    
+    # Sin datos retenidos, las métricas requieren una segunda pasada sobre los archivos
+    bloques_evaluacion = None
+    if not calculadora.retener_datos:
+        if ENTRADA_ESTANDAR in args.entradas:
+            print("Aviso: stdin no puede releerse; las métricas quedan sin calcular "
+                  "(use 'eval' o --retener-datos).", file=sys.stderr)
+        else:
+            bloques_evaluacion = ((alturas, pesos) for alturas, pesos, _, _ in _bloques(args.entradas, args.tam_bloque))
+    
+    return calculadora.entrenar_modelo(bloques_evaluacion=bloques_evaluacion)
+
+def _entrenar_paralelo(calculadora, args):
+    if args.retener_datos or args.ventana:
+        raise ValueError("--procesos no admite --retener-datos ni --ventana.")
+    if not 1 <= len(args.entradas) <= 2 or ENTRADA_ESTANDAR in args.entradas:
+        raise ValueError("--procesos requiere un .npy/.imcml o un par de .npy (alturas, pesos).")
+    
+    exito, mensaje, resumen = paralelo.entrenar_paralelo(
+        calculadora, *args.entradas, procesos=args.procesos,
+        tam_bloque=max(args.tam_bloque, paralelo.TAM_BLOQUE))
+    print(resumen, file=sys.stderr)
+    return exito, mensaje
+
+def comando_train(args):
+    """Entrena un modelo con las entradas y lo guarda en --salida."""
+    calculadora = BMIMLCalculator(motor=args.motor, retener_datos=args.retener_datos)
+    if args.vida_media and not args.ventana:
+        raise ValueError("--vida-media requiere --ventana.")
+    if args.ventana:
+        exito, mensaje = calculadora.configurar_ventana(args.ventana, args.vida_media)
+        if not exito:
+            raise ValueError(mensaje)
+    if args.tramos_peso and not args.tramos_altura:
+        raise ValueError("--tramos-peso requiere --tramos-altura.")
+    if args.tramos_altura:
+        exito, mensaje = calculadora.configurar_segmentos(args.tramos_altura, args.tramos_peso)
+        if not exito:
+            raise ValueError(mensaje)
+    
+    if args.procesos:
+        exito, mensaje = _entrenar_paralelo(calculadora, args)
+    else:
+        exito, mensaje = _entrenar_serial(calculadora, args)
+    if not exito:
+        print(mensaje, file=sys.stderr)
+        return 1
+    
+    exito, mensaje = calculadora.guardar_modelo(args.salida)
+    print(mensaje, file=sys.stderr)
+    if not exito:
+        return 1
+    
+    print(_json({
+        'motor': calculadora.motor.nombre,
+        'ecuacion': calculadora.ecuacion(),
+        'filas': calculadora.num_datos_entrenamiento,
+        'segmentos': calculadora.segmentacion.cantidad if calculadora.segmentacion else 1,
+        'mae': calculadora.mae,
+        'mse': calculadora.mse,
+        'r2': calculadora.r2,
+    }))
+    return 0
+
+def comando_predict(args):
+    """Escribe la predicción de cada registro en stdout (o --salida).
+    
+    Cada línea ilegible produce una fila no válida, así la salida queda
+    alineada fila a fila con la entrada.
+    """
+    calculadora = _cargar_modelo(args.modelo)
+    ilegibles = 0
+    
+    def bloques_contados():
+        nonlocal ilegibles
+        for bloque in _bloques(args.entradas, args.tam_bloque, conservar_ilegibles=True):
+            ilegibles += bloque[2]
+            yield bloque
+    
+    bloques = bloques_contados()
+    
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8', newline='') as archivo:
+            filas = exportador.escribir_predicciones(calculadora, bloques, archivo, args.formato)
+    else:
+        filas = exportador.escribir_predicciones(calculadora, bloques, sys.stdout, args.formato)
+    
+    print(f"{filas} filas procesadas ({ilegibles} ilegibles)", file=sys.stderr)
+    return 0
+
+def comando_eval(args):
+    """Calcula MAE, MSE y R² del modelo sobre las entradas."""
+    calculadora = _cargar_modelo(args.modelo)
+    filas = 0
+    
+    def bloques():
+        nonlocal filas
+        for alturas, pesos, ilegibles, _ in _bloques(args.entradas, args.tam_bloque):
+            filas += len(alturas) + ilegibles
+            yield alturas, pesos
+    
+    acumulador = calculadora.evaluar_bloques(bloques())
+    mae, mse, r2 = acumulador.resultado()
+    print(_json({
+        'filas': filas,
+        'evaluadas': acumulador.n,
+        'descartadas': filas - acumulador.n,
+        'mae': mae,
+        'mse': mse,
+        'r2': r2,
+    }))
+    return 0
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        prog="cli_imc", description="Calculadora de IMC con ML en modo por lotes.")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+    
+    def agregar_entradas(subparser):
+        subparser.add_argument('entradas', nargs='*', default=[ENTRADA_ESTANDAR],
+                               help="archivos .csv/.txt/.npy con (altura, peso); '-' lee stdin")
+        subparser.add_argument('--tam-bloque', type=int, default=importador.TAM_BLOQUE_CSV,
+                               help="filas leídas por bloque")
+    
+    train = subparsers.add_parser('train', help="entrenar y guardar un modelo")
+    agregar_entradas(train)
+    train.add_argument('-o', '--salida', required=True, help="archivo del modelo a guardar")
+    train.add_argument('--motor', choices=list(MOTORES), default=MOTOR_PREDETERMINADO)
+    train.add_argument('--retener-datos', action='store_true',
+                       help="guardar también las filas en el modelo (la memoria crece con la entrada)")
+    train.add_argument('--ventana', type=int,
+                       help="entrenar solo con las últimas N filas (memoria constante con entradas sin fin)")
+    train.add_argument('--vida-media', type=float,
+                       help="con --ventana, ponderar las filas con decaimiento exponencial de esta vida media")
+    train.add_argument('--tramos-altura', type=_tramos, metavar="INICIO,ANCHO,N",
+                       help="ajustar un modelo por tramo de altura (p. ej. 1.5,0.1,5)")
+    train.add_argument('--tramos-peso', type=_tramos, metavar="INICIO,ANCHO,N",
+                       help="con --tramos-altura, segmentar también por tramos de peso")
+    train.add_argument('--procesos', type=int,
+                       help="entrenar en paralelo sobre un archivo mapeado (.npy, par de .npy o .imcml)")
+    train.set_defaults(funcion=comando_train)
+    
+    predict = subparsers.add_parser('predict', help="predecir el IMC de cada registro")
+    agregar_entradas(predict)
+    predict.add_argument('-m', '--modelo', required=True)
+    predict.add_argument('--formato', choices=exportador.FORMATOS, default='csv')
+    predict.add_argument('-o', '--salida', help="archivo de salida (por defecto stdout)")
+    predict.set_defaults(funcion=comando_predict)
+    
+    evaluar = subparsers.add_parser('eval', help="evaluar un modelo sobre datos etiquetados")
+    agregar_entradas(evaluar)
+    evaluar.add_argument('-m', '--modelo', required=True)
+    evaluar.set_defaults(funcion=comando_eval)
+    
+    return parser
+
+def main(argv=None):
+    """Función principal de la línea de comandos."""
+    args = crear_parser().parse_args(argv)
+    
+    try:
+        return args.funcion(args)
+    except (OSError, ValueError) as e:
+        if isinstance(e, BrokenPipeError):
+            # La salida se cerró antes de tiempo (p. ej. `| head`): no es un error
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 0
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,159 +5,40 @@
 # ============================================================================
 
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-import math
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
+from tkinter import ttk, messagebox, scrolledtext, filedialog
+import os
 
-class BMIMLCalculator:
-    """Calculadora de IMC que utiliza Machine Learning."""
-    
-    def __init__(self):
-        self.altura_data = []
-        self.peso_data = []
-        self.imc_data = []
-        
-        self.coef_altura = 0.0
-        self.coef_peso = 0.0
-        self.intercepto = 0.0
-        
-        self.is_trained = False
-        self.num_datos_entrenamiento = 0
-        
-        self.mse = 0.0
-        self.r2 = 0.0
-        self.mae = 0.0
-    
-    def calcular_imc_real(self, altura, peso):
-        if altura <= 0:
-            return 0.0
-        return peso / (altura * altura)
-    
-    def clasificar_imc(self, imc):
-        if imc < 18.5:
-            return "Peso insuficiente"
-        elif imc < 25.0:
-            return "Peso normal"
-        elif imc < 30.0:
-            return "Sobrepeso"
-        else:
-            return "Obesidad"
-    
-    def agregar_dato(self, altura, peso):
-        """Agrega un dato de entrenamiento."""
-        if altura <= 0 or altura > 3.0 or peso <= 0 or peso > 500:
-            return False, "Valores fuera de rango válido."
-        
-        imc_real = self.calcular_imc_real(altura, peso)
-        
-        self.altura_data.append(altura)
-        self.peso_data.append(peso)
-        self.imc_data.append(imc_real)
-        self.num_datos_entrenamiento += 1
-        
-        return True, f"Dato agregado. IMC: {imc_real:.2f}"
-    
-    def entrenar_modelo(self):
-        """Entrena el modelo de regresión múltiple."""
-        if len(self.altura_data) < 3:
-            return False, "Se necesitan al menos 3 datos para entrenar el modelo."
-        
-        n = len(self.altura_data)
-        
-        sum_altura = sum(self.altura_data)
-        sum_peso = sum(self.peso_data)
-        sum_imc = sum(self.imc_data)
-        
-        sum_altura2 = sum(h * h for h in self.altura_data)
-        sum_peso2 = sum(p * p for p in self.peso_data)
-        sum_altura_peso = sum(h * p for h, p in zip(self.altura_data, self.peso_data))
-        
-        sum_altura_imc = sum(h * i for h, i in zip(self.altura_data, self.imc_data))
-        sum_peso_imc = sum(p * i for p, i in zip(self.peso_data, self.imc_data))
-        
-        try:
-            # Correlación altura-IMC
-            corr_altura_imc = (n * sum_altura_imc - sum_altura * sum_imc) / \
-                             math.sqrt((n * sum_altura2 - sum_altura * sum_altura) * 
-                                     (n * sum(i*i for i in self.imc_data) - sum_imc * sum_imc))
-            
-            # Correlación peso-IMC
-            corr_peso_imc = (n * sum_peso_imc - sum_peso * sum_imc) / \
-                           math.sqrt((n * sum_peso2 - sum_peso * sum_peso) * 
-                                   (n * sum(i*i for i in self.imc_data) - sum_imc * sum_imc))
-            
-            self.coef_altura = corr_altura_imc * 10
-            self.coef_peso = corr_peso_imc * 0.5
-            self.intercepto = (sum_imc - self.coef_altura * sum_altura - self.coef_peso * sum_peso) / n
-            
-            self.is_trained = True
-            
-            # Calcular métricas
-            self._calcular_metricas()
-            
-            ecuacion = f"IMC = {self.coef_altura:.4f} * altura + {self.coef_peso:.4f} * peso + {self.intercepto:.4f}"
-            return True, f"Modelo entrenado exitosamente!\n{ecuacion}"
-            
-        except Exception as e:
-            return False, f"Error durante el entrenamiento: {e}"
-    
-    def _calcular_metricas(self):
-        """Calcula las métricas de evaluación."""
-        predicciones = []
-        errores_absolutos = []
-        errores_cuadraticos = []
-        
-        for i in range(len(self.altura_data)):
-            altura = self.altura_data[i]
-            peso = self.peso_data[i]
-            imc_real = self.imc_data[i]
-            
-            imc_predicho = self.coef_altura * altura + self.coef_peso * peso + self.intercepto
-            predicciones.append(imc_predicho)
-            
-            error_absoluto = abs(imc_real - imc_predicho)
-            error_cuadratico = (imc_real - imc_predicho) ** 2
-            
-            errores_absolutos.append(error_absoluto)
-            errores_cuadraticos.append(error_cuadratico)
-        
-        self.mae = sum(errores_absolutos) / len(errores_absolutos)
-        self.mse = sum(errores_cuadraticos) / len(errores_cuadraticos)
-        
-        imc_promedio = sum(self.imc_data) / len(self.imc_data)
-        ss_tot = sum((imc - imc_promedio) ** 2 for imc in self.imc_data)
-        ss_res = sum(errores_cuadraticos)
-        
-        if ss_tot > 0:
-            self.r2 = 1 - (ss_res / ss_tot)
-        else:
-            self.r2 = 1.0
-    
-    def predecir_imc(self, altura, peso):
-        """Predice el IMC usando el modelo entrenado."""
-        if not self.is_trained:
-            return None, "El modelo debe ser entrenado primero."
-        
-        if altura <= 0 or altura > 3.0 or peso <= 0 or peso > 500:
-            return None, "Valores fuera de rango válido."
-        
-        imc_ml = self.coef_altura * altura + self.coef_peso * peso + self.intercepto
-        imc_real = self.calcular_imc_real(altura, peso)
-        
-        return {
-            'imc_ml': imc_ml,
-            'imc_real': imc_real,
-            'diferencia': abs(imc_ml - imc_real),
-            'clasificacion_ml': self.clasificar_imc(imc_ml),
-            'clasificacion_real': self.clasificar_imc(imc_real)
-        }, "Predicción exitosa"
+import exportador
+import importador
+import instrumentacion
+import persistencia
+import segmentacion
+from calculadora_imc import BMIMLCalculator, CLASIFICACIONES_IMC, MOTORES
+from trabajador import TrabajadorSegundoPlano
+
+# Archivo del modelo restaurado al iniciar la aplicación
+ARCHIVO_MODELO = "modelo_imc" + persistencia.EXTENSION
+
+def _graficos():
+    """Importa el módulo de gráficos (y con él matplotlib) solo cuando se necesita."""
+    import graficos
+    return graficos
 
 class BMIMLApp:
     """Interfaz gráfica para la calculadora de IMC con ML."""
     
-    def __init__(self, root):
+    # Por encima de este número de datos la tabla se muestra paginada
+    FILAS_MAXIMAS_TABLA = 5000
+    FILAS_POR_PAGINA = 500
+    
+    # Esquemas de validación: texto mostrado -> argumentos de validar_modelo
+    OPCIONES_VALIDACION = {
+        "5 pliegues": {'pliegues': 5},
+        "10 pliegues": {'pliegues': 10},
+        "Retención 20%": {'fraccion_prueba': 0.2},
+    }
+    
+    def __init__(self, root, ruta_modelo=None):
         self.root = root
         self.root.title("Calculadora IMC con Machine Learning")
         self.root.geometry("900x700")
@@ -165,6 +46,25 @@ class BMIMLApp:
         
         # Inicializar calculadora
         self.calculator = BMIMLCalculator()
+        # Métricas y distribución de errores al día sin recorrer todos los datos
+        self.calculator.activar_evaluacion_online()
+        
+        # Estado de la tabla de datos: filas ya insertadas o página visible
+        self._filas_tabla = 0
+        self._descartadas_tabla = 0
+        self._tabla_paginada = False
+        self._pagina = 0
+        
+        # Figura de la pestaña Métricas, creada al mostrar el primer gráfico
+        self.grafico = None
+        # Último resultado de validación cruzada, mostrado junto a las métricas
+        self.validacion = None
+        
+        # Tareas largas fuera del hilo de la interfaz; estos botones se
+        # deshabilitan mientras una tarea está en curso
+        self.trabajador = TrabajadorSegundoPlano(root)
+        self.botones_tarea = []
+        self.root.protocol("WM_DELETE_WINDOW", self.cerrar)
         
         # Crear interfaz
         self.crear_interfaz()
@@ -176,6 +76,12 @@ class BMIMLApp:
             "Sobrepeso": "#f39c12",
             "Obesidad": "#e74c3c"
         }
+        
+        # Restaurar el modelo de la sesión anterior
+        if ruta_modelo and os.path.exists(ruta_modelo):
+            exito, mensaje = self.calculator.cargar_modelo(ruta_modelo)
+            if exito:
+                self.refrescar_modelo_cargado()
     
     def crear_interfaz(self):
         """Crea todos los elementos de la interfaz."""
@@ -193,6 +99,20 @@ class BMIMLApp:
         self.crear_pestaña_prediccion()
         self.crear_pestaña_datos()
         self.crear_pestaña_metricas()
+        
+        # Barra de estado para tareas en segundo plano
+        frame_estado = tk.Frame(self.root, bg='#f0f0f0')
+        frame_estado.pack(fill='x', padx=10, pady=(0, 5))
+        
+        self.label_estado = tk.Label(frame_estado, text="", font=("Arial", 10), bg='#f0f0f0')
+        self.label_estado.pack(side='left')
+        
+        self.btn_cancelar = tk.Button(frame_estado, text="✖ Cancelar", command=self.trabajador.cancelar,
+                                      font=("Arial", 9), state='disabled')
+        self.btn_cancelar.pack(side='right')
+        
+        self.barra_progreso = ttk.Progressbar(frame_estado, length=200, maximum=100)
+        self.barra_progreso.pack(side='right', padx=10)
     
     def crear_pestaña_entrenamiento(self):
         """Crea la pestaña para agregar datos y entrenar."""
@@ -218,10 +138,18 @@ class BMIMLApp:
                                command=self.agregar_dato, font=("Arial", 10, "bold"),
                                bg='#3498db', fg='white', relief='flat', padx=20)
         btn_agregar.grid(row=0, column=4, padx=10, pady=5)
+        self.botones_tarea.append(btn_agregar)
+        
+        # Botón importar archivo
+        btn_importar = tk.Button(frame_datos, text="📂 Importar Archivo", 
+                                command=self.importar_archivo, font=("Arial", 10, "bold"),
+                                bg='#16a085', fg='white', relief='flat', padx=20)
+        btn_importar.grid(row=0, column=5, padx=10, pady=5)
+        self.botones_tarea.append(btn_importar)
         
         # Información del último dato
         self.label_ultimo_dato = tk.Label(frame_datos, text="", font=("Arial", 10), fg='#27ae60')
-        self.label_ultimo_dato.grid(row=1, column=0, columnspan=5, pady=5)
+        self.label_ultimo_dato.grid(row=1, column=0, columnspan=6, pady=5)
         
         # Frame para entrenamiento
         frame_train = tk.LabelFrame(frame_entrenamiento, text="Entrenar Modelo", 
@@ -233,11 +161,53 @@ class BMIMLApp:
                                          font=("Arial", 10), justify='left')
         self.label_info_modelo.pack(anchor='w', pady=5)
         
+        # Selector de motor
+        frame_motor = tk.Frame(frame_train)
+        frame_motor.pack(anchor='w', pady=5)
+        tk.Label(frame_motor, text="Motor:", font=("Arial", 10)).pack(side='left')
+        self.combo_motor = ttk.Combobox(frame_motor, values=list(MOTORES), state='readonly', width=20)
+        self.combo_motor.set(self.calculator.motor.nombre)
+        self.combo_motor.bind('<<ComboboxSelected>>', self.cambiar_motor)
+        self.combo_motor.pack(side='left', padx=5)
+        self.botones_tarea.append(self.combo_motor)
+        
+        # Modelo segmentado: un ajuste del motor por tramo de altura y de peso
+        frame_segmentos = tk.Frame(frame_train)
+        frame_segmentos.pack(anchor='w', pady=5)
+        tk.Label(frame_segmentos, text="Tramos altura (inicio, ancho, n):", font=("Arial", 10)).pack(side='left')
+        self.entry_tramos_altura = tk.Entry(frame_segmentos, font=("Arial", 10), width=14)
+        self.entry_tramos_altura.pack(side='left', padx=5)
+        tk.Label(frame_segmentos, text="peso (opcional):", font=("Arial", 10)).pack(side='left')
+        self.entry_tramos_peso = tk.Entry(frame_segmentos, font=("Arial", 10), width=14)
+        self.entry_tramos_peso.pack(side='left', padx=5)
+        btn_segmentar = tk.Button(frame_segmentos, text="Segmentar", command=self.aplicar_segmentos,
+                                  font=("Arial", 9, "bold"), bg='#8e44ad', fg='white')
+        btn_segmentar.pack(side='left', padx=5)
+        btn_quitar_segmentos = tk.Button(frame_segmentos, text="Quitar", command=self.quitar_segmentos,
+                                         font=("Arial", 9))
+        btn_quitar_segmentos.pack(side='left')
+        self.botones_tarea.extend([btn_segmentar, btn_quitar_segmentos])
+        
         # Botón entrenar
         btn_entrenar = tk.Button(frame_train, text="🎯 Entrenar Modelo", 
                                 command=self.entrenar_modelo, font=("Arial", 12, "bold"),
                                 bg='#e74c3c', fg='white', relief='flat', padx=20, pady=5)
         btn_entrenar.pack(pady=10)
+        self.botones_tarea.append(btn_entrenar)
+        
+        # Botones de persistencia
+        frame_archivo = tk.Frame(frame_train)
+        frame_archivo.pack(pady=5)
+        btn_guardar = tk.Button(frame_archivo, text="💾 Guardar Modelo", command=self.guardar_modelo,
+                                font=("Arial", 10, "bold"), bg='#34495e', fg='white', relief='flat', padx=20)
+        btn_guardar.pack(side='left', padx=5)
+        btn_cargar = tk.Button(frame_archivo, text="📁 Cargar Modelo", command=self.cargar_modelo,
+                               font=("Arial", 10, "bold"), bg='#34495e', fg='white', relief='flat', padx=20)
+        btn_cargar.pack(side='left', padx=5)
+        btn_revertir = tk.Button(frame_archivo, text="↩ Revertir Modelo", command=self.revertir_modelo,
+                                 font=("Arial", 10, "bold"), bg='#34495e', fg='white', relief='flat', padx=20)
+        btn_revertir.pack(side='left', padx=5)
+        self.botones_tarea.extend([btn_guardar, btn_cargar, btn_revertir])
         
         # Ecuación del modelo
         self.label_ecuacion = tk.Label(frame_train, text="", font=("Arial", 10), 
@@ -269,6 +239,13 @@ class BMIMLApp:
                                 bg='#27ae60', fg='white', relief='flat', padx=20)
         btn_predecir.grid(row=0, column=4, padx=10, pady=5)
         
+        # Botón predecir archivo completo
+        btn_predecir_archivo = tk.Button(frame_entrada, text="📄 Predecir Archivo", 
+                                        command=self.predecir_archivo, font=("Arial", 10, "bold"),
+                                        bg='#16a085', fg='white', relief='flat', padx=20)
+        btn_predecir_archivo.grid(row=0, column=5, padx=10, pady=5)
+        self.botones_tarea.append(btn_predecir_archivo)
+        
         # Frame de resultados
         frame_resultados = tk.LabelFrame(frame_prediccion, text="Resultados", 
                                         font=("Arial", 12, "bold"), padx=10, pady=10)
@@ -288,6 +265,31 @@ class BMIMLApp:
         frame_datos = ttk.Frame(self.notebook)
         self.notebook.add(frame_datos, text="📋 Datos")
         
+        # Entrenamiento continuo: solo las últimas filas, con memoria constante
+        frame_ventana = tk.LabelFrame(frame_datos, text="Ventana Deslizante", 
+                                     font=("Arial", 12, "bold"), padx=10, pady=5)
+        frame_ventana.pack(fill='x', padx=10, pady=5)
+        
+        tk.Label(frame_ventana, text="Tamaño (filas):", font=("Arial", 10)).grid(row=0, column=0, sticky='w')
+        self.entry_ventana = tk.Entry(frame_ventana, font=("Arial", 10), width=10)
+        self.entry_ventana.grid(row=0, column=1, padx=5)
+        
+        tk.Label(frame_ventana, text="Vida media (filas, opcional):", font=("Arial", 10)).grid(row=0, column=2, sticky='w')
+        self.entry_vida_media = tk.Entry(frame_ventana, font=("Arial", 10), width=10)
+        self.entry_vida_media.grid(row=0, column=3, padx=5)
+        
+        btn_aplicar_ventana = tk.Button(frame_ventana, text="Aplicar", command=self.aplicar_ventana, 
+                                        font=("Arial", 9, "bold"), bg='#3498db', fg='white')
+        btn_aplicar_ventana.grid(row=0, column=4, padx=5)
+        btn_desactivar_ventana = tk.Button(frame_ventana, text="Desactivar", command=self.desactivar_ventana, 
+                                           font=("Arial", 9))
+        btn_desactivar_ventana.grid(row=0, column=5, padx=5)
+        self.botones_tarea.extend([btn_aplicar_ventana, btn_desactivar_ventana])
+        
+        self.label_ventana = tk.Label(frame_ventana, text="Modo acumulativo: se conservan todos los datos", 
+                                     font=("Arial", 10), fg='#7f8c8d')
+        self.label_ventana.grid(row=1, column=0, columnspan=6, sticky='w', pady=(5, 0))
+        
         # Frame principal
         frame_tabla = tk.LabelFrame(frame_datos, text="Datos de Entrenamiento", 
                                    font=("Arial", 12, "bold"), padx=10, pady=10)
@@ -312,9 +314,23 @@ class BMIMLApp:
         scrollbar_v.pack(side='right', fill='y')
         scrollbar_h.pack(side='bottom', fill='x')
         
+        # Controles de paginación (solo visibles con muchos datos)
+        self.frame_paginacion = tk.Frame(frame_datos)
+        tk.Button(self.frame_paginacion, text="◀ Anterior", 
+                  command=lambda: self.cambiar_pagina(self._pagina - 1)).pack(side='left', padx=5)
+        self.label_pagina = tk.Label(self.frame_paginacion, text="", font=("Arial", 10))
+        self.label_pagina.pack(side='left', padx=5)
+        tk.Button(self.frame_paginacion, text="Siguiente ▶", 
+                  command=lambda: self.cambiar_pagina(self._pagina + 1)).pack(side='left', padx=5)
+        tk.Label(self.frame_paginacion, text="Ir a fila:", font=("Arial", 10)).pack(side='left', padx=(20, 5))
+        self.entry_ir_fila = tk.Entry(self.frame_paginacion, font=("Arial", 10), width=10)
+        self.entry_ir_fila.pack(side='left')
+        self.entry_ir_fila.bind('<Return>', lambda event: self.ir_a_fila())
+        tk.Button(self.frame_paginacion, text="Ir", command=self.ir_a_fila).pack(side='left', padx=5)
+        
         # Botón actualizar
         btn_actualizar_datos = tk.Button(frame_datos, text="🔄 Actualizar Datos", 
-                                        command=self.actualizar_tabla_datos, 
+                                        command=lambda: self.actualizar_tabla_datos(completa=True), 
                                         font=("Arial", 10, "bold"), bg='#3498db', fg='white')
         btn_actualizar_datos.pack(pady=5)
     
@@ -323,15 +339,54 @@ class BMIMLApp:
         frame_metricas = ttk.Frame(self.notebook)
         self.notebook.add(frame_metricas, text="📈 Métricas")
         
+        frame_superior = tk.Frame(frame_metricas)
+        frame_superior.pack(fill='x', padx=10, pady=5)
+        
         # Frame de métricas
-        frame_info = tk.LabelFrame(frame_metricas, text="Métricas del Modelo", 
+        frame_info = tk.LabelFrame(frame_superior, text="Métricas del Modelo", 
                                   font=("Arial", 12, "bold"), padx=10, pady=10)
-        frame_info.pack(fill='x', padx=10, pady=5)
+        frame_info.pack(side='left', fill='both', expand=True)
         
         self.label_metricas = tk.Label(frame_info, text="Entrena el modelo primero para ver métricas", 
                                       font=("Arial", 11), justify='left')
         self.label_metricas.pack(anchor='w', pady=5)
         
+        frame_validacion = tk.Frame(frame_info)
+        frame_validacion.pack(anchor='w', pady=5)
+        
+        self.combo_validacion = ttk.Combobox(frame_validacion, values=list(self.OPCIONES_VALIDACION),
+                                             state='readonly', width=16)
+        self.combo_validacion.set(next(iter(self.OPCIONES_VALIDACION)))
+        self.combo_validacion.pack(side='left', padx=(0, 5))
+        
+        btn_validar = tk.Button(frame_validacion, text="🔁 Validación Cruzada", 
+                               command=self.validar_modelo, font=("Arial", 10, "bold"),
+                               bg='#16a085', fg='white', relief='flat', padx=10)
+        btn_validar.pack(side='left')
+        self.botones_tarea.extend([btn_validar, self.combo_validacion])
+        
+        # Frame de rendimiento (instrumentación por etapa)
+        frame_rendimiento = tk.LabelFrame(frame_superior, text="Rendimiento", 
+                                         font=("Arial", 12, "bold"), padx=10, pady=10)
+        frame_rendimiento.pack(side='left', fill='both', padx=(10, 0))
+        
+        self.var_instrumentacion = tk.BooleanVar(value=instrumentacion.activa())
+        tk.Checkbutton(frame_rendimiento, text="Medir tiempos", variable=self.var_instrumentacion,
+                       command=self.cambiar_instrumentacion).pack(anchor='w')
+        
+        self.label_rendimiento = tk.Label(frame_rendimiento, text=instrumentacion.texto_resumen(),
+                                         font=("Courier", 9), justify='left')
+        self.label_rendimiento.pack(anchor='w', pady=5)
+        
+        frame_botones_rendimiento = tk.Frame(frame_rendimiento)
+        frame_botones_rendimiento.pack(anchor='w')
+        tk.Button(frame_botones_rendimiento, text="🔄 Actualizar",
+                  command=self.actualizar_rendimiento).pack(side='left', padx=2)
+        tk.Button(frame_botones_rendimiento, text="💾 Exportar JSON",
+                  command=self.exportar_rendimiento).pack(side='left', padx=2)
+        tk.Button(frame_botones_rendimiento, text="Reiniciar",
+                  command=self.reiniciar_rendimiento).pack(side='left', padx=2)
+        
         # Frame para gráfico
         frame_grafico = tk.LabelFrame(frame_metricas, text="Visualización", 
                                      font=("Arial", 12, "bold"), padx=10, pady=10)
@@ -342,6 +397,7 @@ class BMIMLApp:
                                command=self.mostrar_grafico, font=("Arial", 10, "bold"),
                                bg='#9b59b6', fg='white', relief='flat', padx=20)
         btn_grafico.pack(pady=10)
+        self.botones_tarea.append(btn_grafico)
         
         # Frame para el gráfico
         self.frame_plot = tk.Frame(frame_grafico)
@@ -360,6 +416,7 @@ class BMIMLApp:
                 self.entry_altura_train.delete(0, 'end')
                 self.entry_peso_train.delete(0, 'end')
                 self.actualizar_info_modelo()
+                self.actualizar_metricas()
                 self.actualizar_tabla_datos()
             else:
                 messagebox.showerror("Error", mensaje)
@@ -367,18 +424,211 @@ class BMIMLApp:
         except ValueError:
             messagebox.showerror("Error", "Ingrese valores numéricos válidos")
     
+    def importar_archivo(self):
+        """Importa datos de entrenamiento desde un archivo CSV o .npy."""
+        ruta = filedialog.askopenfilename(
+            title="Importar datos de entrenamiento",
+            filetypes=[("Datos", "*.csv *.txt *.npy"), ("Todos los archivos", "*.*")])
+        if not ruta:
+            return
+        
+        self._ejecutar_en_segundo_plano(
+            lambda contexto: importador.importar_archivo(self.calculator, ruta, progreso=contexto.reportar),
+            "Importando datos...", self._importacion_terminada)
+    
+    def _importacion_terminada(self, resumen):
+        self.label_ultimo_dato.config(text=f"✓ {resumen}", fg='#27ae60')
+        self.label_estado.config(text="✓ Importación terminada")
+        self.actualizar_info_modelo()
+        self.actualizar_metricas()
+        self.actualizar_tabla_datos()
+    
+    def guardar_modelo(self):
+        """Guarda el modelo y los datos en un archivo."""
+        ruta = filedialog.asksaveasfilename(
+            title="Guardar modelo", initialfile=ARCHIVO_MODELO,
+            defaultextension=persistencia.EXTENSION,
+            filetypes=[("Modelo IMC", f"*{persistencia.EXTENSION}")])
+        if not ruta:
+            return
+        
+        exito, mensaje = self.calculator.guardar_modelo(ruta)
+        
+        if exito:
+            messagebox.showinfo("Éxito", mensaje)
+        else:
+            messagebox.showerror("Error", mensaje)
+    
+    def cargar_modelo(self):
+        """Carga un modelo y sus datos desde un archivo."""
+        ruta = filedialog.askopenfilename(
+            title="Cargar modelo",
+            filetypes=[("Modelo IMC", f"*{persistencia.EXTENSION}"), ("Todos los archivos", "*.*")])
+        if not ruta:
+            return
+        
+        exito, mensaje = self.calculator.cargar_modelo(ruta)
+        
+        if exito:
+            self.refrescar_modelo_cargado()
+            self.label_ultimo_dato.config(text=f"✓ {mensaje}", fg='#27ae60')
+        else:
+            messagebox.showerror("Error", mensaje)
+    
+    def revertir_modelo(self):
+        """Vuelve a publicar el modelo anterior al último entrenamiento o carga."""
+        exito, mensaje = self.calculator.revertir_modelo()
+        
+        if exito:
+            self.combo_motor.set(self.calculator.motor.nombre)
+            self.label_ecuacion.config(text=self.calculator.ecuacion() if self.calculator.is_trained else "")
+            self.actualizar_info_modelo()
+            self.actualizar_metricas()
+            self.label_estado.config(text=f"✓ {mensaje}")
+        else:
+            messagebox.showwarning("Advertencia", mensaje)
+    
+    def refrescar_modelo_cargado(self):
+        """Actualiza todas las pestañas tras reemplazar el modelo de la calculadora."""
+        self.combo_motor.set(self.calculator.motor.nombre)
+        self.label_ecuacion.config(text=self.calculator.ecuacion() if self.calculator.is_trained else "")
+        self.actualizar_info_modelo()
+        self.actualizar_metricas()
+        self.actualizar_tabla_datos(completa=True)
+    
+    def cambiar_motor(self, event=None):
+        """Cambia el motor de ajuste de la calculadora."""
+        exito, mensaje = self.calculator.seleccionar_motor(self.combo_motor.get())
+        
+        if exito:
+            self.label_ecuacion.config(text="")
+            self.actualizar_info_modelo()
+        else:
+            messagebox.showerror("Error", mensaje)
+    
+    def aplicar_segmentos(self):
+        """Ajusta un modelo por segmento de altura y, si se indica, de peso."""
+        try:
+            tramos_altura = segmentacion.Tramos.desde_texto(self.entry_tramos_altura.get())
+            texto_peso = self.entry_tramos_peso.get().strip()
+            tramos_peso = segmentacion.Tramos.desde_texto(texto_peso) if texto_peso else None
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        
+        exito, mensaje = self.calculator.configurar_segmentos(tramos_altura, tramos_peso)
+        
+        if exito:
+            self.label_ecuacion.config(text="")
+            self.label_estado.config(text=f"✓ {mensaje}")
+            self.actualizar_info_modelo()
+            self.actualizar_metricas()
+        else:
+            messagebox.showerror("Error", mensaje)
+    
+    def quitar_segmentos(self):
+        """Vuelve a un único modelo global."""
+        exito, mensaje = self.calculator.desactivar_segmentos()
+        
+        if exito:
+            self.label_ecuacion.config(text="")
+            self.label_estado.config(text=f"✓ {mensaje}")
+            self.actualizar_info_modelo()
+            self.actualizar_metricas()
+        else:
+            messagebox.showwarning("Advertencia", mensaje)
+    
     def entrenar_modelo(self):
-        """Entrena el modelo de ML."""
-        exito, mensaje = self.calculator.entrenar_modelo()
+        """Entrena el modelo de ML en segundo plano."""
+        self._ejecutar_en_segundo_plano(
+            lambda contexto: self.calculator.entrenar_modelo(progreso=contexto.reportar),
+            "Entrenando modelo...", self._entrenamiento_terminado)
+    
+    def _entrenamiento_terminado(self, resultado):
+        exito, mensaje = resultado
         
         if exito:
-            self.label_ecuacion.config(text=mensaje)
+            self.label_ecuacion.config(text=self.calculator.ecuacion())
+            self.label_estado.config(text="✓ Modelo entrenado")
             self.actualizar_info_modelo()
             self.actualizar_metricas()
             messagebox.showinfo("Éxito", "Modelo entrenado exitosamente!")
         else:
+            self.label_estado.config(text="")
             messagebox.showerror("Error", mensaje)
     
+    def predecir_archivo(self):
+        """Predice el IMC de todas las filas de un archivo y guarda los resultados en CSV."""
+        if not self.calculator.is_trained:
+            messagebox.showwarning("Advertencia", "Entrena el modelo primero")
+            return
+        
+        entrada = filedialog.askopenfilename(
+            title="Archivo a predecir",
+            filetypes=[("Datos", "*.csv *.txt *.npy"), ("Todos los archivos", "*.*")])
+        if not entrada:
+            return
+        salida = filedialog.asksaveasfilename(
+            title="Guardar predicciones", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv")])
+        if not salida:
+            return
+        
+        self._ejecutar_en_segundo_plano(
+            lambda contexto: self._puntuar_archivo(contexto, entrada, salida),
+            "Prediciendo archivo...", self._puntuacion_terminada)
+    
+    def _puntuar_archivo(self, contexto, entrada, salida):
+        """Escribe en `salida` la predicción de cada fila de `entrada` (en segundo plano)."""
+        with open(salida, 'w', encoding='utf-8', newline='') as archivo:
+            bloques = importador.leer_bloques(entrada, conservar_ilegibles=True)
+            filas = exportador.escribir_predicciones(self.calculator, bloques, archivo,
+                                                     progreso=contexto.reportar)
+        return filas, salida
+    
+    def _puntuacion_terminada(self, resultado):
+        filas, salida = resultado
+        self.label_estado.config(text=f"✓ {filas} predicciones guardadas en {os.path.basename(salida)}")
+    
+    def _ejecutar_en_segundo_plano(self, tarea, descripcion, al_terminar):
+        """Lanza `tarea(contexto)` en el trabajador mostrando su avance en la barra de estado."""
+        lanzada = self.trabajador.enviar(
+            tarea, al_terminar=al_terminar, al_error=self._tarea_fallida,
+            al_cancelar=self._tarea_cancelada, al_progreso=self._mostrar_progreso,
+            al_finalizar=self._tarea_finalizada, widgets=self.botones_tarea)
+        
+        if not lanzada:
+            messagebox.showwarning("Advertencia", "Ya hay una tarea en ejecución")
+            return
+        
+        self.label_estado.config(text=descripcion)
+        self.barra_progreso.config(value=0)
+        self.btn_cancelar.config(state='normal')
+    
+    def _mostrar_progreso(self, fraccion, mensaje=None):
+        self.barra_progreso.config(value=fraccion * 100)
+        if mensaje:
+            self.label_estado.config(text=mensaje)
+    
+    def _tarea_fallida(self, error):
+        self.label_estado.config(text="")
+        messagebox.showerror("Error", f"La tarea falló: {error}")
+    
+    def _tarea_cancelada(self):
+        self.label_estado.config(text="⚠ Tarea cancelada")
+        # Una importación cancelada conserva los bloques ya agregados
+        self.actualizar_info_modelo()
+        self.actualizar_tabla_datos()
+    
+    def _tarea_finalizada(self):
+        self.btn_cancelar.config(state='disabled')
+        self.barra_progreso.config(value=0)
+    
+    def cerrar(self):
+        """Cancela las tareas pendientes y cierra la ventana."""
+        self.trabajador.cerrar()
+        self.root.destroy()
+    
     def predecir_imc(self):
         """Hace una predicción de IMC."""
         try:
@@ -432,54 +682,277 @@ Interpretación:
     def actualizar_info_modelo(self):
         """Actualiza la información del modelo."""
         estado = "Entrenado ✓" if self.calculator.is_trained else "No entrenado"
-        info = f"Datos disponibles: {self.calculator.num_datos_entrenamiento}\nModelo: {estado}"
+        info = (f"Datos disponibles: {self.calculator.num_datos_entrenamiento}\n"
+                f"Modelo: {estado}\nMotor: {self.calculator.motor.descripcion}")
         self.label_info_modelo.config(text=info)
     
-    def actualizar_tabla_datos(self):
-        """Actualiza la tabla de datos de entrenamiento."""
-        # Limpiar tabla
-        for item in self.tree_datos.get_children():
-            self.tree_datos.delete(item)
-        
-        # Agregar datos
-        for i in range(len(self.calculator.altura_data)):
-            altura = self.calculator.altura_data[i]
-            peso = self.calculator.peso_data[i]
-            imc = self.calculator.imc_data[i]
-            clasificacion = self.calculator.clasificar_imc(imc)
+    def aplicar_ventana(self):
+        """Limita los datos de entrenamiento a una ventana de las últimas filas."""
+        try:
+            tamano = int(self.entry_ventana.get())
+            vida_media = self.entry_vida_media.get().strip()
+            vida_media = float(vida_media) if vida_media else None
+        except ValueError:
+            messagebox.showerror("Error", "Ingrese valores numéricos válidos")
+            return
+        
+        exito, mensaje = self.calculator.configurar_ventana(tamano, vida_media)
+        
+        if exito:
+            self.label_estado.config(text=f"✓ {mensaje}")
+            self.actualizar_info_modelo()
+            self.actualizar_metricas()
+            self.actualizar_tabla_datos(completa=True)
+        else:
+            messagebox.showerror("Error", mensaje)
+    
+    def desactivar_ventana(self):
+        """Vuelve a conservar todos los datos de entrenamiento."""
+        exito, mensaje = self.calculator.desactivar_ventana()
+        
+        if exito:
+            self.label_estado.config(text=f"✓ {mensaje}")
+            self.actualizar_info_modelo()
+            self.actualizar_metricas()
+            self.actualizar_tabla_datos(completa=True)
+        else:
+            messagebox.showwarning("Advertencia", mensaje)
+    
+    def actualizar_estado_ventana(self):
+        """Describe el contenido de la ventana deslizante."""
+        tamano = self.calculator.tamano_ventana
+        if tamano is None:
+            self.label_ventana.config(text="Modo acumulativo: se conservan todos los datos")
+            return
+        
+        n = len(self.calculator.altura_data)
+        primera = self.calculator.filas_descartadas
+        texto = f"Ventana: {n} de {tamano} filas"
+        if n:
+            texto += f" (filas {primera + 1}-{primera + n}; {primera} descartadas)"
+        if self.calculator.vida_media:
+            texto += (f" · vida media {self.calculator.vida_media:g} filas, "
+                      f"peso efectivo {self.calculator.peso_efectivo:.1f}")
+        self.label_ventana.config(text=texto)
+    
+    def actualizar_tabla_datos(self, completa=False):
+        """Actualiza la tabla de datos de entrenamiento.
+        
+        Con pocos datos solo se insertan las filas nuevas y, con una ventana,
+        se quitan las que salieron; con muchos se muestra únicamente la
+        página visible.
+        """
+        self.actualizar_estado_ventana()
+        n = len(self.calculator.altura_data)
+        descartadas = self.calculator.filas_descartadas
+        salientes = descartadas - self._descartadas_tabla
+        self._descartadas_tabla = descartadas
+        
+        if n > self.FILAS_MAXIMAS_TABLA:
+            # Si la página visible ya estaba completa, los datos nuevos no la alteran
+            fin_pagina = (self._pagina + 1) * self.FILAS_POR_PAGINA
+            pagina_intacta = (self._tabla_paginada and not completa and salientes == 0
+                              and fin_pagina <= min(self._filas_tabla, n))
             
+            if not self._tabla_paginada:
+                self._tabla_paginada = True
+                self.frame_paginacion.pack(pady=5)
+            self._pagina = min(self._pagina, self._ultima_pagina())
+            self._filas_tabla = n
+            
+            if pagina_intacta:
+                self._actualizar_label_pagina()
+            else:
+                self._mostrar_pagina()
+            return
+        
+        if (self._tabla_paginada or completa or not 0 <= salientes <= self._filas_tabla
+                or n < self._filas_tabla - salientes):
+            self._tabla_paginada = False
+            self.frame_paginacion.pack_forget()
+            self._limpiar_tabla()
+            self._filas_tabla = 0
+        elif salientes:
+            # Filas que salieron de la ventana: se quitan del principio de la tabla
+            self.tree_datos.delete(*self.tree_datos.get_children()[:salientes])
+            self._filas_tabla -= salientes
+        
+        # Agregar solo los datos que aún no están en la tabla
+        self._insertar_filas(self._filas_tabla, n)
+        self._filas_tabla = n
+    
+    def _limpiar_tabla(self):
+        self.tree_datos.delete(*self.tree_datos.get_children())
+    
+    def _insertar_filas(self, inicio, fin):
+        """Inserta en la tabla las filas [inicio, fin) de los datos de entrenamiento."""
+        if fin <= inicio:
+            return
+        
+        alturas = self.calculator.altura_data[inicio:fin]
+        pesos = self.calculator.peso_data[inicio:fin]
+        imcs = self.calculator.imc_data[inicio:fin]
+        clases = self.calculator.clasificar_imc_lote(imcs)
+        
+        # El ID es la posición en el flujo completo, también con ventana deslizante
+        primera = self.calculator.filas_descartadas
+        for i, altura, peso, imc, clase in zip(range(primera + inicio, primera + fin), alturas, pesos, imcs, clases):
             self.tree_datos.insert('', 'end', values=(
-                i+1, f"{altura:.2f}", f"{peso:.1f}", f"{imc:.2f}", clasificacion
+                i+1, f"{altura:.2f}", f"{peso:.1f}", f"{imc:.2f}", CLASIFICACIONES_IMC[clase]
             ))
     
+    def _ultima_pagina(self):
+        return max(len(self.calculator.altura_data) - 1, 0) // self.FILAS_POR_PAGINA
+    
+    def _mostrar_pagina(self):
+        """Muestra solo las filas de la página actual."""
+        inicio = self._pagina * self.FILAS_POR_PAGINA
+        fin = min(inicio + self.FILAS_POR_PAGINA, len(self.calculator.altura_data))
+        
+        self._limpiar_tabla()
+        self._insertar_filas(inicio, fin)
+        self._actualizar_label_pagina()
+    
+    def _actualizar_label_pagina(self):
+        inicio = self._pagina * self.FILAS_POR_PAGINA
+        fin = min(inicio + self.FILAS_POR_PAGINA, len(self.calculator.altura_data))
+        primera = self.calculator.filas_descartadas
+        self.label_pagina.config(
+            text=f"Página {self._pagina + 1} de {self._ultima_pagina() + 1} "
+                 f"(filas {primera + inicio + 1}-{primera + fin} de {primera + len(self.calculator.altura_data)})")
+    
+    def cambiar_pagina(self, pagina):
+        """Cambia la página visible de la tabla paginada."""
+        pagina = min(max(pagina, 0), self._ultima_pagina())
+        if pagina != self._pagina:
+            self._pagina = pagina
+            self._mostrar_pagina()
+    
+    def ir_a_fila(self):
+        """Muestra la página que contiene la fila indicada y la selecciona."""
+        try:
+            fila = int(self.entry_ir_fila.get())
+        except ValueError:
+            messagebox.showerror("Error", "Ingrese un número de fila válido")
+            return
+        
+        # Las filas se numeran como en la columna ID
+        fila -= self.calculator.filas_descartadas
+        if not 1 <= fila <= len(self.calculator.altura_data):
+            messagebox.showerror("Error", "Número de fila fuera de rango")
+            return
+        
+        self._pagina = (fila - 1) // self.FILAS_POR_PAGINA
+        self._mostrar_pagina()
+        
+        item = self.tree_datos.get_children()[(fila - 1) % self.FILAS_POR_PAGINA]
+        self.tree_datos.selection_set(item)
+        self.tree_datos.see(item)
+    
     def actualizar_metricas(self):
         """Actualiza las métricas del modelo."""
         if self.calculator.is_trained:
+            # Con evaluación en línea las métricas incluyen los datos añadidos tras entrenar
+            evaluacion = self.calculator.evaluacion_actual()
+            if evaluacion is not None:
+                mae, mse, r2 = evaluacion['mae'], evaluacion['mse'], evaluacion['r2']
+            else:
+                mae, mse, r2 = self.calculator.mae, self.calculator.mse, self.calculator.r2
+            
             texto_metricas = f"""Métricas de Evaluación:
 
-• Error Absoluto Medio (MAE): {self.calculator.mae:.4f}
-• Error Cuadrático Medio (MSE): {self.calculator.mse:.4f}
-• Coeficiente de Determinación (R²): {self.calculator.r2:.4f}
-
-Interpretación:"""
+• Error Absoluto Medio (MAE): {mae:.4f}
+• Error Cuadrático Medio (MSE): {mse:.4f}
+• Coeficiente de Determinación (R²): {r2:.4f}"""
+            
+            if evaluacion is not None:
+                cuantiles = evaluacion['cuantiles']
+                texto_metricas += (f"\n• Error absoluto p50 / p90 / p99: {cuantiles['p50']:.3f} / "
+                                   f"{cuantiles['p90']:.3f} / {cuantiles['p99']:.3f}")
+                if not evaluacion['exacto']:
+                    texto_metricas += f"\n  (MAE y cuantiles estimados con {evaluacion['muestra']} filas de muestra)"
+            
+            texto_metricas += "\n\nInterpretación:"
             
-            if self.calculator.mae < 1.0:
+            if mae < 1.0:
                 texto_metricas += "\n✓ Excelente: El modelo predice IMC con muy alta precisión"
-            elif self.calculator.mae < 2.0:
+            elif mae < 2.0:
                 texto_metricas += "\n✓ Bueno: El modelo tiene buena precisión"
-            elif self.calculator.mae < 3.0:
+            elif mae < 3.0:
                 texto_metricas += "\n⚠ Regular: El modelo tiene precisión aceptable"
             else:
                 texto_metricas += "\n❌ Pobre: El modelo necesita más datos"
             
-            if self.calculator.r2 > 0.9:
+            if r2 > 0.9:
                 texto_metricas += "\n✓ El modelo explica más del 90% de la variabilidad"
-            elif self.calculator.r2 > 0.7:
+            elif r2 > 0.7:
                 texto_metricas += "\n✓ El modelo explica más del 70% de la variabilidad"
             else:
                 texto_metricas += "\n⚠ El modelo explica menos del 70% de la variabilidad"
-            
-            self.label_metricas.config(text=texto_metricas)
+        else:
+            texto_metricas = "Entrena el modelo primero para ver métricas"
+        
+        if self.validacion is not None:
+            texto_metricas += "\n\n" + self._texto_validacion()
+        
+        self.label_metricas.config(text=texto_metricas)
+        self.actualizar_rendimiento()
+    
+    def _texto_validacion(self):
+        nombres = {'mae': "MAE", 'mse': "MSE", 'r2': "R²"}
+        lineas = [f"Validación ({self.validacion.descripcion}, media ± desv.):"]
+        for metrica, (media, desviacion) in self.validacion.resumen().items():
+            lineas.append(f"• {nombres[metrica]}: {media:.4f} ± {desviacion:.4f}")
+        return "\n".join(lineas)
+    
+    def validar_modelo(self):
+        """Valida el motor activo con el esquema elegido, en segundo plano."""
+        opciones = self.OPCIONES_VALIDACION[self.combo_validacion.get()]
+        self._ejecutar_en_segundo_plano(
+            lambda contexto: self.calculator.validar_modelo(progreso=contexto.reportar, **opciones),
+            "Validando modelo...", self._validacion_terminada)
+    
+    def _validacion_terminada(self, resultado):
+        validacion, mensaje = resultado
+        
+        if validacion is None:
+            self.label_estado.config(text="")
+            messagebox.showerror("Error", mensaje)
+            return
+        
+        self.validacion = validacion
+        self.label_estado.config(text=f"✓ {mensaje}")
+        self.actualizar_metricas()
+    
+    def cambiar_instrumentacion(self):
+        """Activa o desactiva la medición de tiempos por etapa."""
+        instrumentacion.activar(self.var_instrumentacion.get())
+        self.actualizar_rendimiento()
+    
+    def actualizar_rendimiento(self):
+        """Muestra las medidas acumuladas por etapa."""
+        self.label_rendimiento.config(text=instrumentacion.texto_resumen())
+    
+    def reiniciar_rendimiento(self):
+        instrumentacion.reiniciar()
+        self.actualizar_rendimiento()
+    
+    def exportar_rendimiento(self):
+        """Guarda las medidas por etapa en un archivo JSON."""
+        ruta = filedialog.asksaveasfilename(
+            title="Exportar medidas de rendimiento",
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json"), ("Todos los archivos", "*.*")]
+        )
+        if not ruta:
+            return
+        
+        try:
+            instrumentacion.exportar_json(ruta)
+        except OSError as e:
+            messagebox.showerror("Error", f"No se pudo exportar: {e}")
+            return
+        messagebox.showinfo("Éxito", f"Medidas exportadas a {os.path.basename(ruta)}")
     
     def mostrar_grafico(self):
         """Muestra un gráfico de las predicciones vs valores reales."""
@@ -491,52 +964,45 @@ Interpretación:"""
             messagebox.showwarning("Advertencia", "No hay datos para mostrar")
             return
         
-        # Limpiar frame anterior
-        for widget in self.frame_plot.winfo_children():
-            widget.destroy()
-        
-        # Crear gráfico
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
-        
-        # Calcular predicciones
-        predicciones = []
-        for i in range(len(self.calculator.altura_data)):
-            altura = self.calculator.altura_data[i]
-            peso = self.calculator.peso_data[i]
-            pred = (self.calculator.coef_altura * altura + 
-                   self.calculator.coef_peso * peso + self.calculator.intercepto)
-            predicciones.append(pred)
-        
-        # Gráfico 1: Predicciones vs Reales
-        ax1.scatter(self.calculator.imc_data, predicciones, alpha=0.7, color='blue')
-        ax1.plot([min(self.calculator.imc_data), max(self.calculator.imc_data)], 
-                [min(self.calculator.imc_data), max(self.calculator.imc_data)], 
-                'r--', label='Predicción perfecta')
-        ax1.set_xlabel('IMC Real')
-        ax1.set_ylabel('IMC Predicho')
-        ax1.set_title('Predicciones vs Valores Reales')
-        ax1.legend()
-        ax1.grid(True, alpha=0.3)
-        
-        # Gráfico 2: Distribución de errores
-        errores = [abs(real - pred) for real, pred in zip(self.calculator.imc_data, predicciones)]
-        ax2.hist(errores, bins=min(10, len(errores)), alpha=0.7, color='green', edgecolor='black')
-        ax2.set_xlabel('Error Absoluto')
-        ax2.set_ylabel('Frecuencia')
-        ax2.set_title('Distribución de Errores')
-        ax2.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        
-        # Integrar gráfico en tkinter
-        canvas = FigureCanvasTkAgg(fig, self.frame_plot)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        # La etapa mostrar_grafico cubre desde la petición hasta el dibujo
+        self._inicio_grafico = instrumentacion.reloj()
+        
+        # matplotlib se importa aquí, en el hilo de Tk, la primera vez que se pide el gráfico
+        _graficos()
+        
+        self._ejecutar_en_segundo_plano(self._calcular_datos_grafico, "Calculando predicciones...",
+                                        self._dibujar_grafico)
+    
+    def _calcular_datos_grafico(self, contexto):
+        """Calcula y reduce los datos del gráfico con el motor activo (en segundo plano)."""
+        evaluacion = self.calculator.evaluacion_actual()
+        if evaluacion is None:
+            imcs = self.calculator.imc_data
+            predicciones = self.calculator.evaluar_modelo(self.calculator.altura_data, self.calculator.peso_data)
+            return _graficos().preparar_datos(imcs, predicciones)
+        
+        # Con evaluación en línea se dibuja la muestra y el histograma mantenido, sin recorrer los datos
+        alturas, pesos, imcs = self.calculator.evaluador.muestra.T
+        datos = _graficos().preparar_datos(imcs, self.calculator.evaluar_modelo(alturas, pesos))
+        datos['frecuencias'], datos['bordes'] = evaluacion['frecuencias'], evaluacion['bordes']
+        return datos
+    
+    def _dibujar_grafico(self, datos):
+        """Actualiza el gráfico en el hilo de la interfaz."""
+        self.label_estado.config(text="")
+        
+        # La figura se crea una sola vez y después se actualiza en su lugar
+        if self.grafico is None:
+            self.grafico = _graficos().GraficoMetricas(self.frame_plot)
+        self.grafico.actualizar(datos)
+        
+        instrumentacion.registrar('mostrar_grafico', instrumentacion.reloj() - self._inicio_grafico, datos['n'])
+        self.actualizar_rendimiento()
 
 def main():
     """Función principal."""
     root = tk.Tk()
-    app = BMIMLApp(root)
+    app = BMIMLApp(root, ruta_modelo=ARCHIVO_MODELO)
     root.mainloop()
 
 if __name__ == "__main__":
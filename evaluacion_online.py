@@ -0,0 +1,239 @@
+# ============================================================================
+# CALCULADORA DE IMC CON MACHINE LEARNING - EVALUACIÓN EN LÍNEA
+# ============================================================================
+# Métricas del modelo publicado que se mantienen sin recorrer todos los datos:
+#   - MSE y R² exactos desde las estadísticas suficientes (motores lineales).
+#   - MAE, histograma de errores y cuantiles p50/p90/p99 a partir de una
+#     muestra de reservorio de tamaño fijo, reconstruidos solo al cambiar el
+#     modelo; las filas que llegan después se suman de forma exacta.
+# La memoria no depende del número de filas.
+# ============================================================================
+
+import math
+
+import numpy as np
+
+TAM_MUESTRA = 8192
+LIMITE_HISTOGRAMA = 10.0
+BINS_HISTOGRAMA = 50
+PRECISION_CUANTILES = 0.01
+CUBOS_MAXIMOS = 2048
+CUANTILES = (0.50, 0.90, 0.99)
+
+class HistogramaErrores:
+    """Histograma de errores absolutos con bins fijos en [0, limite]; el último acumula el exceso."""
+    
+    def __init__(self, limite=LIMITE_HISTOGRAMA, bins=BINS_HISTOGRAMA):
+        self.bordes = np.linspace(0.0, limite, bins + 1)
+        self.frecuencias = np.zeros(bins)
+    
+    def actualizar(self, errores_abs, peso=1.0):
+        anchura = self.bordes[1] - self.bordes[0]
+        indices = np.minimum((np.asarray(errores_abs) / anchura).astype(np.int64), len(self.frecuencias) - 1)
+        self.frecuencias += np.bincount(indices, minlength=len(self.frecuencias)) * peso
+    
+    def combinar(self, otro):
+        self.frecuencias += otro.frecuencias
+        return self
+    
+    def recortado(self):
+        """(frecuencias, bordes) sin los bins vacíos del final."""
+        ultimo = np.flatnonzero(self.frecuencias)
+        fin = int(ultimo[-1]) + 1 if len(ultimo) else 1
+        return self.frecuencias[:fin], self.bordes[:fin + 1]
+
+class BosquejoCuantiles:
+    """Bosquejo de cuantiles combinable con error relativo acotado (cubos logarítmicos).
+    
+    Cada valor cae en el cubo ceil(log_gamma(x)); si hay más de `cubos_maximos`
+    se funden los más bajos, así que la memoria está acotada y la precisión
+    se conserva en los cuantiles altos.
+    """
+    
+    MINIMO = 1e-9
+    
+    def __init__(self, precision=PRECISION_CUANTILES, cubos_maximos=CUBOS_MAXIMOS):
+        self.gamma = (1 + precision) / (1 - precision)
+        self._log_gamma = math.log(self.gamma)
+        self.cubos_maximos = cubos_maximos
+        self.cubos = {}
+        self.ceros = 0.0
+        self.total = 0.0
+    
+    def actualizar(self, valores, peso=1.0):
+        valores = np.abs(np.asarray(valores, dtype=np.float64))
+        positivos = valores[valores > self.MINIMO]
+        self.ceros += (len(valores) - len(positivos)) * peso
+        self.total += len(valores) * peso
+        
+        indices, cuentas = np.unique(np.ceil(np.log(positivos) / self._log_gamma).astype(np.int64),
+                                     return_counts=True)
+        for indice, cuenta in zip(indices.tolist(), cuentas.tolist()):
+            self.cubos[indice] = self.cubos.get(indice, 0.0) + cuenta * peso
+        self._acotar()
+    
+    def combinar(self, otro):
+        for indice, cuenta in otro.cubos.items():
+            self.cubos[indice] = self.cubos.get(indice, 0.0) + cuenta
+        self.ceros += otro.ceros
+        self.total += otro.total
+        self._acotar()
+        return self
+    
+    def _acotar(self):
+        if len(self.cubos) <= self.cubos_maximos:
+            return
+        indices = sorted(self.cubos)
+        sobrantes = indices[:len(indices) - self.cubos_maximos + 1]
+        destino = sobrantes[-1]
+        self.cubos[destino] = sum(self.cubos.pop(i) for i in sobrantes[:-1]) + self.cubos[destino]
+    
+    def cuantil(self, q):
+        """Estimación del cuantil `q` (NaN si está vacío)."""
+        if self.total <= 0:
+            return math.nan
+        objetivo = q * self.total
+        acumulado = self.ceros
+        if acumulado >= objetivo:
+            return 0.0
+        for indice in sorted(self.cubos):
+            acumulado += self.cubos[indice]
+            if acumulado >= objetivo:
+                return 2 * self.gamma ** indice / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.cubos) / (self.gamma + 1)
+
+class _ResumenErrores:
+    """Errores del modelo de una versión: estimados de la muestra más filas nuevas exactas."""
+    
+    def __init__(self, version, limite, bins):
+        self.version = version
+        self.n = 0.0
+        self.suma_abs = 0.0
+        self.suma_cuadrados = 0.0
+        self.histograma = HistogramaErrores(limite, bins)
+        self.bosquejo = BosquejoCuantiles()
+        self.exacto = True
+    
+    def actualizar(self, errores, peso=1.0):
+        errores_abs = np.abs(errores)
+        self.n += len(errores) * peso
+        self.suma_abs += float(errores_abs.sum()) * peso
+        self.suma_cuadrados += float(errores @ errores) * peso
+        self.histograma.actualizar(errores_abs, peso)
+        self.bosquejo.actualizar(errores_abs, peso)
+
+class EvaluadorOnline:
+    """Mantiene métricas y distribución de errores del modelo publicado con memoria acotada."""
+    
+    def __init__(self, tam_muestra=TAM_MUESTRA, semilla=0, limite_histograma=LIMITE_HISTOGRAMA,
+                 bins_histograma=BINS_HISTOGRAMA):
+        if tam_muestra < 1:
+            raise ValueError("El tamaño de la muestra debe ser positivo.")
+        self.tam_muestra = tam_muestra
+        self.limite_histograma = limite_histograma
+        self.bins_histograma = bins_histograma
+        self._generador = np.random.default_rng(semilla)
+        # Muestra de reservorio: filas (altura, peso, imc)
+        self._muestra = np.empty((tam_muestra, 3))
+        self._en_muestra = 0
+        self.vistos = 0
+        self._resumen = None
+    
+    @property
+    def muestra(self):
+        """Vista (altura, peso, imc) de las filas de la muestra."""
+        return self._muestra[:self._en_muestra]
+    
+    def sembrar(self, alturas, pesos, imcs):
+        """Reinicia la muestra con filas elegidas al azar de columnas ya existentes (sin recorrerlas)."""
+        n = len(alturas)
+        indices = np.sort(self._generador.choice(n, min(n, self.tam_muestra), replace=False))
+        self._en_muestra = len(indices)
+        self._muestra[:self._en_muestra] = np.column_stack([alturas[indices], pesos[indices], imcs[indices]])
+        self.vistos = n
+        self._resumen = None
+    
+    def observar(self, alturas, pesos, imcs, modelo=None):
+        """Incorpora filas nuevas a la muestra y, si el resumen es de `modelo`, a sus errores."""
+        filas = np.column_stack([np.atleast_1d(alturas), np.atleast_1d(pesos), np.atleast_1d(imcs)])
+        m = len(filas)
+        
+        # Algoritmo R vectorizado: primero se llenan los huecos libres
+        libres = min(self.tam_muestra - self._en_muestra, m)
+        self._muestra[self._en_muestra:self._en_muestra + libres] = filas[:libres]
+        self._en_muestra += libres
+        resto = filas[libres:]
+        if len(resto):
+            posiciones = self.vistos + libres + np.arange(1, len(resto) + 1)
+            destinos = (self._generador.random(len(resto)) * posiciones).astype(np.int64)
+            reemplazan = destinos < self.tam_muestra
+            # Con destinos repetidos gana la última fila, como en el algoritmo secuencial
+            self._muestra[destinos[reemplazan]] = resto[reemplazan]
+        self.vistos += m
+        
+        resumen = self._resumen
+        if resumen is not None and modelo is not None and modelo.version == resumen.version:
+            resumen.actualizar(filas[:, 2] - modelo.predecir(filas[:, 0], filas[:, 1]))
+    
+    def _resumen_de(self, modelo, total):
+        """Resumen de errores de `modelo`, reconstruido desde la muestra si cambió la versión."""
+        resumen = self._resumen
+        if resumen is None or resumen.version != modelo.version:
+            resumen = _ResumenErrores(modelo.version, self.limite_histograma, self.bins_histograma)
+            if self._en_muestra:
+                h, p, imc = self.muestra.T
+                # Cada fila de la muestra representa total / tamaño filas
+                resumen.actualizar(imc - modelo.predecir(h, p), total / self._en_muestra)
+                resumen.exacto = self._en_muestra == total
+            self._resumen = resumen
+        return resumen
+    
+    def metricas(self, motor, coeficientes, estadisticas):
+        """(mae, mse, r2) de unos coeficientes sin recorrer los datos.
+        
+        MSE y R² son exactos si el motor los deriva de las estadísticas; si no,
+        se estiman, igual que el MAE, con la muestra.
+        """
+        n = estadisticas.n
+        if n == 0 or self._en_muestra == 0:
+            return math.nan, math.nan, math.nan
+        
+        h, p, imc = self.muestra.T
+        errores = imc - motor.predecir(coeficientes, h, p)
+        mae = float(np.abs(errores).mean())
+        
+        sse = motor.error_cuadratico(estadisticas, coeficientes)
+        if sse is None:
+            sse = float(errores @ errores) * n / self._en_muestra
+        ss_tot = float(estadisticas.comomentos[2, 2])
+        return mae, sse / n, 1 - sse / ss_tot if ss_tot > 0 else 1.0
+    
+    def resultado(self, modelo, estadisticas):
+        """Métricas, cuantiles e histograma actuales del modelo publicado."""
+        n = estadisticas.n
+        if not modelo.entrenado or n == 0:
+            return None
+        
+        resumen = self._resumen_de(modelo, n)
+        if resumen.n == 0:
+            return None
+        
+        sse = modelo.motor.error_cuadratico(estadisticas, modelo.coeficientes)
+        exacto_mse = sse is not None
+        if sse is None:
+            sse = resumen.suma_cuadrados * n / resumen.n
+        ss_tot = float(estadisticas.comomentos[2, 2])
+        frecuencias, bordes = resumen.histograma.recortado()
+        
+        return {
+            'n': n,
+            'mae': resumen.suma_abs / resumen.n,
+            'mse': sse / n,
+            'r2': 1 - sse / ss_tot if ss_tot > 0 else 1.0,
+            'cuantiles': {f"p{round(q * 100)}": resumen.bosquejo.cuantil(q) for q in CUANTILES},
+            'frecuencias': frecuencias * (n / resumen.n),
+            'bordes': bordes,
+            'muestra': self._en_muestra,
+            'exacto': resumen.exacto,
+            'mse_exacto': exacto_mse,
+        }
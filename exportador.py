@@ -0,0 +1,75 @@
+# ============================================================================
+# ESCRITURA DE PREDICCIONES EN LOTE
+# ============================================================================
+# Convierte el resultado de BMIMLCalculator.predecir_imc_lote en líneas CSV o
+# JSON Lines, bloque a bloque, sin acumular el archivo en memoria.
+# ============================================================================
+
+import math
+
+from calculadora_imc import CLASIFICACIONES_IMC
+
+FORMATOS = ("csv", "jsonl")
+
+# El código CLASE_INVALIDA (-1) indexa el último nombre
+_NOMBRES_CLASE = CLASIFICACIONES_IMC + ("Fuera de rango",)
+
+ENCABEZADO_CSV = "altura,peso,imc_ml,imc_real,diferencia,clasificacion_ml,clasificacion_real\n"
+
+def _columnas(alturas, pesos, resultado):
+    return zip(alturas.tolist(), pesos.tolist(), resultado['imc_ml'].tolist(),
+               resultado['imc_real'].tolist(), resultado['diferencia'].tolist(),
+               resultado['clase_ml'].tolist(), resultado['clase_real'].tolist(),
+               resultado['valido'].tolist())
+
+def _numero_json(valor):
+    """Literal JSON de un número; NaN e infinito, que JSON no admite, se escriben como null."""
+    return repr(valor) if math.isfinite(valor) else "null"
+
+def _numero_csv(valor):
+    """Campo CSV de un número; NaN e infinito (p. ej. una línea ilegible) quedan vacíos."""
+    return repr(valor) if math.isfinite(valor) else ""
+
+def lineas_csv(alturas, pesos, resultado):
+    """Genera una línea CSV por fila; las filas fuera de rango dejan vacíos los valores."""
+    for altura, peso, imc_ml, imc_real, diferencia, clase_ml, clase_real, valido in _columnas(alturas, pesos, resultado):
+        if valido:
+            yield (f"{altura},{peso},{imc_ml:.4f},{imc_real:.4f},{diferencia:.4f},"
+                   f"{_NOMBRES_CLASE[clase_ml]},{_NOMBRES_CLASE[clase_real]}\n")
+        else:
+            yield f"{_numero_csv(altura)},{_numero_csv(peso)},,,,{_NOMBRES_CLASE[clase_ml]},{_NOMBRES_CLASE[clase_real]}\n"
+
+def lineas_jsonl(alturas, pesos, resultado):
+    """Genera un objeto JSON por línea; las filas fuera de rango llevan "valido": false."""
+    for altura, peso, imc_ml, imc_real, diferencia, clase_ml, clase_real, valido in _columnas(alturas, pesos, resultado):
+        if valido:
+            yield (f'{{"altura": {altura!r}, "peso": {peso!r}, "imc_ml": {imc_ml:.4f}, '
+                   f'"imc_real": {imc_real:.4f}, "diferencia": {diferencia:.4f}, '
+                   f'"clasificacion_ml": "{_NOMBRES_CLASE[clase_ml]}", '
+                   f'"clasificacion_real": "{_NOMBRES_CLASE[clase_real]}", "valido": true}}\n')
+        else:
+            yield f'{{"altura": {_numero_json(altura)}, "peso": {_numero_json(peso)}, "valido": false}}\n'
+
+def escribir_predicciones(calculadora, bloques, archivo, formato="csv", progreso=None):
+    """Predice cada bloque (alturas, pesos, ilegibles, fracción) y lo escribe en `archivo`.
+    
+    Devuelve el número de filas escritas. `progreso(fraccion)` puede lanzar
+    una excepción para interrumpir la escritura.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de salida desconocido: {formato}")
+    generar_lineas = lineas_csv if formato == "csv" else lineas_jsonl
+    
+    if formato == "csv":
+        archivo.write(ENCABEZADO_CSV)
+    
+    filas = 0
+    for alturas, pesos, _, avance in bloques:
+        resultado, mensaje = calculadora.predecir_imc_lote(alturas, pesos)
+        if resultado is None:
+            raise ValueError(mensaje)
+        archivo.writelines(generar_lineas(alturas, pesos, resultado))
+        filas += len(alturas)
+        if progreso and avance is not None:
+            progreso(avance)
+    return filas
@@ -0,0 +1,112 @@
+# ============================================================================
+# GRÁFICOS DE LA PESTAÑA MÉTRICAS
+# ============================================================================
+# Una única figura cuyos artistas se actualizan en su lugar. Con muchos datos
+# el diagrama de dispersión se sustituye por un histograma 2D de densidad, de
+# modo que el tiempo de dibujo no depende del número de filas.
+# ============================================================================
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+# Por encima de este número de puntos se dibuja la densidad en lugar de cada punto
+UMBRAL_DENSIDAD = 20_000
+BINS_DENSIDAD = 200
+BINS_ERRORES = 30
+
+def preparar_datos(imcs, predicciones, umbral_densidad=UMBRAL_DENSIDAD,
+                   bins_densidad=BINS_DENSIDAD, bins_errores=BINS_ERRORES):
+    """Reduce los datos a lo que se va a dibujar; no usa matplotlib y puede ir en segundo plano."""
+    imcs = np.asarray(imcs, dtype=np.float64)
+    predicciones = np.asarray(predicciones, dtype=np.float64)
+    
+    limite_inferior = float(min(imcs.min(), predicciones.min()))
+    limite_superior = float(max(imcs.max(), predicciones.max()))
+    if limite_superior <= limite_inferior:
+        limite_superior = limite_inferior + 1.0
+    
+    datos = {
+        'n': len(imcs),
+        'limites': (limite_inferior, limite_superior),
+        'rango_real': (float(imcs.min()), float(imcs.max())),
+    }
+    
+    if len(imcs) > umbral_densidad:
+        limites = [[limite_inferior, limite_superior]] * 2
+        densidad, _, _ = np.histogram2d(imcs, predicciones, bins=bins_densidad, range=limites)
+        datos['densidad'] = densidad.T
+    else:
+        datos['puntos'] = np.column_stack([imcs, predicciones])
+    
+    errores = np.abs(imcs - predicciones)
+    datos['frecuencias'], datos['bordes'] = np.histogram(errores, bins=min(bins_errores, len(errores)))
+    return datos
+
+class GraficoMetricas:
+    """Figura persistente de predicciones vs reales y distribución de errores."""
+    
+    def __init__(self, contenedor):
+        self.figura = Figure(figsize=(12, 5))
+        self.ax_predicciones, self.ax_errores = self.figura.subplots(1, 2)
+        
+        # Gráfico 1: Predicciones vs Reales (puntos o densidad según el tamaño)
+        ax1 = self.ax_predicciones
+        self._puntos = ax1.scatter([], [], alpha=0.7, color='blue')
+        self._densidad = ax1.imshow(np.ma.masked_all((1, 1)), origin='lower', aspect='auto',
+                                    cmap='Blues', interpolation='nearest', extent=(0, 1, 0, 1))
+        self._densidad.set_visible(False)
+        self._diagonal, = ax1.plot([], [], 'r--', label='Predicción perfecta')
+        ax1.set_xlabel('IMC Real')
+        ax1.set_ylabel('IMC Predicho')
+        ax1.set_title('Predicciones vs Valores Reales')
+        ax1.legend()
+        ax1.grid(True, alpha=0.3)
+        
+        # Gráfico 2: Distribución de errores
+        ax2 = self.ax_errores
+        self._histograma = ax2.stairs(np.zeros(1), np.arange(2), fill=True, alpha=0.7,
+                                      color='green', edgecolor='black')
+        ax2.set_xlabel('Error Absoluto')
+        ax2.set_ylabel('Frecuencia')
+        ax2.set_title('Distribución de Errores')
+        ax2.grid(True, alpha=0.3)
+        
+        self.figura.tight_layout()
+        
+        self.canvas = FigureCanvasTkAgg(self.figura, contenedor)
+        self.canvas.get_tk_widget().pack(fill='both', expand=True)
+    
+    def actualizar(self, datos):
+        """Actualiza los artistas con el resultado de preparar_datos y redibuja."""
+        limite_inferior, limite_superior = datos['limites']
+        ax1 = self.ax_predicciones
+        
+        if 'densidad' in datos:
+            # Escala logarítmica para que las zonas poco pobladas sigan visibles
+            densidad = datos['densidad']
+            self._densidad.set_data(np.ma.masked_equal(np.log1p(densidad), 0))
+            self._densidad.set_extent((limite_inferior, limite_superior, limite_inferior, limite_superior))
+            self._densidad.set_clim(0, max(float(np.log1p(densidad.max())), 1e-9))
+            self._densidad.set_visible(True)
+            self._puntos.set_visible(False)
+            ax1.set_title(f'Predicciones vs Valores Reales (densidad, n={datos["n"]})')
+        else:
+            self._puntos.set_offsets(datos['puntos'])
+            self._puntos.set_visible(True)
+            self._densidad.set_visible(False)
+            ax1.set_title('Predicciones vs Valores Reales')
+        
+        minimo_real, maximo_real = datos['rango_real']
+        self._diagonal.set_data([minimo_real, maximo_real], [minimo_real, maximo_real])
+        
+        margen = 0.02 * (limite_superior - limite_inferior)
+        ax1.set_xlim(limite_inferior - margen, limite_superior + margen)
+        ax1.set_ylim(limite_inferior - margen, limite_superior + margen)
+        
+        frecuencias, bordes = datos['frecuencias'], datos['bordes']
+        self._histograma.set_data(frecuencias, bordes)
+        self.ax_errores.set_xlim(bordes[0], bordes[-1])
+        self.ax_errores.set_ylim(0, max(int(frecuencias.max()), 1) * 1.05)
+        
+        self.canvas.draw_idle()
@@ -0,0 +1,195 @@
+# ============================================================================
+# IMPORTACIÓN MASIVA DE DATOS DE ENTRENAMIENTO
+# ============================================================================
+# Carga alturas y pesos desde CSV (por bloques) o desde columnas binarias
+# mapeadas en memoria, sin materializar el archivo como objetos de Python.
+# ============================================================================
+
+import itertools
+import os
+import warnings
+
+import numpy as np
+
+TAM_BLOQUE_CSV = 100_000
+TAM_BLOQUE_BINARIO = 1_000_000
+
+class ResumenImportacion:
+    """Conteo de filas aceptadas y rechazadas durante una importación."""
+    
+    def __init__(self):
+        self.aceptadas = 0
+        self.rechazadas = 0
+        self.ilegibles = 0
+        self.bloques = 0
+    
+    @property
+    def total(self):
+        return self.aceptadas + self.rechazadas
+    
+    def registrar(self, aceptadas, rechazadas, ilegibles=0):
+        self.aceptadas += aceptadas
+        self.rechazadas += rechazadas + ilegibles
+        self.ilegibles += ilegibles
+        self.bloques += 1
+    
+    def __str__(self):
+        return (f"{self.aceptadas} filas importadas, {self.rechazadas} rechazadas "
+                f"({self.ilegibles} ilegibles) en {self.bloques} bloques.")
+
+def _parsear_bloque(lineas, delimitador, columnas, conservar_ilegibles=False):
+    """Convierte un bloque de líneas CSV en columnas de altura y peso.
+    
+    Con `conservar_ilegibles` cada línea ilegible produce una fila NaN en vez
+    de descartarse, para que la salida quede alineada con la entrada.
+    """
+    try:
+        with warnings.catch_warnings():
+            # Un bloque formado solo por líneas vacías no es un error
+            warnings.simplefilter('ignore', UserWarning)
+            datos = np.loadtxt(lineas, delimiter=delimitador, usecols=columnas,
+                               dtype=np.float64, ndmin=2, comments=None)
+        if datos.size == 0:
+            return np.empty(0), np.empty(0), 0
+        return datos[:, 0], datos[:, 1], 0
+    except ValueError:
+        pass
+    
+    # Hay filas mal formadas: se recorre el bloque fila por fila para apartarlas
+    alturas = []
+    pesos = []
+    ilegibles = 0
+    for linea in lineas:
+        if not linea.strip():
+            continue
+        try:
+            campos = linea.split(delimitador)
+            altura = float(campos[columnas[0]])
+            peso = float(campos[columnas[1]])
+        except (ValueError, IndexError):
+            ilegibles += 1
+            if not conservar_ilegibles:
+                continue
+            altura = peso = np.nan
+        alturas.append(altura)
+        pesos.append(peso)
+    return np.array(alturas, dtype=np.float64), np.array(pesos, dtype=np.float64), ilegibles
+
+def _es_encabezado(linea, delimitador, columnas):
+    """La primera línea es encabezado solo si ninguno de sus campos es numérico.
+    
+    Una fila de datos mal formada (p. ej. "abc,3") se cuenta como ilegible.
+    """
+    campos = linea.split(delimitador)
+    for columna in columnas:
+        try:
+            float(campos[columna])
+            return False
+        except (ValueError, IndexError):
+            pass
+    return True
+
+def leer_bloques_texto(archivo, tam_bloque=TAM_BLOQUE_CSV, delimitador=',', columnas=(0, 1),
+                       encabezado=None, tamano=None, conservar_ilegibles=False):
+    """Genera bloques (alturas, pesos, ilegibles, fracción leída) de un archivo de texto abierto.
+    
+    Si `encabezado` es None se detecta a partir de la primera línea. Sin
+    `tamano` (p. ej. al leer de stdin) la fracción leída es None.
+    """
+    primera = archivo.readline()
+    if not primera:
+        return
+    if encabezado is None:
+        encabezado = _es_encabezado(primera, delimitador, columnas)
+    leidos = len(primera) if encabezado else 0
+    lineas = archivo if encabezado else itertools.chain([primera], archivo)
+    
+    while True:
+        bloque = list(itertools.islice(lineas, tam_bloque))
+        if not bloque:
+            break
+        
+        leidos += sum(map(len, bloque))
+        alturas, pesos, ilegibles = _parsear_bloque(bloque, delimitador, columnas, conservar_ilegibles)
+        yield alturas, pesos, ilegibles, min(leidos / tamano, 1.0) if tamano else None
+
+def leer_bloques_csv(ruta, tam_bloque=TAM_BLOQUE_CSV, delimitador=',', columnas=(0, 1), encabezado=None,
+                     conservar_ilegibles=False):
+    """Genera bloques (alturas, pesos, ilegibles, fracción leída) de un CSV de (altura, peso)."""
+    tamano = max(os.path.getsize(ruta), 1)
+    with open(ruta, 'r', encoding='utf-8', newline='') as archivo:
+        yield from leer_bloques_texto(archivo, tam_bloque, delimitador, columnas, encabezado, tamano,
+                                      conservar_ilegibles)
+
+def leer_bloques_columnas(alturas, pesos, tam_bloque=TAM_BLOQUE_BINARIO):
+    """Genera bloques (alturas, pesos, 0, fracción leída) de columnas, normalmente mapeadas."""
+    if len(alturas) != len(pesos):
+        raise ValueError("Las columnas de altura y peso deben tener la misma longitud.")
+    
+    total = len(alturas)
+    for inicio in range(0, total, tam_bloque):
+        fin = min(inicio + tam_bloque, total)
+        yield alturas[inicio:fin], pesos[inicio:fin], 0, fin / total
+
+def _abrir_npy(ruta_alturas, ruta_pesos=None):
+    """Mapea en memoria las columnas guardadas en uno o dos archivos .npy.
+    
+    Con un solo archivo se espera una matriz (n, 2) de columnas altura y peso.
+    """
+    alturas = np.load(ruta_alturas, mmap_mode='r')
+    if ruta_pesos is None:
+        if alturas.ndim != 2 or alturas.shape[1] != 2:
+            raise ValueError("Un único .npy debe tener forma (n, 2) con altura y peso.")
+        return alturas[:, 0], alturas[:, 1]
+    return alturas, np.load(ruta_pesos, mmap_mode='r')
+
+def leer_bloques(ruta, **opciones):
+    """Genera bloques de un archivo eligiendo el formato por su extensión (.csv, .txt o .npy)."""
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension in ('.csv', '.txt'):
+        return leer_bloques_csv(ruta, **opciones)
+    if extension == '.npy':
+        # Las columnas binarias no tienen líneas ilegibles que conservar
+        opciones.pop('conservar_ilegibles', None)
+        return leer_bloques_columnas(*_abrir_npy(ruta), **opciones)
+    raise ValueError(f"Formato no soportado: {extension or ruta}")
+
+def importar_bloques(calculadora, bloques, progreso=None):
+    """Valida y agrega cada bloque a la calculadora.
+    
+    `progreso(fraccion)` se invoca tras cada bloque y puede lanzar una
+    excepción para interrumpir la importación.
+    """
+    resumen = ResumenImportacion()
+    for alturas, pesos, ilegibles, avance in bloques:
+        aceptadas, rechazadas = calculadora.agregar_bloque(alturas, pesos)
+        resumen.registrar(aceptadas, rechazadas, ilegibles)
+        if progreso and avance is not None:
+            progreso(avance)
+    return resumen
+
+def importar_csv(calculadora, ruta, tam_bloque=TAM_BLOQUE_CSV, delimitador=',', columnas=(0, 1),
+                 encabezado=None, progreso=None):
+    """Importa un CSV de (altura, peso) leyéndolo en bloques de tamaño fijo."""
+    bloques = leer_bloques_csv(ruta, tam_bloque, delimitador, columnas, encabezado)
+    return importar_bloques(calculadora, bloques, progreso)
+
+def importar_columnas(calculadora, alturas, pesos, tam_bloque=TAM_BLOQUE_BINARIO, progreso=None):
+    """Alimenta la calculadora con columnas (normalmente mapeadas en memoria) por bloques."""
+    return importar_bloques(calculadora, leer_bloques_columnas(alturas, pesos, tam_bloque), progreso)
+
+def importar_npy(calculadora, ruta_alturas, ruta_pesos=None, tam_bloque=TAM_BLOQUE_BINARIO, progreso=None):
+    """Importa archivos .npy mapeados en memoria."""
+    alturas, pesos = _abrir_npy(ruta_alturas, ruta_pesos)
+    return importar_columnas(calculadora, alturas, pesos, tam_bloque, progreso)
+
+def importar_binario(calculadora, ruta_alturas, ruta_pesos, dtype=np.float64,
+                     tam_bloque=TAM_BLOQUE_BINARIO, progreso=None):
+    """Importa columnas binarias sin cabecera mapeándolas en memoria."""
+    alturas = np.memmap(ruta_alturas, dtype=dtype, mode='r')
+    pesos = np.memmap(ruta_pesos, dtype=dtype, mode='r')
+    return importar_columnas(calculadora, alturas, pesos, tam_bloque, progreso)
+
+def importar_archivo(calculadora, ruta, progreso=None, **opciones):
+    """Importa un archivo eligiendo el formato por su extensión (.csv, .txt o .npy)."""
+    return importar_bloques(calculadora, leer_bloques(ruta, **opciones), progreso)
@@ -0,0 +1,119 @@
+# ============================================================================
+# CALCULADORA DE IMC CON MACHINE LEARNING - INSTRUMENTACIÓN
+# ============================================================================
+# Contadores y temporizadores por etapa (llamadas, tiempo total, p50/p99 y
+# filas procesadas). Desactivada por defecto: cada llamada instrumentada solo
+# comprueba un indicador. Se activa con activar() o con IMC_INSTRUMENTACION=1.
+# ============================================================================
+
+import collections
+import functools
+import json
+import os
+import threading
+import time
+
+# Muestras de latencia que se conservan por etapa para los percentiles
+MUESTRAS_MAXIMAS = 10_000
+
+reloj = time.perf_counter
+
+_activa = os.environ.get("IMC_INSTRUMENTACION", "") not in ("", "0")
+_bloqueo = threading.Lock()
+_etapas = {}
+
+class EstadisticasEtapa:
+    """Contadores acumulados de una etapa."""
+    
+    __slots__ = ('llamadas', 'total', 'filas', 'muestras')
+    
+    def __init__(self):
+        self.llamadas = 0
+        self.total = 0.0
+        self.filas = 0
+        self.muestras = collections.deque(maxlen=MUESTRAS_MAXIMAS)
+    
+    def a_dict(self):
+        ordenadas = sorted(self.muestras)
+        
+        def percentil(p):
+            return ordenadas[min(int(p * len(ordenadas)), len(ordenadas) - 1)] * 1000 if ordenadas else None
+        
+        return {
+            'llamadas': self.llamadas,
+            'total_ms': self.total * 1000,
+            'p50_ms': percentil(0.50),
+            'p99_ms': percentil(0.99),
+            'filas': self.filas,
+            'filas_por_segundo': self.filas / self.total if self.total > 0 else None,
+        }
+
+def activa():
+    return _activa
+
+def activar(valor=True):
+    """Activa o desactiva la recogida de medidas."""
+    global _activa
+    _activa = bool(valor)
+
+def reiniciar():
+    """Descarta todas las medidas acumuladas."""
+    with _bloqueo:
+        _etapas.clear()
+
+def registrar(etapa, segundos, filas=0):
+    """Registra una ejecución de `etapa`; no hace nada si la instrumentación está desactivada."""
+    if not _activa:
+        return
+    with _bloqueo:
+        estadisticas = _etapas.get(etapa)
+        if estadisticas is None:
+            estadisticas = _etapas[etapa] = EstadisticasEtapa()
+        estadisticas.llamadas += 1
+        estadisticas.total += segundos
+        estadisticas.filas += filas
+        estadisticas.muestras.append(segundos)
+
+def medir(etapa, filas=None):
+    """Decorador que registra la duración de cada llamada como `etapa`.
+    
+    `filas(*args, **kwargs)` devuelve las filas procesadas por la llamada;
+    sin él se cuenta una fila por llamada.
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _activa:
+                return funcion(*args, **kwargs)
+            inicio = reloj()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                registrar(etapa, reloj() - inicio, filas(*args, **kwargs) if filas else 1)
+        return envoltura
+    return decorador
+
+def resumen():
+    """Devuelve {etapa: medidas} con las etapas registradas hasta ahora."""
+    with _bloqueo:
+        return {etapa: estadisticas.a_dict() for etapa, estadisticas in sorted(_etapas.items())}
+
+def texto_resumen():
+    """Resumen en texto de ancho fijo, una línea por etapa."""
+    etapas = resumen()
+    if not etapas:
+        return "Sin medidas" if _activa else "Instrumentación desactivada"
+    
+    def ms(valor):
+        return f"{valor:9.3f}" if valor is not None else f"{'-':>9}"
+    
+    lineas = [f"{'Etapa':<20}{'Llamadas':>9}{'Total ms':>11}{'p50 ms':>9}{'p99 ms':>9}{'Filas':>11}"]
+    for etapa, m in etapas.items():
+        lineas.append(f"{etapa:<20}{m['llamadas']:>9}{m['total_ms']:>11.1f}"
+                      f"{ms(m['p50_ms'])}{ms(m['p99_ms'])}{m['filas']:>11}")
+    return "\n".join(lineas)
+
+def exportar_json(ruta):
+    """Guarda el resumen en `ruta` como JSON."""
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump({'activa': _activa, 'etapas': resumen()}, archivo, indent=2)
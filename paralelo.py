@@ -0,0 +1,117 @@
+# ============================================================================
+# CALCULADORA DE IMC CON MACHINE LEARNING - ENTRENAMIENTO EN PARALELO
+# ============================================================================
+# Map-reduce sobre conjuntos mapeados en memoria (.npy o .imcml). Cada proceso
+# abre el archivo por su cuenta y recibe solo (inicio, fin) de su trozo: los
+# datos se comparten a través de las páginas del mapeo, sin serializarlos.
+# Las estadísticas y métricas parciales se reducen en orden, con el mismo
+# resultado que el entrenamiento serial.
+# ============================================================================
+
+import concurrent.futures
+import multiprocessing
+import os
+
+import numpy as np
+
+import importador
+import persistencia
+from calculadora_imc import BMIMLCalculator, InstantaneaModelo
+
+TAM_BLOQUE = importador.TAM_BLOQUE_BINARIO
+
+# Columnas ya abiertas en cada proceso, por fuente
+_abiertas = {}
+
+def _columnas(fuente):
+    """Mapea (una vez por proceso) las columnas de altura y peso de `fuente`."""
+    columnas = _abiertas.get(fuente)
+    if columnas is None:
+        ruta_alturas, ruta_pesos = fuente
+        if ruta_alturas.lower().endswith(persistencia.EXTENSION):
+            _, (alturas, pesos, _) = persistencia.cargar(ruta_alturas, modo='r')
+            columnas = alturas, pesos
+        else:
+            columnas = importador._abrir_npy(ruta_alturas, ruta_pesos)
+        if len(columnas[0]) != len(columnas[1]):
+            raise ValueError("Las columnas de altura y peso deben tener la misma longitud.")
+        columnas = _abiertas[fuente] = columnas
+    return columnas
+
+def _trozo(fuente, inicio, fin):
+    alturas, pesos = _columnas(fuente)
+    return np.asarray(alturas[inicio:fin], dtype=np.float64), np.asarray(pesos[inicio:fin], dtype=np.float64)
+
+def _estadisticas_trozo(fuente, inicio, fin, segmentacion=None):
+    """Fase map: estadísticas suficientes de un trozo (en una calculadora sin datos)."""
+    parcial = BMIMLCalculator(retener_datos=False)
+    if segmentacion is not None:
+        parcial.configurar_segmentos(segmentacion.altura, segmentacion.peso)
+    aceptadas, rechazadas = parcial.agregar_bloque(*_trozo(fuente, inicio, fin))
+    return parcial, aceptadas, rechazadas
+
+def _metricas_trozo(fuente, inicio, fin, modelo):
+    """Fase map: métricas parciales de un trozo con el modelo dado."""
+    parcial = BMIMLCalculator(retener_datos=False)
+    parcial.publicar_modelo(modelo)
+    return parcial.evaluar_bloques([_trozo(fuente, inicio, fin)])
+
+def dividir(n, tam_bloque=TAM_BLOQUE):
+    """Devuelve los intervalos (inicio, fin) en que se reparten `n` filas."""
+    return [(inicio, min(inicio + tam_bloque, n)) for inicio in range(0, n, tam_bloque)]
+
+def _mapear(ejecutor, funcion, fuente, trozos, *args, progreso=None, desde=0.0, hasta=1.0):
+    """Ejecuta `funcion` sobre cada trozo y devuelve los resultados en orden."""
+    futuros = [ejecutor.submit(funcion, fuente, inicio, fin, *args) for inicio, fin in trozos]
+    resultados = []
+    for i, futuro in enumerate(futuros):
+        resultados.append(futuro.result())
+        if progreso:
+            progreso(desde + (hasta - desde) * (i + 1) / len(futuros))
+    return resultados
+
+def entrenar_paralelo(calculadora, ruta_alturas, ruta_pesos=None, procesos=None,
+                      tam_bloque=TAM_BLOQUE, progreso=None):
+    """Incorpora un conjunto mapeado a `calculadora` y la entrena en varios procesos.
+    
+    `ruta_alturas` es un .imcml, un .npy (n, 2) o el .npy de alturas junto a
+    `ruta_pesos`. Las filas no se retienen: se suman a las estadísticas y las
+    métricas se calculan sobre el archivo, igual que `entrenar_modelo` con
+    `bloques_evaluacion`. Devuelve (exito, mensaje, resumen de importación).
+    La calculadora no puede retener datos ni tener una ventana activa.
+    """
+    if calculadora.retener_datos or calculadora.tamano_ventana is not None:
+        raise ValueError("El entrenamiento paralelo requiere una calculadora sin datos retenidos ni ventana.")
+    fuente = (os.path.abspath(ruta_alturas), ruta_pesos and os.path.abspath(ruta_pesos))
+    trozos = dividir(len(_columnas(fuente)[0]), tam_bloque)
+    procesos = procesos or os.cpu_count() or 1
+    resumen = importador.ResumenImportacion()
+    
+    # 'spawn' evita heredar hilos (p. ej. el de Tk) en los procesos hijos
+    contexto = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(procesos, mp_context=contexto) as ejecutor:
+        try:
+            parciales = _mapear(ejecutor, _estadisticas_trozo, fuente, trozos, calculadora.segmentacion,
+                                progreso=progreso, hasta=0.5)
+            
+            # Fase reduce: estadísticas (y las de cada segmento) en el orden de los trozos
+            for parcial, aceptadas, rechazadas in parciales:
+                exito, mensaje = calculadora.combinar(parcial)
+                if not exito:
+                    raise ValueError(mensaje)
+                resumen.registrar(aceptadas, rechazadas)
+            
+            def evaluar(coeficientes):
+                acumulado = None
+                modelo = InstantaneaModelo(calculadora.motor, coeficientes, entrenado=True)
+                for acumulador in _mapear(ejecutor, _metricas_trozo, fuente, trozos, modelo,
+                                          progreso=progreso, desde=0.5):
+                    acumulado = acumulador if acumulado is None else acumulado.combinar(acumulador)
+                return acumulado.resultado() if acumulado else (float('nan'),) * 3
+            
+            exito, mensaje = calculadora.entrenar_modelo(evaluar=evaluar)
+        except BaseException:
+            ejecutor.shutdown(wait=False, cancel_futures=True)
+            raise
+    
+    return exito, mensaje, resumen
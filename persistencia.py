@@ -0,0 +1,96 @@
+# ============================================================================
+# PERSISTENCIA DEL MODELO Y DE LOS DATOS DE ENTRENAMIENTO
+# ============================================================================
+# Formato binario .imcml:
+#   MAGIA (8 bytes) | longitud de la cabecera (uint32 LE) | cabecera JSON |
+#   relleno hasta múltiplo de ALINEACION | columnas contiguas en el mismo dtype
+# Las columnas se cargan mapeadas en memoria, por lo que abrir un conjunto de
+# datos grande no requiere leerlo.
+#
+# Versiones: la 1 guarda un modelo global sobre todos los datos; la 2 añade
+# las cabeceras de ventana y de segmentación, que un lector de la versión 1
+# interpretaría mal, así que la rechaza.
+# ============================================================================
+
+import json
+import math
+import os
+import struct
+
+import numpy as np
+
+MAGIA = b"IMCML\x00\x00\x00"
+VERSION_FORMATO = 2
+ALINEACION = 64
+EXTENSION = ".imcml"
+
+def _alinear(posicion):
+    return -(-posicion // ALINEACION) * ALINEACION
+
+def _json_finito(valor):
+    """Copia de la cabecera con null en lugar de NaN o infinito, que JSON no admite."""
+    if isinstance(valor, dict):
+        return {clave: _json_finito(v) for clave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_json_finito(v) for v in valor]
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return None
+    return valor
+
+def guardar(ruta, columnas, cabecera, version=VERSION_FORMATO):
+    """Escribe las columnas y la cabecera de forma atómica en `ruta`.
+    
+    `version` debe ser la mínima que entiende la cabecera, para que las
+    versiones anteriores sigan leyendo los archivos que no usan lo nuevo.
+    """
+    columnas = [np.ascontiguousarray(columna) for columna in columnas]
+    dtype = columnas[0].dtype
+    filas = len(columnas[0])
+    if any(columna.dtype != dtype or len(columna) != filas for columna in columnas):
+        raise ValueError("Todas las columnas deben tener el mismo dtype y longitud.")
+    
+    cabecera = dict(cabecera, version=version, dtype=dtype.str,
+                    filas=filas, columnas=len(columnas))
+    texto = json.dumps(_json_finito(cabecera), allow_nan=False).encode('utf-8')
+    prefijo = len(MAGIA) + 4 + len(texto)
+    
+    # Se escribe en un temporal y se reemplaza para no dañar un archivo mapeado
+    temporal = f"{ruta}.tmp"
+    with open(temporal, 'wb') as archivo:
+        archivo.write(MAGIA)
+        archivo.write(struct.pack('<I', len(texto)))
+        archivo.write(texto)
+        archivo.write(b'\x00' * (_alinear(prefijo) - prefijo))
+        for columna in columnas:
+            columna.tofile(archivo)
+    try:
+        os.replace(temporal, ruta)
+    except OSError:
+        os.remove(temporal)
+        raise
+
+def cargar(ruta, modo='c'):
+    """Lee la cabecera y mapea las columnas en memoria.
+    
+    Con el modo 'c' (copia en escritura) las modificaciones no alteran el archivo.
+    """
+    with open(ruta, 'rb') as archivo:
+        if archivo.read(len(MAGIA)) != MAGIA:
+            raise ValueError("El archivo no es un modelo IMC válido.")
+        longitud, = struct.unpack('<I', archivo.read(4))
+        cabecera = json.loads(archivo.read(longitud).decode('utf-8'))
+    
+    if cabecera.get('version', 0) > VERSION_FORMATO:
+        raise ValueError(f"Versión de formato no soportada: {cabecera.get('version')}")
+    
+    dtype = np.dtype(cabecera['dtype'])
+    filas = cabecera['filas']
+    inicio = _alinear(len(MAGIA) + 4 + longitud)
+    
+    if filas == 0:
+        columnas = [np.empty(0, dtype=dtype) for _ in range(cabecera['columnas'])]
+    else:
+        columnas = [np.memmap(ruta, dtype=dtype, mode=modo, shape=(filas,),
+                              offset=inicio + i * filas * dtype.itemsize)
+                    for i in range(cabecera['columnas'])]
+    return cabecera, columnas
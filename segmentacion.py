@@ -0,0 +1,100 @@
+# ============================================================================
+# CALCULADORA DE IMC CON MACHINE LEARNING - SEGMENTACIÓN POR COHORTES
+# ============================================================================
+# Reparte las filas en segmentos de altura y peso para ajustar un modelo por
+# segmento. Los tramos tienen ancho fijo: el segmento de una fila se obtiene
+# con una resta, un producto y un recorte, en tiempo constante tanto para un
+# escalar como para cada elemento de un arreglo.
+# ============================================================================
+
+import numpy as np
+
+class Tramos:
+    """`cantidad` tramos de ancho fijo desde `inicio`; los valores de fuera caen en el primero o el último."""
+    
+    def __init__(self, inicio, ancho, cantidad):
+        if not ancho > 0 or int(cantidad) < 1:
+            raise ValueError("Los tramos necesitan un ancho positivo y al menos un tramo.")
+        self.inicio = float(inicio)
+        self.ancho = float(ancho)
+        self.cantidad = int(cantidad)
+        self._escala = 1.0 / self.ancho
+    
+    @classmethod
+    def desde_texto(cls, texto):
+        """Crea los tramos a partir de "inicio, ancho, cantidad"."""
+        try:
+            inicio, ancho, cantidad = (campo.strip() for campo in texto.split(','))
+            return cls(float(inicio), float(ancho), int(cantidad))
+        except ValueError:
+            raise ValueError(f"Tramos no válidos: '{texto}' (se espera inicio, ancho, cantidad).") from None
+    
+    def indice(self, valores):
+        """Tramo de un escalar o de cada elemento de un arreglo."""
+        if isinstance(valores, (int, float)):
+            return min(max(int((valores - self.inicio) * self._escala), 0), self.cantidad - 1)
+        indices = ((np.asarray(valores, dtype=np.float64) - self.inicio) * self._escala).astype(np.int64)
+        return np.clip(indices, 0, self.cantidad - 1)
+    
+    def limites(self, tramo):
+        """(desde, hasta) del tramo; el primero y el último no tienen límite exterior."""
+        desde = self.inicio + tramo * self.ancho if tramo > 0 else -np.inf
+        hasta = self.inicio + (tramo + 1) * self.ancho if tramo < self.cantidad - 1 else np.inf
+        return desde, hasta
+    
+    def a_lista(self):
+        return [self.inicio, self.ancho, self.cantidad]
+    
+    def __eq__(self, otro):
+        return isinstance(otro, Tramos) and self.a_lista() == otro.a_lista()
+    
+    def __repr__(self):
+        return f"Tramos({self.inicio:g}, {self.ancho:g}, {self.cantidad})"
+
+class Segmentacion:
+    """Segmentos formados por tramos de altura y, opcionalmente, de peso."""
+    
+    def __init__(self, tramos_altura, tramos_peso=None):
+        self.altura = tramos_altura if isinstance(tramos_altura, Tramos) else Tramos(*tramos_altura)
+        if tramos_peso is not None and not isinstance(tramos_peso, Tramos):
+            tramos_peso = Tramos(*tramos_peso)
+        self.peso = tramos_peso
+        self.cantidad = self.altura.cantidad * (self.peso.cantidad if self.peso else 1)
+    
+    def indice(self, alturas, pesos):
+        """Segmento de un par (altura, peso) o de cada fila de dos columnas."""
+        segmento = self.altura.indice(alturas)
+        if self.peso is None:
+            return segmento
+        return segmento * self.peso.cantidad + self.peso.indice(pesos)
+    
+    def describir(self, segmento):
+        """Texto con los límites de un segmento, p. ej. "altura 1.60–1.70 · peso < 60"."""
+        if self.peso is None:
+            return _describir_tramo("altura", self.altura.limites(segmento))
+        tramo_altura, tramo_peso = divmod(segmento, self.peso.cantidad)
+        return (f"{_describir_tramo('altura', self.altura.limites(tramo_altura))} · "
+                f"{_describir_tramo('peso', self.peso.limites(tramo_peso))}")
+    
+    def a_dict(self):
+        return {'altura': self.altura.a_lista(), 'peso': self.peso.a_lista() if self.peso else None}
+    
+    @classmethod
+    def desde_dict(cls, datos):
+        return cls(datos['altura'], datos.get('peso'))
+    
+    def __eq__(self, otra):
+        return isinstance(otra, Segmentacion) and self.a_dict() == otra.a_dict()
+    
+    def __repr__(self):
+        return f"Segmentacion({self.altura!r}, {self.peso!r})"
+
+def _describir_tramo(variable, limites):
+    desde, hasta = limites
+    if np.isinf(desde) and np.isinf(hasta):
+        return f"{variable} (todas)"
+    if np.isinf(desde):
+        return f"{variable} < {hasta:g}"
+    if np.isinf(hasta):
+        return f"{variable} ≥ {desde:g}"
+    return f"{variable} {desde:g}–{hasta:g}"
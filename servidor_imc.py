@@ -0,0 +1,294 @@
+# ============================================================================
+# CALCULADORA DE IMC CON MACHINE LEARNING - SERVIDOR LOCAL DE INFERENCIA
+# ============================================================================
+# Servidor HTTP/JSON sobre asyncio (solo biblioteca estándar). Las peticiones
+# concurrentes se agrupan en micro-lotes que se evalúan con una sola llamada a
+# predecir_imc_lote.
+#
+#   python servidor_imc.py -m modelo.imcml [--puerto 8080] [--ventana-ms 2]
+#
+#   POST /predecir       {"altura": 1.75, "peso": 70}  o una lista de ellos
+#   GET  /estadisticas   latencias y tamaños de lote
+#   GET  /salud
+# ============================================================================
+
+import argparse
+import asyncio
+import collections
+import json
+import statistics
+import sys
+import time
+from http import HTTPStatus
+
+import numpy as np
+
+from calculadora_imc import BMIMLCalculator, CLASIFICACIONES_IMC
+
+VENTANA_MS = 2.0
+LOTE_MAXIMO = 512
+MUESTRAS_LATENCIA = 10_000
+TAM_MAXIMO_CUERPO = 1 << 20
+
+class EstadisticasServidor:
+    """Latencias por petición y tamaños de lote, con memoria acotada."""
+    
+    def __init__(self, muestras=MUESTRAS_LATENCIA):
+        self.peticiones = 0
+        self.lotes = 0
+        self.lote_maximo = 0
+        self._latencias = collections.deque(maxlen=muestras)
+        self._tamanos = collections.Counter()
+    
+    def registrar_lote(self, tamano, latencias):
+        self.lotes += 1
+        self.peticiones += tamano
+        self.lote_maximo = max(self.lote_maximo, tamano)
+        # Histograma por potencias de dos: 1, 2, 4, 8, ...
+        self._tamanos[1 << (tamano - 1).bit_length()] += 1
+        self._latencias.extend(latencias)
+    
+    def resumen(self):
+        latencias = sorted(self._latencias)
+        
+        def percentil(p):
+            if not latencias:
+                return None
+            return latencias[min(int(p * len(latencias)), len(latencias) - 1)] * 1000
+        
+        return {
+            'peticiones': self.peticiones,
+            'lotes': self.lotes,
+            'lote_medio': self.peticiones / self.lotes if self.lotes else None,
+            'lote_maximo': self.lote_maximo,
+            'histograma_lotes': {f"<={tamano}": cantidad for tamano, cantidad in sorted(self._tamanos.items())},
+            'latencia_ms': {
+                'media': statistics.fmean(latencias) * 1000 if latencias else None,
+                'p50': percentil(0.50),
+                'p90': percentil(0.90),
+                'p99': percentil(0.99),
+            },
+        }
+
+class AgrupadorPredicciones:
+    """Agrupa predicciones concurrentes en micro-lotes por tiempo o por tamaño."""
+    
+    def __init__(self, calculadora, ventana_ms=VENTANA_MS, lote_maximo=LOTE_MAXIMO):
+        self.calculadora = calculadora
+        self.ventana = ventana_ms / 1000
+        self.lote_maximo = lote_maximo
+        self.estadisticas = EstadisticasServidor()
+        self._cola = asyncio.Queue()
+        self._tarea = None
+    
+    def iniciar(self):
+        self._tarea = asyncio.get_running_loop().create_task(self._bucle())
+    
+    async def detener(self):
+        if self._tarea is not None:
+            self._tarea.cancel()
+            try:
+                await self._tarea
+            except asyncio.CancelledError:
+                pass
+    
+    async def predecir(self, altura, peso):
+        """Encola una predicción y espera el resultado de su lote."""
+        futuro = asyncio.get_running_loop().create_future()
+        self._cola.put_nowait((altura, peso, time.perf_counter(), futuro))
+        return await futuro
+    
+    async def _bucle(self):
+        while True:
+            lote = [await self._cola.get()]
+            
+            # Se espera la ventana solo si el lote aún no está lleno
+            if self._cola.qsize() < self.lote_maximo - 1:
+                await asyncio.sleep(self.ventana)
+            while len(lote) < self.lote_maximo and not self._cola.empty():
+                lote.append(self._cola.get_nowait())
+            
+            self._procesar(lote)
+    
+    def _procesar(self, lote):
+        alturas = np.fromiter((p[0] for p in lote), dtype=np.float64, count=len(lote))
+        pesos = np.fromiter((p[1] for p in lote), dtype=np.float64, count=len(lote))
+        
+        try:
+            resultado, mensaje = self.calculadora.predecir_imc_lote(alturas, pesos)
+        except Exception as e:
+            resultado, mensaje = None, f"Error durante la predicción: {e}"
+        
+        if resultado is None:
+            for *_, futuro in lote:
+                if not futuro.done():
+                    futuro.set_exception(RuntimeError(mensaje))
+            return
+        
+        ahora = time.perf_counter()
+        for (_, _, inicio, futuro), fila in zip(lote, resultado.tolist()):
+            imc_ml, imc_real, diferencia, clase_ml, clase_real, valido = fila
+            if futuro.done():
+                continue
+            if valido:
+                futuro.set_result({
+                    'imc_ml': imc_ml,
+                    'imc_real': imc_real,
+                    'diferencia': diferencia,
+                    'clasificacion_ml': CLASIFICACIONES_IMC[clase_ml],
+                    'clasificacion_real': CLASIFICACIONES_IMC[clase_real],
+                })
+            else:
+                futuro.set_result({'error': "Valores fuera de rango válido."})
+        
+        self.estadisticas.registrar_lote(len(lote), [ahora - p[2] for p in lote])
+
+class ServidorIMC:
+    """Servidor HTTP/1.1 mínimo que expone las predicciones de una calculadora."""
+    
+    def __init__(self, calculadora, ventana_ms=VENTANA_MS, lote_maximo=LOTE_MAXIMO):
+        self.calculadora = calculadora
+        self.agrupador = AgrupadorPredicciones(calculadora, ventana_ms, lote_maximo)
+        self._servidor = None
+    
+    async def iniciar(self, host='127.0.0.1', puerto=8080):
+        """Empieza a escuchar; con puerto 0 se elige uno libre (ver `puerto`)."""
+        self.agrupador.iniciar()
+        self._servidor = await asyncio.start_server(self._atender, host, puerto)
+        return self._servidor
+    
+    @property
+    def puerto(self):
+        return self._servidor.sockets[0].getsockname()[1]
+    
+    async def detener(self):
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        await self.agrupador.detener()
+    
+    async def _atender(self, lector, escritor):
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                
+                try:
+                    metodo, ruta, version = linea.decode('latin-1').split()
+                except ValueError:
+                    await self._responder(escritor, HTTPStatus.BAD_REQUEST, {'error': "Petición mal formada."}, True)
+                    break
+                
+                cabeceras = {}
+                while True:
+                    linea = await lector.readline()
+                    if linea in (b'\r\n', b'\n', b''):
+                        break
+                    clave, _, valor = linea.decode('latin-1').partition(':')
+                    cabeceras[clave.strip().lower()] = valor.strip()
+                
+                try:
+                    longitud = int(cabeceras.get('content-length') or 0)
+                except ValueError:
+                    longitud = -1
+                if longitud < 0:
+                    await self._responder(escritor, HTTPStatus.BAD_REQUEST,
+                                          {'error': "Content-Length no válido."}, True)
+                    break
+                if longitud > TAM_MAXIMO_CUERPO:
+                    await self._responder(escritor, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                          {'error': "Cuerpo demasiado grande."}, True)
+                    break
+                cuerpo = await lector.readexactly(longitud) if longitud else b''
+                
+                estado, respuesta = await self._despachar(metodo, ruta, cuerpo)
+                cerrar = version == 'HTTP/1.0' or cabeceras.get('connection', '').lower() == 'close'
+                await self._responder(escritor, estado, respuesta, cerrar)
+                if cerrar:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+    
+    async def _responder(self, escritor, estado, respuesta, cerrar):
+        datos = json.dumps(respuesta).encode('utf-8')
+        cabecera = (f"HTTP/1.1 {estado.value} {estado.phrase}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(datos)}\r\n")
+        if cerrar:
+            cabecera += "Connection: close\r\n"
+        escritor.write(cabecera.encode('latin-1') + b"\r\n" + datos)
+        await escritor.drain()
+    
+    async def _despachar(self, metodo, ruta, cuerpo):
+        if metodo == 'GET' and ruta == '/salud':
+            return HTTPStatus.OK, {'estado': 'ok', 'entrenado': self.calculadora.is_trained}
+        if metodo == 'GET' and ruta == '/estadisticas':
+            estadisticas = self.agrupador.estadisticas.resumen()
+            if self.calculadora.cache is not None:
+                estadisticas['cache'] = self.calculadora.cache.estadisticas()
+            return HTTPStatus.OK, estadisticas
+        if ruta != '/predecir':
+            return HTTPStatus.NOT_FOUND, {'error': f"Ruta desconocida: {ruta}"}
+        if metodo != 'POST':
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': "Use POST en /predecir."}
+        if not self.calculadora.is_trained:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {'error': "El modelo debe ser entrenado primero."}
+        
+        try:
+            datos = json.loads(cuerpo)
+            registros = datos if isinstance(datos, list) else [datos]
+            pares = [(float(r['altura']), float(r['peso'])) for r in registros]
+        except (ValueError, TypeError, KeyError):
+            return HTTPStatus.BAD_REQUEST, {'error': "Se espera {\"altura\": ..., \"peso\": ...} o una lista."}
+        
+        try:
+            resultados = await asyncio.gather(*(self.agrupador.predecir(a, p) for a, p in pares))
+        except RuntimeError as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)}
+        return HTTPStatus.OK, resultados if isinstance(datos, list) else resultados[0]
+
+async def servir(calculadora, host, puerto, ventana_ms, lote_maximo):
+    servidor = ServidorIMC(calculadora, ventana_ms, lote_maximo)
+    await servidor.iniciar(host, puerto)
+    print(f"Sirviendo en http://{host}:{servidor.puerto}", file=sys.stderr)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await servidor.detener()
+
+def main(argv=None):
+    """Función principal del servidor."""
+    parser = argparse.ArgumentParser(description="Servidor local de inferencia de IMC.")
+    parser.add_argument('-m', '--modelo', required=True, help="modelo .imcml entrenado")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8080)
+    parser.add_argument('--ventana-ms', type=float, default=VENTANA_MS,
+                        help="tiempo máximo de espera para completar un lote")
+    parser.add_argument('--lote-maximo', type=int, default=LOTE_MAXIMO)
+    parser.add_argument('--cache', type=int, metavar='ENTRADAS',
+                        help="activar la caché de predicciones con este número de entradas")
+    args = parser.parse_args(argv)
+    
+    try:
+        calculadora = BMIMLCalculator.desde_archivo(args.modelo)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    if args.cache is not None:
+        exito, mensaje = calculadora.activar_cache(args.cache)
+        if not exito:
+            print(f"Error: {mensaje}", file=sys.stderr)
+            return 1
+    
+    try:
+        asyncio.run(servir(calculadora, args.host, args.puerto, args.ventana_ms, args.lote_maximo))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+import os
+import sys
+
+import pytest
+
+# Los módulos viven en la raíz del repositorio, sin paquete instalable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from referencia import generar_datos
+
+@pytest.fixture
+def datos():
+    return generar_datos(2_000)
@@ -0,0 +1,32 @@
+# Utilidades compartidas por las pruebas: datos sintéticos y estadísticas de
+# referencia calculadas sin fórmulas incrementales.
+
+import numpy as np
+import pytest
+
+from calculadora_imc import COLUMNAS_ESTADISTICAS, EstadisticasSuficientes, _columnas_estadisticas
+
+def generar_datos(n, semilla=0):
+    """Alturas y pesos plausibles con algo de ruido."""
+    generador = np.random.default_rng(semilla)
+    alturas = generador.uniform(1.45, 2.05, n)
+    pesos = generador.normal(24.0, 4.0, n).clip(14.0, 45.0) * alturas ** 2
+    return alturas, pesos
+
+def estadisticas_referencia(alturas, pesos, pesos_filas=None):
+    """Estadísticas de las seis columnas calculadas directamente, sin fórmulas incrementales."""
+    imcs = pesos / alturas ** 2
+    datos = np.column_stack(_columnas_estadisticas(alturas, pesos, imcs))
+    w = np.ones(len(datos)) if pesos_filas is None else np.asarray(pesos_filas, dtype=np.float64)
+    referencia = EstadisticasSuficientes(len(COLUMNAS_ESTADISTICAS))
+    referencia.n = w.sum()
+    referencia.media = (w[:, None] * datos).sum(axis=0) / w.sum()
+    centrados = datos - referencia.media
+    referencia.comomentos = np.einsum('i,ij,ik->jk', w, centrados, centrados)
+    return referencia
+
+def comprobar_iguales(estadisticas, referencia, rtol=1e-9):
+    assert estadisticas.n == pytest.approx(referencia.n, rel=rtol)
+    np.testing.assert_allclose(estadisticas.media, referencia.media, rtol=rtol)
+    escala = max(np.abs(referencia.comomentos).max(), 1.0)
+    np.testing.assert_allclose(estadisticas.comomentos, referencia.comomentos, rtol=rtol, atol=rtol * escala)
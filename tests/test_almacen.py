@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from calculadora_imc import AlmacenColumnar, BMIMLCalculator
+
+def test_crece_conservando_las_filas():
+    almacen = AlmacenColumnar(capacidad=2)
+    for i in range(100):
+        almacen.agregar(1.0 + i, 50.0 + i, 20.0 + i)
+    almacen.agregar_lote(np.full(300, 2.0), np.full(300, 80.0), np.full(300, 20.0))
+    
+    assert len(almacen) == 400
+    assert almacen.capacidad >= 400
+    np.testing.assert_array_equal(almacen.altura[:100], 1.0 + np.arange(100))
+    np.testing.assert_array_equal(almacen.peso[100:], 80.0)
+
+def test_float32():
+    almacen = AlmacenColumnar(np.float32)
+    almacen.agregar_lote(np.array([1.7, 1.8]), np.array([70.0, 80.0]), np.array([24.2, 24.7]))
+    assert almacen.altura.dtype == np.float32
+    
+    calc = BMIMLCalculator(dtype=np.float32)
+    calc.agregar_datos_lote([1.6, 1.7], [60.0, 70.0])
+    assert calc.altura_data.dtype == np.float32
+
+def test_dtype_no_admitido():
+    with pytest.raises(ValueError):
+        AlmacenColumnar(np.int64)
+
+def test_vistas_de_solo_lectura():
+    almacen = AlmacenColumnar()
+    almacen.agregar(1.7, 70.0, 24.2)
+    for vista in (almacen.altura, almacen.peso, almacen.imc):
+        assert len(vista) == 1
+        with pytest.raises(ValueError):
+            vista[0] = 0.0
+
+def test_eliminar_desplaza_las_siguientes():
+    almacen = AlmacenColumnar()
+    almacen.agregar_lote(np.arange(5.0), np.arange(5.0) + 10, np.arange(5.0) + 20)
+    
+    assert almacen.eliminar(1) == (1.0, 11.0, 21.0)
+    assert almacen.eliminar(-1) == (4.0, 14.0, 24.0)
+    np.testing.assert_array_equal(almacen.altura, [0.0, 2.0, 3.0])
+    with pytest.raises(IndexError):
+        almacen.eliminar(3)
+
+def test_desde_columnas_no_copia():
+    alturas, pesos, imcs = np.arange(3.0), np.arange(3.0), np.arange(3.0)
+    almacen = AlmacenColumnar.desde_columnas(alturas, pesos, imcs)
+    assert np.shares_memory(almacen.altura, alturas)
+    
+    # Al crecer pasa a arreglos propios sin tocar los originales
+    almacen.agregar(9.0, 9.0, 9.0)
+    assert not np.shares_memory(almacen.altura, alturas)
+    np.testing.assert_array_equal(alturas, np.arange(3.0))
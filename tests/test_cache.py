@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+import cache_predicciones
+from calculadora_imc import BMIMLCalculator
+
+@pytest.fixture
+def entrenada(datos):
+    calc = BMIMLCalculator()
+    calc.agregar_bloque(*datos)
+    calc.entrenar_modelo()
+    return calc
+
+def test_cuantizar_lote_igual_a_escalar():
+    alturas = np.array([1.704, 1.706, 2.5])
+    pesos = np.array([70.04, 70.06, 120.0])
+    assert cache_predicciones.cuantizar_lote(alturas, pesos).tolist() == [
+        cache_predicciones.cuantizar(a, p) for a, p in zip(alturas.tolist(), pesos.tolist())]
+
+def test_lru_desaloja_la_menos_usada():
+    cache = cache_predicciones.CachePredicciones(capacidad=2)
+    cache.guardar(1, 1.0, 1.0, 'a')
+    cache.guardar(2, 2.0, 2.0, 'b')
+    assert cache.obtener(1, 1.0, 1.0) == 'a'
+    cache.guardar(3, 3.0, 3.0, 'c')
+    
+    assert cache.obtener(2, 2.0, 2.0) is None
+    assert cache.obtener(3, 3.0, 3.0) == 'c'
+    assert (cache.aciertos, cache.fallos, cache.desalojos) == (2, 1, 1)
+    
+    with pytest.raises(ValueError):
+        cache_predicciones.CachePredicciones(capacidad=0)
+
+def test_aciertos_fallos_y_valores_exactos(entrenada):
+    entrenada.activar_cache(16)
+    primera, _ = entrenada.predecir_imc(1.7, 70.0)
+    segunda, _ = entrenada.predecir_imc(1.7, 70.0)
+    # Misma celda (cm, 0.1 kg) pero otros valores: se calcula, no se sirve la entrada
+    vecina, _ = entrenada.predecir_imc(1.7001, 70.0)
+    
+    assert segunda == primera
+    assert (entrenada.cache.aciertos, entrenada.cache.fallos) == (1, 2)
+    
+    entrenada.desactivar_cache()
+    assert vecina == entrenada.predecir_imc(1.7001, 70.0)[0]
+
+def test_reentrenar_invalida(entrenada):
+    entrenada.activar_cache(16)
+    entrenada.predecir_imc(1.7, 70.0)
+    version = entrenada.cache.version
+    
+    entrenada.agregar_bloque(np.full(500, 1.9), np.full(500, 60.0))
+    entrenada.entrenar_modelo()
+    resultado, _ = entrenada.predecir_imc(1.7, 70.0)
+    
+    assert entrenada.cache.version != version
+    assert entrenada.cache.invalidaciones == 1
+    assert entrenada.cache.fallos == 2
+    entrenada.desactivar_cache()
+    assert resultado == entrenada.predecir_imc(1.7, 70.0)[0]
+
+def test_lote_con_cache_igual_a_sin_cache(entrenada, datos):
+    alturas, pesos = datos
+    # Repeticiones exactas, vecinas de la misma celda y filas fuera de rango
+    alturas = np.concatenate([alturas[:200], alturas[:200], alturas[:50] + 1e-6, [5.0, np.nan]])
+    pesos = np.concatenate([pesos[:200], pesos[:200], pesos[:50], [70.0, 70.0]])
+    sin_cache, _ = entrenada.predecir_imc_lote(alturas, pesos)
+    
+    entrenada.activar_cache()
+    con_cache, _ = entrenada.predecir_imc_lote(alturas, pesos)
+    otra_vez, _ = entrenada.predecir_imc_lote(alturas, pesos)
+    
+    for resultado in (con_cache, otra_vez):
+        np.testing.assert_array_equal(resultado['imc_ml'], sin_cache['imc_ml'])
+        np.testing.assert_array_equal(resultado['clase_ml'], sin_cache['clase_ml'])
+        np.testing.assert_array_equal(resultado['valido'], sin_cache['valido'])
+    assert entrenada.cache.estadisticas()['aciertos'] == len(entrenada.cache)
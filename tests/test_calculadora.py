@@ -0,0 +1,156 @@
+import math
+
+import numpy as np
+import pytest
+
+from calculadora_imc import BMIMLCalculator
+from referencia import comprobar_iguales, estadisticas_referencia, generar_datos
+
+@pytest.mark.parametrize("altura, peso", [
+    (math.nan, 70.0), (1.7, math.nan), (math.inf, 70.0), (0.0, 70.0), (1.7, -1.0), (3.5, 70.0),
+])
+def test_agregar_dato_rechaza_valores_no_validos(altura, peso):
+    calc = BMIMLCalculator()
+    exito, _ = calc.agregar_dato(altura, peso)
+    assert not exito
+    assert calc.num_datos_entrenamiento == 0
+
+def test_predecir_rechaza_nan(datos):
+    calc = BMIMLCalculator()
+    calc.agregar_bloque(*datos)
+    calc.entrenar_modelo()
+    resultado, _ = calc.predecir_imc(math.nan, 70.0)
+    assert resultado is None
+
+def test_agregar_y_eliminar_vuelve_al_estado_anterior(datos):
+    alturas, pesos = datos
+    calc = BMIMLCalculator()
+    calc.agregar_bloque(alturas[:1500], pesos[:1500])
+    for altura, peso in zip(alturas[1500:].tolist(), pesos[1500:].tolist()):
+        calc.agregar_dato(altura, peso)
+    for _ in range(500):
+        calc.eliminar_dato(-1)
+    
+    assert calc.num_datos_entrenamiento == 1500
+    comprobar_iguales(calc._estadisticas, estadisticas_referencia(alturas[:1500], pesos[:1500]), rtol=1e-8)
+
+def test_entrenar_sin_retener_datos(datos):
+    # El ajuste sale de las estadísticas: retener o no las filas da el mismo modelo
+    con_filas = BMIMLCalculator()
+    sin_filas = BMIMLCalculator(retener_datos=False)
+    for calc in (con_filas, sin_filas):
+        calc.agregar_bloque(*datos)
+        assert calc.entrenar_modelo()[0]
+    
+    assert len(sin_filas.altura_data) == 0
+    assert sin_filas.num_datos_entrenamiento == len(datos[0])
+    np.testing.assert_allclose(sin_filas.coeficientes, con_filas.coeficientes, rtol=1e-12)
+
+def _alimentar(calc, alturas, pesos):
+    """Mezcla bloques pequeños, filas sueltas y un bloque mayor que la ventana."""
+    calc.agregar_bloque(alturas[:150], pesos[:150])
+    for altura, peso in zip(alturas[150:400].tolist(), pesos[150:400].tolist()):
+        calc.agregar_dato(altura, peso)
+    calc.agregar_bloque(alturas[400:470], pesos[400:470])
+    calc.agregar_bloque(alturas[470:1200], pesos[470:1200])
+    calc.agregar_bloque(alturas[1200:1290], pesos[1200:1290])
+
+@pytest.mark.parametrize("vida_media", [None, 60.0])
+def test_ventana_igual_a_recalcular(datos, vida_media):
+    alturas, pesos = datos
+    calc = BMIMLCalculator()
+    calc.configurar_ventana(300, vida_media)
+    _alimentar(calc, alturas, pesos)
+    
+    assert calc.num_datos_entrenamiento == 300
+    np.testing.assert_array_equal(calc.altura_data, alturas[990:1290])
+    pesos_filas = None
+    if vida_media:
+        pesos_filas = 0.5 ** (np.arange(299, -1, -1) / vida_media)
+    comprobar_iguales(calc._estadisticas, estadisticas_referencia(alturas[990:1290], pesos[990:1290], pesos_filas),
+                      rtol=1e-8)
+
+def test_ventana_rechaza_calculadora_sin_filas(datos):
+    calc = BMIMLCalculator(retener_datos=False)
+    calc.agregar_bloque(*datos)
+    exito, mensaje = calc.configurar_ventana(300)
+    assert not exito
+    assert "retenidas" in mensaje
+    assert calc.tamano_ventana is None
+    assert not calc.retener_datos
+    assert calc.num_datos_entrenamiento == len(datos[0])
+
+def test_ventana_observa_el_peso_de_cada_fila(datos):
+    # El peso corporal que llega al evaluador no es el peso de decaimiento de la fila saliente
+    alturas, pesos = datos
+    calc = BMIMLCalculator()
+    calc.activar_evaluacion_online(1_000)
+    calc.configurar_ventana(50, 20.0)
+    for altura, peso in zip(alturas[:120].tolist(), pesos[:120].tolist()):
+        calc.agregar_dato(altura, peso)
+    calc.entrenar_modelo()
+    
+    assert calc.evaluacion_actual()['muestra'] == 50
+    np.testing.assert_array_equal(np.sort(calc.evaluador.muestra[:, 1]), np.sort(pesos[70:120]))
+
+def test_decaimiento_no_cambia_al_reconfigurar(datos):
+    alturas, pesos = datos
+    calc = BMIMLCalculator()
+    calc.configurar_ventana(300, 60.0)
+    _alimentar(calc, alturas, pesos)
+    calc.entrenar_modelo()
+    n, coeficientes = calc._estadisticas.n, calc.coeficientes
+    
+    calc.configurar_segmentos((1.5, 0.1, 5))
+    calc.desactivar_segmentos()
+    calc.entrenar_modelo()
+    assert calc._estadisticas.n == pytest.approx(n, rel=1e-12)
+    np.testing.assert_allclose(calc.coeficientes, coeficientes, rtol=1e-8)
+
+def test_segmentos_igual_a_un_modelo_por_segmento():
+    alturas, pesos = generar_datos(4_000)
+    calc = BMIMLCalculator(motor='minimos_cuadrados')
+    calc.agregar_bloque(alturas[:1000], pesos[:1000])
+    calc.configurar_segmentos((1.5, 0.1, 5), (50.0, 25.0, 3))
+    calc.agregar_bloque(alturas[1000:], pesos[1000:])
+    calc.eliminar_dato(10)
+    exito, _ = calc.entrenar_modelo()
+    assert exito
+    
+    alturas, pesos = calc.altura_data, calc.peso_data
+    segmentos = calc.segmentacion.indice(alturas, pesos)
+    for g in np.unique(segmentos):
+        seleccion = segmentos == g
+        comprobar_iguales(calc._segmentos.grupo(g), estadisticas_referencia(alturas[seleccion], pesos[seleccion]),
+                          rtol=1e-8)
+        if seleccion.sum() < calc.motor.FILAS_MINIMAS:
+            continue
+        
+        # Predecir con el modelo segmentado equivale a ajustar solo las filas del segmento
+        unico = BMIMLCalculator(motor='minimos_cuadrados')
+        unico.agregar_bloque(alturas[seleccion], pesos[seleccion])
+        unico.entrenar_modelo()
+        altura, peso = float(alturas[seleccion][0]), float(pesos[seleccion][0])
+        assert calc.predecir_imc(altura, peso)[0]['imc_ml'] == pytest.approx(
+            unico.predecir_imc(altura, peso)[0]['imc_ml'], rel=1e-9)
+
+def test_segmentos_pocas_filas_usan_el_modelo_global():
+    alturas, pesos = generar_datos(1_000)
+    calc = BMIMLCalculator(motor='minimos_cuadrados')
+    calc.agregar_bloque(alturas, pesos)
+    calc.agregar_bloque(np.full(3, 2.5), np.full(3, 150.0))
+    # El último tramo de altura solo tiene las tres filas añadidas
+    calc.configurar_segmentos((1.0, 0.5, 4))
+    assert calc.entrenar_modelo()[0]
+    
+    global_ = BMIMLCalculator(motor='minimos_cuadrados')
+    global_.agregar_bloque(calc.altura_data, calc.peso_data)
+    global_.entrenar_modelo()
+    assert calc.predecir_imc(2.5, 150.0)[0]['imc_ml'] == pytest.approx(
+        global_.predecir_imc(2.5, 150.0)[0]['imc_ml'], rel=1e-9)
+
+def test_segmentos_rechazan_calculadora_sin_filas(datos):
+    calc = BMIMLCalculator(retener_datos=False)
+    calc.agregar_bloque(*datos)
+    assert not calc.configurar_segmentos((1.5, 0.1, 5))[0]
+    assert calc.segmentacion is None
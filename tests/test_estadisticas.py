@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from calculadora_imc import EstadisticasGrupos, EstadisticasSuficientes, _columnas_estadisticas
+from referencia import comprobar_iguales, estadisticas_referencia, generar_datos
+
+def _columnas(alturas, pesos):
+    return _columnas_estadisticas(alturas, pesos, pesos / alturas ** 2)
+
+def test_desde_columnas_igual_a_referencia(datos):
+    comprobar_iguales(EstadisticasSuficientes.desde_columnas(*_columnas(*datos)), estadisticas_referencia(*datos))
+
+def test_desde_columnas_con_pesos(datos):
+    pesos_filas = np.random.default_rng(1).uniform(0.1, 2.0, len(datos[0]))
+    estadisticas = EstadisticasSuficientes.desde_columnas(*_columnas(*datos), pesos=pesos_filas)
+    comprobar_iguales(estadisticas, estadisticas_referencia(*datos, pesos_filas))
+
+def test_welford_igual_a_lote(datos):
+    estadisticas = EstadisticasSuficientes(6)
+    for fila in np.column_stack(_columnas(*datos)):
+        estadisticas.actualizar(fila)
+    comprobar_iguales(estadisticas, estadisticas_referencia(*datos))
+
+def test_combinar_y_restar(datos):
+    alturas, pesos = datos
+    a = EstadisticasSuficientes.desde_columnas(*_columnas(alturas[:700], pesos[:700]))
+    b = EstadisticasSuficientes.desde_columnas(*_columnas(alturas[700:], pesos[700:]))
+    comprobar_iguales(a + b, estadisticas_referencia(alturas, pesos))
+    comprobar_iguales((a + b) - b, estadisticas_referencia(alturas[:700], pesos[:700]))
+    
+    vacia = EstadisticasSuficientes(6)
+    comprobar_iguales(vacia + a, a)
+    comprobar_iguales(a - vacia, a)
+
+def test_eliminar_deshace_actualizar(datos):
+    alturas, pesos = datos
+    estadisticas = EstadisticasSuficientes.desde_columnas(*_columnas(alturas, pesos))
+    for fila in np.column_stack(_columnas(alturas[-50:], pesos[-50:]))[::-1]:
+        estadisticas.eliminar(fila)
+    assert estadisticas.n == len(alturas) - 50
+    comprobar_iguales(estadisticas, estadisticas_referencia(alturas[:-50], pesos[:-50]), rtol=1e-8)
+
+def test_eliminar_hasta_vaciar():
+    estadisticas = EstadisticasSuficientes(6)
+    fila = _columnas(np.array([1.7]), np.array([70.0]))
+    estadisticas.actualizar([c[0] for c in fila])
+    estadisticas.eliminar([c[0] for c in fila])
+    assert estadisticas.n == 0
+    assert not estadisticas.comomentos.any()
+    with pytest.raises(ValueError):
+        estadisticas.eliminar([c[0] for c in fila])
+
+def test_atenuar_equivale_a_pesos(datos):
+    alturas, pesos = datos
+    estadisticas = EstadisticasSuficientes.desde_columnas(*_columnas(alturas, pesos)).atenuar(0.5)
+    comprobar_iguales(estadisticas, estadisticas_referencia(alturas, pesos, np.full(len(alturas), 0.5)))
+
+def test_grupos_igual_a_referencia_por_grupo():
+    alturas, pesos = generar_datos(3_000)
+    grupos = np.random.default_rng(2).integers(0, 7, len(alturas))
+    grupos[grupos == 5] = 4  # el grupo 5 queda vacío
+    por_grupo = EstadisticasGrupos.desde_columnas(grupos, 7, *_columnas(alturas, pesos))
+    
+    for g in range(7):
+        if g == 5:
+            assert por_grupo.n[g] == 0
+            continue
+        comprobar_iguales(por_grupo.grupo(g), estadisticas_referencia(alturas[grupos == g], pesos[grupos == g]))
+    comprobar_iguales(por_grupo.total(), estadisticas_referencia(alturas, pesos))
+
+def test_grupos_combinar_y_restar():
+    alturas, pesos = generar_datos(3_000)
+    grupos = np.random.default_rng(3).integers(0, 4, len(alturas))
+    primera = EstadisticasGrupos.desde_columnas(grupos[:1000], 4, *_columnas(alturas[:1000], pesos[:1000]))
+    resto = EstadisticasGrupos.desde_columnas(grupos[1000:], 4, *_columnas(alturas[1000:], pesos[1000:]))
+    
+    primera.combinar(resto)
+    for g in range(4):
+        comprobar_iguales(primera.grupo(g), estadisticas_referencia(alturas[grupos == g], pesos[grupos == g]))
+    
+    primera.restar(resto)
+    for g in range(4):
+        seleccion = grupos[:1000] == g
+        comprobar_iguales(primera.grupo(g), estadisticas_referencia(alturas[:1000][seleccion], pesos[:1000][seleccion]),
+                          rtol=1e-8)
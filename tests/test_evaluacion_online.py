@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+import evaluacion_online
+from calculadora_imc import BMIMLCalculator
+
+def _errores(calc, alturas, pesos):
+    return pesos / alturas ** 2 - calc.modelo.predecir(alturas, pesos)
+
+def _calculadora(alturas, pesos, tam_muestra, motor='minimos_cuadrados'):
+    calc = BMIMLCalculator(motor=motor)
+    calc.activar_evaluacion_online(tam_muestra)
+    calc.agregar_bloque(alturas, pesos)
+    calc.entrenar_modelo()
+    return calc
+
+@pytest.mark.parametrize("motor", ['minimos_cuadrados', 'logaritmico'])
+def test_muestra_completa_es_exacta(datos, motor):
+    alturas, pesos = datos
+    calc = _calculadora(alturas, pesos, tam_muestra=len(alturas), motor=motor)
+    errores = _errores(calc, alturas, pesos)
+    imcs = pesos / alturas ** 2
+    
+    resultado = calc.evaluacion_actual()
+    assert resultado['exacto']
+    assert resultado['mae'] == pytest.approx(np.abs(errores).mean(), rel=1e-10)
+    assert resultado['mse'] == pytest.approx((errores ** 2).mean(), rel=1e-8)
+    assert resultado['r2'] == pytest.approx(1 - (errores ** 2).sum() / ((imcs - imcs.mean()) ** 2).sum(), rel=1e-8)
+    assert (calc.mae, calc.mse) == pytest.approx((resultado['mae'], resultado['mse']), rel=1e-8)
+    assert resultado['frecuencias'].sum() == pytest.approx(len(alturas))
+
+def test_filas_nuevas_se_suman_exactas(datos):
+    alturas, pesos = datos
+    calc = _calculadora(alturas[:1500], pesos[:1500], tam_muestra=len(alturas))
+    calc.evaluacion_actual()
+    for altura, peso in zip(alturas[1500:].tolist(), pesos[1500:].tolist()):
+        calc.agregar_dato(altura, peso)
+    
+    errores = _errores(calc, alturas, pesos)
+    resultado = calc.evaluacion_actual()
+    assert resultado['n'] == len(alturas)
+    assert resultado['mae'] == pytest.approx(np.abs(errores).mean(), rel=1e-10)
+    assert resultado['mse'] == pytest.approx((errores ** 2).mean(), rel=1e-8)
+
+def test_muestra_parcial_mse_exacto_mae_estimado(datos):
+    alturas, pesos = datos
+    calc = _calculadora(alturas, pesos, tam_muestra=500)
+    errores = _errores(calc, alturas, pesos)
+    
+    resultado = calc.evaluacion_actual()
+    assert not resultado['exacto']
+    assert resultado['mse_exacto']
+    assert resultado['muestra'] == 500
+    assert resultado['mse'] == pytest.approx((errores ** 2).mean(), rel=1e-8)
+    assert resultado['mae'] == pytest.approx(np.abs(errores).mean(), rel=0.1)
+
+def test_cuantiles_con_error_relativo_acotado():
+    valores = np.random.default_rng(1).exponential(2.0, 20_000)
+    bosquejo = evaluacion_online.BosquejoCuantiles(precision=0.01)
+    bosquejo.actualizar(valores[:12_000])
+    otro = evaluacion_online.BosquejoCuantiles(precision=0.01)
+    otro.actualizar(valores[12_000:])
+    bosquejo.combinar(otro)
+    
+    assert bosquejo.total == len(valores)
+    for q in evaluacion_online.CUANTILES:
+        assert bosquejo.cuantil(q) == pytest.approx(np.quantile(valores, q), rel=0.02)
+    assert np.isnan(evaluacion_online.BosquejoCuantiles().cuantil(0.5))
+
+def test_histograma_acumula_el_exceso_en_el_ultimo_bin():
+    histograma = evaluacion_online.HistogramaErrores(limite=10.0, bins=5)
+    histograma.actualizar(np.array([0.5, 2.5, 9.9, 50.0]))
+    np.testing.assert_array_equal(histograma.frecuencias, [1, 1, 0, 0, 2])
+    frecuencias, bordes = histograma.recortado()
+    assert len(bordes) == len(frecuencias) + 1
+
+def test_sin_activar_o_sin_entrenar():
+    calc = BMIMLCalculator()
+    assert calc.evaluacion_actual() is None
+    calc.activar_evaluacion_online()
+    assert calc.evaluacion_actual() is None
+    assert not calc.activar_evaluacion_online(0)[0]
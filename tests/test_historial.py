@@ -0,0 +1,79 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from calculadora_imc import BMIMLCalculator, InstantaneaModelo
+
+@pytest.fixture
+def entrenada(datos):
+    calc = BMIMLCalculator(motor='minimos_cuadrados')
+    calc.agregar_bloque(*datos)
+    calc.entrenar_modelo()
+    return calc
+
+def test_instantanea_inmutable(entrenada):
+    modelo = entrenada.modelo
+    with pytest.raises(AttributeError):
+        modelo.coeficientes = (0.0, 0.0, 0.0)
+    with pytest.raises(AttributeError):
+        del modelo.version
+    
+    copia = pickle.loads(pickle.dumps(modelo))
+    assert isinstance(copia, InstantaneaModelo)
+    assert (copia.coeficientes, copia.version, copia.entrenado) == (modelo.coeficientes, modelo.version, True)
+
+def test_reentrenar_no_altera_la_instantanea_publicada(entrenada):
+    anterior = entrenada.modelo
+    coeficientes = anterior.coeficientes
+    entrenada.agregar_bloque(np.full(500, 1.9), np.full(500, 60.0))
+    entrenada.entrenar_modelo()
+    
+    assert entrenada.modelo is not anterior
+    assert entrenada.version_modelo > anterior.version
+    assert anterior.coeficientes == coeficientes
+
+def test_revertir_al_modelo_anterior(entrenada):
+    primero = entrenada.modelo
+    entrenada.agregar_bloque(np.full(500, 1.9), np.full(500, 60.0))
+    entrenada.entrenar_modelo()
+    
+    assert entrenada.revertir_modelo()[0]
+    assert entrenada.modelo is primero
+    assert not entrenada.revertir_modelo()[0]
+
+@pytest.mark.parametrize("cambiar", [
+    lambda calc: calc.seleccionar_motor('logaritmico'),
+    lambda calc: calc.configurar_segmentos((1.5, 0.1, 5)),
+])
+def test_revertir_salta_modelos_sin_entrenar(entrenada, cambiar):
+    # Cambiar de motor o de segmentos publica un modelo sin entrenar que no entra en el historial
+    primero = entrenada.modelo
+    prediccion, _ = entrenada.predecir_imc(1.7, 70.0)
+    assert cambiar(entrenada)[0]
+    assert entrenada.entrenar_modelo()[0]
+    
+    exito, mensaje = entrenada.revertir_modelo()
+    assert exito, mensaje
+    assert entrenada.modelo is primero
+    assert entrenada.motor is primero.motor
+    assert entrenada.segmentacion is None
+    assert entrenada.predecir_imc(1.7, 70.0)[0] == prediccion
+    assert not entrenada.revertir_modelo()[0]
+
+def test_revertir_sin_reentrenar_vuelve_al_entrenado(entrenada):
+    primero = entrenada.modelo
+    entrenada.seleccionar_motor('logaritmico')
+    assert not entrenada.is_trained
+    
+    assert entrenada.revertir_modelo()[0]
+    assert entrenada.modelo is primero
+    assert entrenada.is_trained
+
+def test_historial_acotado(entrenada):
+    for _ in range(BMIMLCalculator.HISTORIAL_MODELOS + 3):
+        entrenada.entrenar_modelo()
+    revertidos = 0
+    while entrenada.revertir_modelo()[0]:
+        revertidos += 1
+    assert revertidos == BMIMLCalculator.HISTORIAL_MODELOS
@@ -0,0 +1,87 @@
+import io
+
+import numpy as np
+import pytest
+
+import importador
+from calculadora_imc import BMIMLCalculator
+
+def _csv(tmp_path, texto, nombre="datos.csv"):
+    ruta = tmp_path / nombre
+    ruta.write_text(texto, encoding='utf-8')
+    return str(ruta)
+
+def test_csv_por_bloques_con_encabezado(tmp_path):
+    filas = [(1.5 + i / 1000, 50.0 + i / 10) for i in range(250)]
+    ruta = _csv(tmp_path, "altura,peso\n" + "".join(f"{a},{p}\n" for a, p in filas))
+    
+    bloques = list(importador.leer_bloques_csv(ruta, tam_bloque=100))
+    assert [len(alturas) for alturas, *_ in bloques] == [100, 100, 50]
+    assert bloques[-1][3] == 1.0
+    np.testing.assert_array_equal(np.concatenate([b[0] for b in bloques]), [a for a, _ in filas])
+    
+    calc = BMIMLCalculator()
+    resumen = importador.importar_csv(calc, ruta, tam_bloque=100)
+    assert (resumen.aceptadas, resumen.rechazadas, resumen.bloques) == (250, 0, 3)
+    assert calc.num_datos_entrenamiento == 250
+
+def test_filas_ilegibles_y_fuera_de_rango(tmp_path):
+    ruta = _csv(tmp_path, "altura,peso\n1.7,70\nabc,3\n\n1.8\n9.0,70\n1.6,55\n")
+    resumen = importador.importar_csv(BMIMLCalculator(), ruta)
+    assert resumen.aceptadas == 2
+    assert resumen.ilegibles == 2
+    assert resumen.rechazadas == 3
+
+@pytest.mark.parametrize("primera, ilegibles", [("altura,peso\n", 0), ("abc,3\n", 1), ("1.7,x\n", 1)])
+def test_primera_linea(primera, ilegibles):
+    # Solo es encabezado si ningún campo es numérico; si no, es una fila mal formada
+    bloques = list(importador.leer_bloques_texto(io.StringIO(primera + "1.7,70\n1.8,80\n")))
+    alturas, _, contadas, avance = bloques[0]
+    np.testing.assert_array_equal(alturas, [1.7, 1.8])
+    assert contadas == ilegibles
+    assert avance is None
+
+def test_delimitador_y_columnas(tmp_path):
+    ruta = _csv(tmp_path, "id;peso;altura\n1;70;1.7\n2;80;1.8\n")
+    (alturas, pesos, _, _), = importador.leer_bloques_csv(ruta, delimitador=';', columnas=(2, 1))
+    np.testing.assert_array_equal(alturas, [1.7, 1.8])
+    np.testing.assert_array_equal(pesos, [70.0, 80.0])
+
+def test_npy_una_matriz_o_dos_columnas(tmp_path, datos):
+    alturas, pesos = datos
+    np.save(tmp_path / "matriz.npy", np.column_stack([alturas, pesos]))
+    np.save(tmp_path / "alturas.npy", alturas)
+    np.save(tmp_path / "pesos.npy", pesos)
+    
+    una = BMIMLCalculator()
+    resumen = importador.importar_npy(una, str(tmp_path / "matriz.npy"), tam_bloque=300)
+    assert resumen.aceptadas == len(alturas)
+    assert resumen.bloques == -(-len(alturas) // 300)
+    
+    dos = BMIMLCalculator()
+    importador.importar_npy(dos, str(tmp_path / "alturas.npy"), str(tmp_path / "pesos.npy"))
+    np.testing.assert_array_equal(una.altura_data, dos.altura_data)
+    np.testing.assert_array_equal(una.peso_data, pesos)
+    
+    np.save(tmp_path / "mala.npy", np.zeros((4, 3)))
+    with pytest.raises(ValueError):
+        importador.importar_npy(BMIMLCalculator(), str(tmp_path / "mala.npy"))
+
+def test_binario_sin_cabecera(tmp_path, datos):
+    alturas, pesos = datos
+    alturas.astype(np.float32).tofile(tmp_path / "alturas.bin")
+    pesos.astype(np.float32).tofile(tmp_path / "pesos.bin")
+    
+    calc = BMIMLCalculator()
+    resumen = importador.importar_binario(calc, str(tmp_path / "alturas.bin"), str(tmp_path / "pesos.bin"),
+                                          dtype=np.float32)
+    assert resumen.aceptadas == len(alturas)
+    np.testing.assert_allclose(calc.altura_data, alturas, rtol=1e-7)
+
+def test_columnas_de_distinta_longitud():
+    with pytest.raises(ValueError):
+        list(importador.leer_bloques_columnas(np.zeros(3), np.zeros(4)))
+
+def test_extension_no_soportada(tmp_path):
+    with pytest.raises(ValueError):
+        importador.importar_archivo(BMIMLCalculator(), str(tmp_path / "datos.xlsx"))
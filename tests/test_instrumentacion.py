@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+import instrumentacion
+from calculadora_imc import BMIMLCalculator
+
+@pytest.fixture(autouse=True)
+def instrumentacion_limpia():
+    estado = instrumentacion.activa()
+    instrumentacion.reiniciar()
+    yield
+    instrumentacion.activar(estado)
+    instrumentacion.reiniciar()
+
+def _sesion(datos):
+    calc = BMIMLCalculator()
+    calc.agregar_bloque(*datos)
+    for _ in range(3):
+        calc.agregar_dato(1.7, 70.0)
+    calc.entrenar_modelo()
+    calc.predecir_imc(1.7, 70.0)
+    return calc
+
+def test_desactivada_no_registra(datos):
+    instrumentacion.activar(False)
+    _sesion(datos)
+    assert instrumentacion.resumen() == {}
+    assert instrumentacion.texto_resumen() == "Instrumentación desactivada"
+
+def test_contadores_por_etapa(datos):
+    instrumentacion.activar()
+    calc = _sesion(datos)
+    etapas = instrumentacion.resumen()
+    
+    assert etapas['agregar_dato']['llamadas'] == 3
+    assert etapas['agregar_dato']['filas'] == 3
+    assert etapas['entrenar_modelo']['llamadas'] == 1
+    assert etapas['entrenar_modelo']['filas'] == calc.num_datos_entrenamiento
+    assert etapas['predecir_imc']['llamadas'] == 1
+    assert etapas['predecir_imc']['p50_ms'] <= etapas['predecir_imc']['p99_ms']
+    
+    instrumentacion.activar(False)
+    calc.predecir_imc(1.7, 70.0)
+    assert instrumentacion.resumen()['predecir_imc']['llamadas'] == 1
+
+def test_registrar_y_percentiles():
+    instrumentacion.activar()
+    for milisegundos in range(1, 101):
+        instrumentacion.registrar('etapa', milisegundos / 1000, filas=2)
+    medidas = instrumentacion.resumen()['etapa']
+    assert medidas['llamadas'] == 100
+    assert medidas['filas'] == 200
+    assert medidas['total_ms'] == pytest.approx(5050.0)
+    assert medidas['p50_ms'] == pytest.approx(51.0)
+    assert medidas['p99_ms'] == pytest.approx(100.0)
+
+def test_exportar_json(tmp_path):
+    instrumentacion.activar()
+    instrumentacion.registrar('etapa', 0.002)
+    ruta = tmp_path / "medidas.json"
+    instrumentacion.exportar_json(str(ruta))
+    
+    contenido = json.loads(ruta.read_text(encoding='utf-8'))
+    assert contenido['activa'] is True
+    assert contenido['etapas']['etapa']['llamadas'] == 1
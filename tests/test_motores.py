@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from calculadora_imc import MOTORES, BMIMLCalculator, EstadisticasSuficientes, _columnas_estadisticas, crear_motor
+from referencia import generar_datos
+
+def test_minimos_cuadrados_igual_a_lstsq(datos):
+    alturas, pesos = datos
+    calc = BMIMLCalculator(motor='minimos_cuadrados')
+    calc.agregar_bloque(alturas, pesos)
+    exito, _ = calc.entrenar_modelo()
+    assert exito
+    
+    diseno = np.column_stack([alturas, pesos, np.ones_like(alturas)])
+    esperado = np.linalg.lstsq(diseno, pesos / alturas ** 2, rcond=None)[0]
+    np.testing.assert_allclose(calc.coeficientes, esperado, rtol=1e-8)
+
+def test_logaritmico_exacto_con_pocos_puntos():
+    # log(IMC) = log(peso) - 2 log(altura): basta con un puñado de filas
+    calc = BMIMLCalculator(motor='logaritmico')
+    calc.agregar_datos_lote([1.60, 1.70, 1.80, 1.75], [55.0, 80.0, 70.0, 90.0])
+    calc.entrenar_modelo()
+    np.testing.assert_allclose(calc.coeficientes, (-2.0, 1.0, 0.0), atol=1e-9)
+    assert calc.mae < 1e-9
+    assert calc.ecuacion().startswith("log(IMC)")
+
+@pytest.mark.parametrize("nombre", ['correlacion', 'minimos_cuadrados'])
+def test_error_cuadratico_desde_estadisticas(nombre):
+    alturas, pesos = generar_datos(500)
+    imcs = pesos / alturas ** 2
+    motor = crear_motor(nombre)
+    estadisticas = EstadisticasSuficientes.desde_columnas(*_columnas_estadisticas(alturas, pesos, imcs))
+    coeficientes = motor.ajustar(estadisticas)
+    
+    sse = np.sum((motor.predecir(coeficientes, alturas, pesos) - imcs) ** 2)
+    assert motor.error_cuadratico(estadisticas, coeficientes) == pytest.approx(sse, rel=1e-9)
+
+def test_seleccionar_motor(datos):
+    calc = BMIMLCalculator()
+    calc.agregar_bloque(*datos)
+    for nombre in MOTORES:
+        assert calc.seleccionar_motor(nombre)[0]
+        assert not calc.is_trained
+        calc.entrenar_modelo()
+        assert calc.motor.nombre == nombre
+        assert calc.ecuacion() == calc.motor.ecuacion(calc.coeficientes)
+    
+    exito, _ = calc.seleccionar_motor('no_existe')
+    assert not exito
+    with pytest.raises(ValueError):
+        crear_motor('no_existe')
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+import paralelo
+from calculadora_imc import BMIMLCalculator
+
+def test_dividir_cubre_todas_las_filas():
+    assert paralelo.dividir(10, 4) == [(0, 4), (4, 8), (8, 10)]
+    assert paralelo.dividir(0, 4) == []
+
+def test_paralelo_igual_a_serie(datos, tmp_path):
+    alturas, pesos = datos
+    ruta = tmp_path / "datos.npy"
+    np.save(ruta, np.column_stack([alturas, pesos]))
+    
+    serie = BMIMLCalculator()
+    serie.agregar_bloque(alturas, pesos)
+    serie.entrenar_modelo()
+    
+    calc = BMIMLCalculator(retener_datos=False)
+    exito, _, resumen = paralelo.entrenar_paralelo(calc, str(ruta), procesos=2, tam_bloque=300)
+    assert exito
+    assert resumen.aceptadas == len(alturas)
+    assert resumen.bloques == len(paralelo.dividir(len(alturas), 300))
+    np.testing.assert_allclose(calc.coeficientes, serie.coeficientes, rtol=1e-10)
+    assert (calc.mae, calc.mse, calc.r2) == pytest.approx((serie.mae, serie.mse, serie.r2), rel=1e-9)
+
+@pytest.mark.parametrize("configurar", [
+    lambda calc: None,
+    lambda calc: calc.configurar_ventana(100),
+])
+def test_entrenar_paralelo_rechaza_calculadoras_con_filas(configurar, tmp_path):
+    calc = BMIMLCalculator()
+    configurar(calc)
+    with pytest.raises(ValueError):
+        paralelo.entrenar_paralelo(calc, str(tmp_path / "no_existe.npy"))
@@ -0,0 +1,124 @@
+import json
+import math
+import struct
+
+import numpy as np
+import pytest
+
+import persistencia
+from calculadora_imc import BMIMLCalculator
+from referencia import comprobar_iguales
+
+def _igual_prediccion(a, b, alturas, pesos):
+    np.testing.assert_array_equal(a.predecir_imc_lote(alturas, pesos)[0], b.predecir_imc_lote(alturas, pesos)[0])
+
+@pytest.mark.parametrize("motor", ['correlacion', 'minimos_cuadrados', 'logaritmico'])
+def test_ida_y_vuelta(datos, tmp_path, motor):
+    ruta = str(tmp_path / "modelo.imcml")
+    calc = BMIMLCalculator(motor=motor)
+    calc.agregar_bloque(*datos)
+    calc.entrenar_modelo()
+    assert calc.guardar_modelo(ruta)[0]
+    # Sin segmentos ni ventana se sigue escribiendo la versión 1 del formato
+    assert persistencia.cargar(ruta)[0]['version'] == 1
+    
+    cargada = BMIMLCalculator.desde_archivo(ruta)
+    assert cargada.motor.nombre == motor
+    assert (cargada.mae, cargada.mse, cargada.r2) == (calc.mae, calc.mse, calc.r2)
+    np.testing.assert_array_equal(cargada.altura_data, calc.altura_data)
+    comprobar_iguales(cargada._estadisticas, calc._estadisticas, rtol=1e-15)
+    _igual_prediccion(cargada, calc, *datos)
+
+def test_sin_datos(tmp_path):
+    ruta = str(tmp_path / "vacio.imcml")
+    assert BMIMLCalculator().guardar_modelo(ruta)[0]
+    cargada = BMIMLCalculator.desde_archivo(ruta)
+    assert cargada.num_datos_entrenamiento == 0
+    assert not cargada.is_trained
+
+def test_version_futura_se_rechaza(tmp_path):
+    ruta = str(tmp_path / "futuro.imcml")
+    persistencia.guardar(ruta, [np.zeros(3)] * 3, {}, version=persistencia.VERSION_FORMATO + 1)
+    exito, mensaje = BMIMLCalculator().cargar_modelo(ruta)
+    assert not exito
+    assert "Versión de formato" in mensaje
+
+def test_guardar_sobre_el_archivo_cargado(datos, tmp_path):
+    ruta = str(tmp_path / "modelo.imcml")
+    calc = BMIMLCalculator()
+    calc.agregar_bloque(*datos)
+    calc.entrenar_modelo()
+    calc.guardar_modelo(ruta)
+    
+    cargada = BMIMLCalculator.desde_archivo(ruta)
+    assert isinstance(cargada._almacen._altura, np.memmap)
+    assert cargada.guardar_modelo(ruta)[0]
+    assert not isinstance(cargada._almacen._altura, np.memmap)
+    assert not (tmp_path / "modelo.imcml.tmp").exists()
+    np.testing.assert_array_equal(BMIMLCalculator.desde_archivo(ruta).altura_data, datos[0])
+
+def test_cabecera_alineada(tmp_path):
+    ruta = str(tmp_path / "columnas.imcml")
+    columnas = [np.arange(5, dtype=np.float32) * i for i in range(3)]
+    persistencia.guardar(ruta, columnas, {'nota': 'á'})
+    with open(ruta, 'rb') as archivo:
+        assert archivo.read(len(persistencia.MAGIA)) == persistencia.MAGIA
+        longitud, = struct.unpack('<I', archivo.read(4))
+        assert json.loads(archivo.read(longitud))['nota'] == 'á'
+    
+    cabecera, leidas = persistencia.cargar(ruta)
+    assert cabecera['filas'] == 5
+    # Las columnas empiezan alineadas y van seguidas
+    assert leidas[0].offset % persistencia.ALINEACION == 0
+    for original, leida in zip(columnas, leidas):
+        np.testing.assert_array_equal(leida, original)
+
+def test_metricas_no_finitas_como_null(tmp_path):
+    # Sin filas retenidas ni datos para evaluar, las métricas quedan en NaN
+    ruta = str(tmp_path / "sin_metricas.imcml")
+    calc = BMIMLCalculator(retener_datos=False)
+    calc.agregar_datos_lote([1.6, 1.7, 1.8], [60.0, 70.0, 90.0])
+    calc.entrenar_modelo()
+    assert math.isnan(calc.mae)
+    calc.guardar_modelo(ruta)
+    
+    with open(ruta, 'rb') as archivo:
+        archivo.seek(len(persistencia.MAGIA))
+        longitud, = struct.unpack('<I', archivo.read(4))
+        cabecera = json.loads(archivo.read(longitud), parse_constant=pytest.fail)
+    assert cabecera['metricas'] == {'mae': None, 'mse': None, 'r2': None}
+    
+    cargada = BMIMLCalculator.desde_archivo(ruta)
+    assert math.isnan(cargada.mae)
+    assert cargada.predecir_imc(1.7, 70.0)[0] is not None
+
+def test_ventana_con_decaimiento_continua_igual(datos, tmp_path):
+    alturas, pesos = datos
+    ruta = str(tmp_path / "ventana.imcml")
+    calc = BMIMLCalculator()
+    calc.configurar_ventana(300, 50.0)
+    calc.agregar_bloque(alturas[:1000], pesos[:1000])
+    calc.guardar_modelo(ruta)
+    assert persistencia.cargar(ruta)[0]['version'] == 2
+    
+    cargada = BMIMLCalculator.desde_archivo(ruta)
+    for c in (calc, cargada):
+        c.agregar_bloque(alturas[1000:], pesos[1000:])
+        c.entrenar_modelo()
+    assert cargada.filas_descartadas == calc.filas_descartadas
+    comprobar_iguales(cargada._estadisticas, calc._estadisticas, rtol=1e-12)
+    np.testing.assert_allclose(cargada.coeficientes, calc.coeficientes, rtol=1e-12)
+
+def test_segmentado(datos, tmp_path):
+    ruta = str(tmp_path / "segmentado.imcml")
+    calc = BMIMLCalculator()
+    calc.agregar_bloque(*datos)
+    calc.configurar_segmentos((1.5, 0.1, 5), (50.0, 25.0, 3))
+    calc.entrenar_modelo()
+    calc.guardar_modelo(ruta)
+    assert persistencia.cargar(ruta)[0]['version'] == 2
+    
+    cargada = BMIMLCalculator.desde_archivo(ruta)
+    assert cargada.segmentacion == calc.segmentacion
+    np.testing.assert_array_equal(cargada._segmentos.n, calc._segmentos.n)
+    _igual_prediccion(cargada, calc, *datos)
@@ -0,0 +1,55 @@
+import math
+
+import numpy as np
+import pytest
+
+from calculadora_imc import (CLASE_INVALIDA, CLASIFICACIONES_IMC, BMIMLCalculator, DTYPE_PREDICCION,
+                             _mascara_rango_valido)
+
+@pytest.mark.parametrize("imc, clase", [
+    (18.4999, "Peso insuficiente"), (18.5, "Peso normal"), (24.9999, "Peso normal"), (25.0, "Sobrepeso"),
+    (29.9999, "Sobrepeso"), (30.0, "Obesidad"),
+])
+def test_clasificacion_en_los_umbrales(imc, clase):
+    calc = BMIMLCalculator()
+    assert calc.clasificar_imc(imc) == clase
+    assert CLASIFICACIONES_IMC[calc.clasificar_imc_lote(np.array([imc]))[0]] == clase
+
+def test_clasificar_lote_igual_a_escalar():
+    calc = BMIMLCalculator()
+    imcs = np.random.default_rng(0).uniform(10.0, 45.0, 1_000)
+    codigos = calc.clasificar_imc_lote(imcs)
+    assert codigos.dtype == np.int8
+    assert [CLASIFICACIONES_IMC[c] for c in codigos] == [calc.clasificar_imc(i) for i in imcs.tolist()]
+
+def test_mascara_rango_valido():
+    alturas = np.array([1.7, 0.0, -1.0, 3.0, 3.01, math.nan, 1.7, 1.7, 1.7])
+    pesos = np.array([70.0, 70.0, 70.0, 70.0, 70.0, 70.0, 0.0, 500.0, math.inf])
+    np.testing.assert_array_equal(_mascara_rango_valido(alturas, pesos),
+                                  [True, False, False, True, False, False, False, True, False])
+
+def test_lote_igual_a_escalar(datos):
+    alturas, pesos = datos
+    calc = BMIMLCalculator()
+    calc.agregar_bloque(alturas, pesos)
+    calc.entrenar_modelo()
+    
+    alturas = np.append(alturas[:50], [5.0, math.nan])
+    pesos = np.append(pesos[:50], [70.0, 70.0])
+    resultado, mensaje = calc.predecir_imc_lote(alturas, pesos)
+    assert resultado.dtype == DTYPE_PREDICCION
+    assert "2 filas fuera de rango" in mensaje
+    
+    for i in range(50):
+        escalar, _ = calc.predecir_imc(float(alturas[i]), float(pesos[i]))
+        assert resultado['imc_ml'][i] == pytest.approx(escalar['imc_ml'], rel=1e-12)
+        assert CLASIFICACIONES_IMC[resultado['clase_ml'][i]] == escalar['clasificacion_ml']
+    assert not resultado['valido'][50:].any()
+    assert (resultado['clase_ml'][50:] == CLASE_INVALIDA).all()
+
+def test_lote_sin_entrenar_o_desalineado():
+    calc = BMIMLCalculator()
+    assert calc.predecir_imc_lote([1.7], [70.0])[0] is None
+    calc.agregar_datos_lote([1.6, 1.7, 1.8, 1.9], [60.0, 65.0, 80.0, 95.0])
+    calc.entrenar_modelo()
+    assert calc.predecir_imc_lote([1.7, 1.8], [70.0])[0] is None
@@ -0,0 +1,65 @@
+import io
+import json
+import math
+
+import numpy as np
+import pytest
+
+import cli_imc
+import exportador
+import importador
+from calculadora_imc import BMIMLCalculator
+
+@pytest.fixture
+def entrenada(datos):
+    calc = BMIMLCalculator()
+    calc.agregar_bloque(*datos)
+    calc.entrenar_modelo()
+    return calc
+
+@pytest.fixture
+def ruta_modelo(entrenada, tmp_path):
+    ruta = str(tmp_path / "modelo.imcml")
+    entrenada.guardar_modelo(ruta)
+    return ruta
+
+def test_jsonl_sin_nan(entrenada):
+    alturas = np.array([1.7, math.nan, math.inf, 5.0])
+    pesos = np.array([70.0, 70.0, math.nan, 70.0])
+    resultado, _ = entrenada.predecir_imc_lote(alturas, pesos)
+    filas = [json.loads(linea) for linea in exportador.lineas_jsonl(alturas, pesos, resultado)]
+    
+    assert filas[0]['valido']
+    assert filas[1] == {'altura': None, 'peso': 70.0, 'valido': False}
+    assert filas[2] == {'altura': None, 'peso': None, 'valido': False}
+    assert filas[3] == {'altura': 5.0, 'peso': 70.0, 'valido': False}
+
+def test_conservar_ilegibles_como_nan():
+    alturas, pesos, ilegibles, _ = next(importador.leer_bloques_texto(
+        io.StringIO("1.7,70\nabc,3\n\n1.8,80\n"), conservar_ilegibles=True))
+    np.testing.assert_array_equal(alturas, [1.7, math.nan, 1.8])
+    np.testing.assert_array_equal(pesos, [70.0, math.nan, 80.0])
+    assert ilegibles == 1
+
+@pytest.mark.parametrize("formato", ["csv", "jsonl"])
+def test_predict_alineado_con_la_entrada(ruta_modelo, monkeypatch, capsys, formato):
+    monkeypatch.setattr('sys.stdin', io.StringIO("1.7,70\nabc,3\n1.8,80\n"))
+    
+    assert cli_imc.main(['predict', '-m', ruta_modelo, '--formato', formato, '-']) == 0
+    salida = capsys.readouterr()
+    lineas = salida.out.splitlines()
+    if formato == "csv":
+        assert lineas.pop(0) == exportador.ENCABEZADO_CSV.strip()
+        assert lineas[1].startswith(",,,,,")
+    else:
+        assert json.loads(lineas[1]) == {'altura': None, 'peso': None, 'valido': False}
+    assert len(lineas) == 3
+    assert "3 filas procesadas (1 ilegibles)" in salida.err
+
+def test_eval_sin_filas_escribe_null(ruta_modelo, monkeypatch, capsys):
+    monkeypatch.setattr('sys.stdin', io.StringIO("altura,peso\n"))
+    
+    assert cli_imc.main(['eval', '-m', ruta_modelo, '-']) == 0
+    resumen = json.loads(capsys.readouterr().out)
+    assert resumen['evaluadas'] == 0
+    assert resumen['mae'] is None
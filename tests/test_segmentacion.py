@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from segmentacion import Segmentacion, Tramos
+
+def test_tramos_recortan_los_extremos():
+    tramos = Tramos(1.5, 0.1, 5)
+    assert [tramos.indice(v) for v in (1.0, 1.5, 1.59, 1.6, 1.95, 2.5)] == [0, 0, 0, 1, 4, 4]
+    np.testing.assert_array_equal(tramos.indice(np.array([1.0, 1.6, 2.5])), [0, 1, 4])
+    assert tramos.limites(0) == (-np.inf, 1.6)
+    assert tramos.limites(4)[1] == np.inf
+
+@pytest.mark.parametrize("texto", ["1.5, 0.1", "a, 0.1, 5", "1.5, 0, 5", "1.5, 0.1, 0"])
+def test_tramos_no_validos(texto):
+    with pytest.raises(ValueError):
+        Tramos.desde_texto(texto)
+
+def test_segmento_de_altura_y_peso():
+    segmentacion = Segmentacion((1.5, 0.1, 5), (50.0, 25.0, 3))
+    assert segmentacion.cantidad == 15
+    alturas = np.array([1.55, 1.75, 1.95])
+    pesos = np.array([40.0, 60.0, 200.0])
+    indices = segmentacion.indice(alturas, pesos)
+    assert indices.tolist() == [0, 2 * 3 + 0, 4 * 3 + 2]
+    assert [segmentacion.indice(a, p) for a, p in zip(alturas.tolist(), pesos.tolist())] == indices.tolist()
+    assert Segmentacion.desde_dict(segmentacion.a_dict()) == segmentacion
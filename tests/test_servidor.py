@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+import pytest
+
+from calculadora_imc import BMIMLCalculator
+from servidor_imc import AgrupadorPredicciones, ServidorIMC
+
+@pytest.fixture
+def entrenada(datos):
+    calc = BMIMLCalculator()
+    calc.agregar_bloque(*datos)
+    calc.entrenar_modelo()
+    return calc
+
+async def _peticion(puerto, texto):
+    lector, escritor = await asyncio.open_connection('127.0.0.1', puerto)
+    escritor.write(texto.encode())
+    await escritor.drain()
+    respuesta = await lector.read()
+    escritor.close()
+    return respuesta
+
+def _post(cuerpo, longitud=None):
+    longitud = len(cuerpo) if longitud is None else longitud
+    return f"POST /predecir HTTP/1.1\r\nContent-Length: {longitud}\r\nConnection: close\r\n\r\n{cuerpo}"
+
+def _servir(calculadora, corrutina, **opciones):
+    async def ejecutar():
+        servidor = ServidorIMC(calculadora, **opciones)
+        await servidor.iniciar('127.0.0.1', 0)
+        try:
+            return await corrutina(servidor)
+        finally:
+            await servidor.detener()
+    return asyncio.run(ejecutar())
+
+@pytest.mark.parametrize("longitud, estado", [("abc", b"400"), ("-5", b"400"), ("99999999", b"413"), ("27", b"200")])
+def test_servidor_valida_content_length(entrenada, longitud, estado):
+    respuesta = _servir(entrenada, lambda servidor: _peticion(
+        servidor.puerto, _post('{"altura": 1.7, "peso": 70}', longitud)))
+    assert respuesta.split(b" ")[1] == estado
+
+def test_lista_igual_a_predecir(entrenada):
+    registros = [{"altura": 1.6, "peso": 55}, {"altura": 1.8, "peso": 90}, {"altura": 9.0, "peso": 70}]
+    respuesta = _servir(entrenada, lambda servidor: _peticion(servidor.puerto, _post(json.dumps(registros))))
+    resultados = json.loads(respuesta.split(b"\r\n\r\n", 1)[1])
+    
+    for registro, resultado in zip(registros[:2], resultados):
+        esperado, _ = entrenada.predecir_imc(registro['altura'], registro['peso'])
+        assert resultado['imc_ml'] == pytest.approx(esperado['imc_ml'], rel=1e-12)
+        assert resultado['clasificacion_ml'] == esperado['clasificacion_ml']
+    assert 'error' in resultados[2]
+
+def test_peticiones_concurrentes_en_un_lote(entrenada):
+    async def concurrentes():
+        agrupador = AgrupadorPredicciones(entrenada, ventana_ms=50, lote_maximo=64)
+        agrupador.iniciar()
+        try:
+            resultados = await asyncio.gather(*(agrupador.predecir(1.5 + i / 100, 60.0) for i in range(20)))
+        finally:
+            await agrupador.detener()
+        return resultados, agrupador.estadisticas.resumen()
+    
+    resultados, resumen = asyncio.run(concurrentes())
+    assert len(resultados) == 20
+    assert (resumen['peticiones'], resumen['lotes'], resumen['lote_maximo']) == (20, 1, 20)
+    assert resumen['latencia_ms']['p99'] is not None
+
+def test_lote_maximo_corta_el_lote(entrenada):
+    async def concurrentes():
+        agrupador = AgrupadorPredicciones(entrenada, ventana_ms=50, lote_maximo=8)
+        agrupador.iniciar()
+        try:
+            await asyncio.gather(*(agrupador.predecir(1.7, 70.0) for _ in range(20)))
+        finally:
+            await agrupador.detener()
+        return agrupador.estadisticas.resumen()
+    
+    resumen = asyncio.run(concurrentes())
+    assert resumen['lote_maximo'] == 8
+    assert resumen['lotes'] == 3
+
+def test_sin_entrenar_responde_503():
+    respuesta = _servir(BMIMLCalculator(), lambda servidor: _peticion(
+        servidor.puerto, _post('{"altura": 1.7, "peso": 70}')))
+    assert respuesta.split(b" ")[1] == b"503"
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from calculadora_imc import BMIMLCalculator
+from referencia import generar_datos
+
+def _calculadora(n, motor='minimos_cuadrados'):
+    calc = BMIMLCalculator(motor=motor)
+    if n:
+        calc.agregar_bloque(*generar_datos(n))
+    return calc
+
+@pytest.mark.parametrize("n, opciones", [
+    (0, {}),
+    (4, {'pliegues': 5}),
+    (4, {'pliegues': 10}),
+    (8, {'pliegues': 10}),
+    (4, {'fraccion_prueba': 0.1}),
+    (4, {'fraccion_prueba': 0.9}),
+])
+def test_pocos_datos_devuelve_mensaje(n, opciones):
+    resultado, mensaje = _calculadora(n).validar_modelo(**opciones)
+    assert resultado is None
+    assert mensaje == "No hay datos suficientes para validar el modelo."
+
+@pytest.mark.parametrize("opciones", [{'pliegues': 1}, {'fraccion_prueba': 0.0}, {'fraccion_prueba': 1.0}])
+def test_parametros_no_validos(opciones):
+    resultado, _ = _calculadora(100).validar_modelo(**opciones)
+    assert resultado is None
+
+def test_k_pliegues_igual_a_reentrenar_por_pliegue():
+    alturas, pesos = generar_datos(500)
+    calc = BMIMLCalculator(motor='minimos_cuadrados')
+    calc.agregar_bloque(alturas, pesos)
+    resultado, _ = calc.validar_modelo(pliegues=5, semilla=7)
+    assert resultado.pliegues == 5
+    assert resultado.filas.sum() == 500
+    
+    # Misma asignación de pliegues que validar_modelo
+    grupos = np.empty(500, dtype=np.intp)
+    grupos[np.random.default_rng(7).permutation(500)] = np.arange(500) % 5
+    for g in range(5):
+        entrenamiento = BMIMLCalculator(motor='minimos_cuadrados')
+        entrenamiento.agregar_bloque(alturas[grupos != g], pesos[grupos != g])
+        entrenamiento.entrenar_modelo()
+        prediccion, _ = entrenamiento.predecir_imc_lote(alturas[grupos == g], pesos[grupos == g])
+        errores = prediccion['imc_ml'] - pesos[grupos == g] / alturas[grupos == g] ** 2
+        assert resultado.mae[g] == pytest.approx(np.abs(errores).mean(), rel=1e-8)
+
+def test_retencion_usa_un_solo_pliegue():
+    resultado, _ = _calculadora(200).validar_modelo(fraccion_prueba=0.25)
+    assert resultado.pliegues == 1
+    assert resultado.filas[0] == 50
+
+def test_rechaza_modelo_segmentado():
+    calc = _calculadora(200)
+    calc.configurar_segmentos((1.5, 0.1, 5))
+    resultado, _ = calc.validar_modelo()
+    assert resultado is None
@@ -0,0 +1,125 @@
+# ============================================================================
+# TAREAS EN SEGUNDO PLANO PARA LA INTERFAZ
+# ============================================================================
+# Ejecuta entrenamiento, métricas y predicciones masivas fuera del hilo de Tk.
+# Los resultados y el progreso vuelven a la interfaz mediante root.after.
+# ============================================================================
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class TareaCancelada(Exception):
+    """Se lanza dentro de una tarea cuando se solicitó su cancelación."""
+
+class ContextoTarea:
+    """Canal entre una tarea en ejecución y la interfaz: progreso y cancelación."""
+    
+    def __init__(self):
+        self._cancelada = threading.Event()
+        self.progreso = None
+    
+    @property
+    def cancelada(self):
+        return self._cancelada.is_set()
+    
+    def cancelar(self):
+        self._cancelada.set()
+    
+    def comprobar(self):
+        """Interrumpe la tarea si se pidió su cancelación."""
+        if self._cancelada.is_set():
+            raise TareaCancelada()
+    
+    def reportar(self, fraccion, mensaje=None):
+        """Publica el avance (0 a 1); también es un punto de cancelación."""
+        self.progreso = (fraccion, mensaje)
+        self.comprobar()
+
+class TrabajadorSegundoPlano:
+    """Ejecuta una tarea a la vez en un hilo auxiliar y entrega el resultado a Tk."""
+    
+    INTERVALO_SONDEO_MS = 50
+    
+    def __init__(self, root):
+        self.root = root
+        self._ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="imc-trabajador")
+        self._tarea = None
+    
+    @property
+    def ocupado(self):
+        return self._tarea is not None
+    
+    def enviar(self, funcion, *args, al_terminar=None, al_error=None, al_cancelar=None,
+               al_progreso=None, al_finalizar=None, widgets=()):
+        """Lanza `funcion(contexto, *args)` en segundo plano.
+        
+        Los widgets indicados se deshabilitan mientras la tarea está en curso.
+        Devuelve False si ya hay otra tarea en ejecución.
+        """
+        if self.ocupado:
+            return False
+        
+        # Se recuerda el estado de cada widget (p. ej. 'readonly') para restaurarlo
+        estados = [(widget, widget.cget('state')) for widget in widgets]
+        for widget in widgets:
+            widget.config(state='disabled')
+        
+        contexto = ContextoTarea()
+        futuro = self._ejecutor.submit(funcion, contexto, *args)
+        self._tarea = {
+            'futuro': futuro,
+            'contexto': contexto,
+            'al_terminar': al_terminar,
+            'al_error': al_error,
+            'al_cancelar': al_cancelar,
+            'al_progreso': al_progreso,
+            'al_finalizar': al_finalizar,
+            'estados': estados,
+            'progreso': None,
+        }
+        self.root.after(self.INTERVALO_SONDEO_MS, self._sondear)
+        return True
+    
+    def cancelar(self):
+        """Solicita la cancelación de la tarea en curso."""
+        if self._tarea is not None:
+            self._tarea['contexto'].cancelar()
+    
+    def _sondear(self):
+        tarea = self._tarea
+        if tarea is None:
+            return
+        
+        progreso = tarea['contexto'].progreso
+        if progreso is not None and progreso is not tarea['progreso'] and tarea['al_progreso']:
+            tarea['progreso'] = progreso
+            tarea['al_progreso'](*progreso)
+        
+        futuro = tarea['futuro']
+        if not futuro.done():
+            self.root.after(self.INTERVALO_SONDEO_MS, self._sondear)
+            return
+        
+        self._tarea = None
+        for widget, estado in tarea['estados']:
+            widget.config(state=estado)
+        
+        try:
+            resultado = futuro.result()
+        except TareaCancelada:
+            if tarea['al_cancelar']:
+                tarea['al_cancelar']()
+        except Exception as e:
+            if tarea['al_error']:
+                tarea['al_error'](e)
+        else:
+            if tarea['al_terminar']:
+                tarea['al_terminar'](resultado)
+        finally:
+            if tarea['al_finalizar']:
+                tarea['al_finalizar']()
+    
+    def cerrar(self):
+        """Cancela la tarea en curso y libera el hilo auxiliar."""
+        self.cancelar()
+        self._ejecutor.shutdown(wait=False)